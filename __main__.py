@@ -0,0 +1,6 @@
+""" Entry point for python -m strikeparse. See cli."""
+import sys
+
+from strikeparse.cli import main
+
+sys.exit(main())
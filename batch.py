@@ -0,0 +1,228 @@
+""" Parse many kit files across processes.
+
+Results come back in the order the paths were given, so a directory parse is
+deterministic however the work is split. compact=True returns a KitRecord per
+kit - the raw instrument block plus the sample table - instead of pickling a
+full StrikeKit object graph back to the parent.
+
+iter_kits streams a whole library in constant memory: the walk is lazy and
+only a window of kits is being read, parsed or waiting for the caller at once.
+
+    kits = ((helpers.kit_name(path), kit) for path, kit in iter_kits(backups) if wanted(kit))
+    export.write_kits(stream, kits)
+
+parse_prefetched is the single process alternative for slow media: reader
+threads pull file bytes ahead while this thread parses, so a card reader's
+latency hides behind parsing. With stats enabled it records per-file read,
+wait and parse times and stats.get_stats() reports how much of the reading
+overlapped.
+"""
+import os
+import time
+from collections import deque
+from functools import partial
+from itertools import islice
+
+from strikeparse import helpers
+from strikeparse import records
+from strikeparse import stats
+from strikeparse.data_models import StrikeKit
+from strikeparse.records import kit_record
+from strikeparse.records import walk_kits
+
+
+def parse_file(path, compact=False):
+    """Read and parse one kit file
+
+    :param path: Path to a .skt file
+
+    :param compact: Return a KitRecord instead of a StrikeKit
+
+    :rtype: StrikeKit or KitRecord
+    """
+    if compact:
+        return kit_record(helpers.kit_name(path), helpers.map_file(path))
+    return StrikeKit.from_path(path)
+
+
+def parse_rows(path):
+    """Read a kit file and return its kits.csv rows - trigger spec, layer A, layer B - as tuples
+
+    :rtype: tuple
+    """
+    return tuple(tuple(x) for x in StrikeKit.from_path(path, lazy=True).rows())
+
+
+def _parse_chunk(parse, paths):
+    return [parse(path) for path in paths]
+
+
+def _chunksize(count, jobs):
+    # A few chunks per worker evens out slow files without per-file overhead.
+    return max(1, count // (jobs * 4))
+
+
+def parse_files(paths, jobs=None, chunksize=None, compact=False):
+    """Parse kit files in a process pool, yielding (path, result) in input order
+
+    :param paths: Iterable of .skt paths
+
+    :param jobs: Worker processes, os.cpu_count() by default. 1 parses in this process.
+
+    :param chunksize: Paths handed to a worker at a time, picked from the path count by default
+
+    :param compact: Yield KitRecords instead of StrikeKits
+
+    :rtype: generator
+    """
+    paths = list(paths)
+    jobs = jobs or os.cpu_count() or 1
+    parse = partial(parse_file, compact=compact)
+    if jobs == 1 or len(paths) < 2:
+        for path in paths:
+            yield path, parse(path)
+        return
+    # Imported here, multiprocessing is slow to import and serial runs don't need it.
+    from multiprocessing import Pool
+    jobs = min(jobs, len(paths))
+    chunksize = chunksize or _chunksize(len(paths), jobs)
+    with Pool(jobs) as pool:
+        for path, result in zip(paths, pool.imap(parse, paths, chunksize)):
+            yield path, result
+
+
+def parse_directory(root, jobs=None, chunksize=None, compact=False):
+    """Parse every .skt file under root in a process pool
+
+    See parse_files. Files are visited in sorted path order.
+    """
+    return parse_files(records.find_kits(root), jobs=jobs, chunksize=chunksize, compact=compact)
+
+
+def _chunks(paths, size):
+    chunk = []
+    for path in paths:
+        chunk.append(path)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def iter_kits(roots, jobs=None, window=None, chunksize=1, compact=False, parse=None):
+    """Walk, read and parse every .skt file under roots, yielding (path, result) in walk order
+
+    Memory is bounded however many files there are - window kits are queued in
+    the pool, plus the chunk being handed out. Stopping early shuts the pool down.
+
+    :param roots: Directory, or a list of them - e.g. several SD card backups
+
+    :param jobs: Worker processes, os.cpu_count() by default. 1 parses in this process, one kit at a time.
+
+    :param window: Kits handed out ahead of the caller, jobs * 2 by default
+
+    :param chunksize: Paths handed to a worker at a time
+
+    :param compact: Yield KitRecords instead of StrikeKits
+
+    :param parse: Function of a path run in the workers instead, e.g. parse_rows. Must pickle.
+
+    :rtype: generator
+    """
+    if isinstance(roots, (str, bytes, os.PathLike)):
+        roots = [roots]
+    paths = (path for root in roots for path in walk_kits(root))
+    parse = parse or partial(parse_file, compact=compact)
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1:
+        for path in paths:
+            yield path, parse(path)
+        return
+    # Chunks queued in the pool - window kits' worth, at least one.
+    depth = max(1, (window or jobs * 2) // chunksize)
+    chunks = _chunks(paths, chunksize)
+    parse_chunk = partial(_parse_chunk, parse)
+    from multiprocessing import Pool
+    with Pool(jobs) as pool:
+        submit = lambda chunk: (chunk, pool.apply_async(parse_chunk, (chunk,)))
+        pending = deque(submit(x) for x in islice(chunks, depth))
+        while pending:
+            chunk, result = pending.popleft()
+            results = result.get()
+            # Refill before yielding so the workers keep busy while the caller works.
+            pending.extend(submit(x) for x in islice(chunks, 1))
+            for path, kit in zip(chunk, results):
+                yield path, kit
+
+
+# Reader threads for parse_prefetched. Reads wait on the device, not the GIL.
+DEFAULT_READERS = 4
+
+
+def _read_file(path):
+    start = time.perf_counter()
+    data = helpers.map_file(path, use_mmap=False)
+    return data, time.perf_counter() - start
+
+
+def prefetch_files(paths, readers=DEFAULT_READERS, depth=None):
+    """Read files on a thread pool ahead of the caller, yielding (path, bytes) in input order
+
+    :param paths: Iterable of paths, consumed as the reads are queued
+
+    :param readers: Reader threads
+
+    :param depth: Files read or being read ahead of the caller, readers * 2 by default
+
+    :rtype: generator
+    """
+    for path, data, _, _ in _prefetch(paths, readers, depth):
+        yield path, data
+
+
+def _prefetch(paths, readers, depth):
+    # Yields (path, data, read seconds, seconds waited on the read).
+    from concurrent.futures import ThreadPoolExecutor
+
+    paths = iter(paths)
+    depth = max(1, depth or readers * 2)
+    with ThreadPoolExecutor(max_workers=readers) as pool:
+        pending = deque((x, pool.submit(_read_file, x)) for x in islice(paths, depth))
+        while pending:
+            path, future = pending.popleft()
+            start = time.perf_counter()
+            data, read_seconds = future.result()
+            waited = time.perf_counter() - start
+            pending.extend((x, pool.submit(_read_file, x)) for x in islice(paths, 1))
+            yield path, data, read_seconds, waited
+
+
+def parse_prefetched(paths, readers=DEFAULT_READERS, depth=None, compact=False):
+    """Parse kit files in this thread while reader threads prefetch their bytes
+
+    Yields (path, result) in input order, like parse_files.
+
+    :param paths: Iterable of .skt paths
+
+    :param readers: Reader threads
+
+    :param depth: Files read ahead of the parser, readers * 2 by default
+
+    :param compact: Yield KitRecords instead of StrikeKits
+
+    :rtype: generator
+    """
+    # Decided once per call, a disabled run doesn't time anything.
+    record = stats.record if stats.enabled() else None
+    for path, data, read_seconds, waited in _prefetch(paths, readers, depth):
+        start = time.perf_counter() if record else 0
+        if compact:
+            result = kit_record(helpers.kit_name(path), data)
+        else:
+            result = StrikeKit(data)
+        if record:
+            record("pipeline.parse", time.perf_counter() - start)
+            record("pipeline.read", read_seconds)
+            record("pipeline.wait", waited)
+        yield path, result
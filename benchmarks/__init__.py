@@ -0,0 +1,7 @@
+""" Benchmarks for the strikeparse package.
+
+Each module runs on its own, e.g.
+
+    python -m strikeparse.benchmarks.bench_helpers
+
+"""
@@ -0,0 +1,60 @@
+""" Micro-benchmark for helpers.parse_dword against the original implementation.
+
+    python -m strikeparse.benchmarks.bench_helpers [number]
+
+"""
+import struct
+import sys
+import timeit
+
+from strikeparse import helpers
+
+
+def legacy_parse_dword(raw, wordsize=4):
+    """The original hex string round trip, kept for comparison only."""
+    rv = 0
+    try:
+        unpck_fmt = '<%sB' % len(raw)
+        hexv = struct.unpack(unpck_fmt, raw)
+        hexv = [x for x in reversed(hexv)]
+        rv = int(''.join("%01x" % i for i in hexv), 16)
+    except TypeError:
+        print("Error - could not parse %s " % raw)
+    except struct.error:
+        rv = 0
+    return rv
+
+
+SAMPLES = [b"\xc8\x02\x00\x00", b"\xa4\x01", b"\x20\x03", b"\x2c\x01\x00\x00"]
+
+# 24 voices worth of 2 byte words.
+BUFFER = bytes(range(256)) * 8
+OFFSETS = list(range(0, 24 * 80, 80))
+
+
+def run(number=100000):
+    results = {}
+    results["legacy_parse_dword"] = timeit.timeit(
+        lambda: [legacy_parse_dword(x) for x in SAMPLES], number=number)
+    results["parse_dword"] = timeit.timeit(
+        lambda: [helpers.parse_dword(x) for x in SAMPLES], number=number)
+    results["legacy_offsets"] = timeit.timeit(
+        lambda: [legacy_parse_dword(BUFFER[x:x + 2]) for x in OFFSETS], number=number // 10)
+    results["parse_dwords_offsets"] = timeit.timeit(
+        lambda: helpers.parse_dwords(BUFFER, OFFSETS, 2), number=number // 10)
+    return results
+
+
+def main(*args):
+    number = int(args[1]) if len(args) > 1 else 100000
+    results = run(number)
+    for name, seconds in sorted(results.items()):
+        print("{0:<24}{1:.4f}s".format(name, seconds))
+    print("parse_dword speedup:    {0:.1f}x".format(
+        results["legacy_parse_dword"] / results["parse_dword"]))
+    print("parse_dwords speedup:   {0:.1f}x".format(
+        results["legacy_offsets"] / results["parse_dwords_offsets"]))
+
+
+if __name__ == "__main__":
+    main(*sys.argv)
@@ -0,0 +1,130 @@
+""" Per-kit memory footprint of parsed kits, measured with tracemalloc.
+
+    python -m strikeparse.benchmarks.bench_memory [kits]
+
+Parses the test kit [kits] times in each mode, keeps every result alive and
+reports the traced bytes per kit. The raw file data is read once up front
+and isn't counted.
+
+The *_dict modes repeat eager and lazy_touched with dict-backed copies of
+the data model classes, the layout before __slots__, as the baseline.
+"""
+import gc
+import os
+import sys
+import tracemalloc
+from contextlib import contextmanager
+
+from strikeparse import data_models
+
+try:
+    from strikeparse.records import kit_record
+except ImportError:
+    kit_record = None
+
+TEST_KIT = os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))),
+                        "tests", "testdata.skt")
+
+
+def _touch(kit):
+    # Force every lazily decoded part so modes compare like for like.
+    kit.kit_settings
+    for voice in kit.instruments:
+        voice.layer_a
+        voice.layer_b
+        voice.instrument_settings
+    return kit
+
+
+def _eager(raw):
+    return data_models.StrikeKit(raw)
+
+
+def _lazy(raw):
+    return data_models.StrikeKit(raw, lazy=True)
+
+
+def _lazy_touched(raw):
+    return _touch(data_models.StrikeKit(raw, lazy=True))
+
+
+def _record(raw):
+    if kit_record is None:
+        raise ImportError("KitRecord not available")
+    return kit_record("kit", raw)
+
+
+MODES = [
+    ("eager", _eager),
+    ("lazy", _lazy),
+    ("lazy_touched", _lazy_touched),
+    ("record", _record),
+]
+
+DICT_MODES = [
+    ("eager_dict", _eager),
+    ("lazy_touched_dict", _lazy_touched),
+]
+
+
+def _dict_backed(cls):
+    # Same methods, no __slots__, so instances get a __dict__ again.
+    skip = set(cls.__slots__) | set(["__slots__", "__dict__", "__weakref__"])
+    namespace = dict((k, v) for k, v in vars(cls).items() if k not in skip)
+    return type(cls.__name__, cls.__bases__, namespace)
+
+
+@contextmanager
+def dict_backed():
+    """Swap the slotted data_models classes for dict-backed copies while in the block"""
+    originals = dict((name, value) for name, value in vars(data_models).items()
+                     if isinstance(value, type) and value.__module__ == data_models.__name__
+                     and "__slots__" in vars(value))
+    try:
+        for name, cls in originals.items():
+            setattr(data_models, name, _dict_backed(cls))
+        yield
+    finally:
+        for name, cls in originals.items():
+            setattr(data_models, name, cls)
+
+
+def measure(factory, raw, count):
+    """Return traced bytes per kit for count kits built by factory"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        kits = [factory(raw) for _ in range(count)]
+        gc.collect()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del kits
+    return float(after - before) / count
+
+
+def run(count=200):
+    with open(TEST_KIT, "rb") as f:
+        raw = f.read()
+    results = {}
+    for name, factory in MODES:
+        try:
+            results[name] = measure(factory, raw, count)
+        except ImportError:
+            # Mode not available in this version of the package.
+            pass
+    with dict_backed():
+        for name, factory in DICT_MODES:
+            results[name] = measure(factory, raw, count)
+    return results
+
+
+def main(*args):
+    count = int(args[1]) if len(args) > 1 else 200
+    for name, per_kit in sorted(run(count).items()):
+        print("{0:<20}{1:>10.0f} bytes/kit".format(name, per_kit))
+
+
+if __name__ == "__main__":
+    main(*sys.argv)
@@ -0,0 +1,145 @@
+""" Instrument tree scan: os.scandir on a thread pool against the original listdir walk.
+
+    python -m strikeparse.benchmarks.bench_scan [path] [--latency MS]
+
+Without a path a synthetic tree shaped like instruments.csv (22 groups,
+~1,750 files) is generated in a temp folder. On a local SSD or tmpfs
+directory reads are too cheap for threads to help much. Point it at a real
+card reader, or pass --latency to stand in for one: every directory read and
+stat call then sleeps that long first, releasing the GIL the way a blocked
+read does. Entry types still come from readdir for free, as they do on Linux.
+"""
+import argparse
+import contextlib
+import os
+import shutil
+import tempfile
+import time
+
+from strikeparse import scan
+
+GROUPS = 22
+PER_GROUP = 80
+
+
+def legacy_scan(root):
+    """The original csvinstruments walk, with the stat calls the new scan makes."""
+    result = []
+    for inst_group in os.listdir(root):
+        group_path = os.path.join(root, inst_group)
+        if os.path.isdir(group_path):
+            for name in filter(lambda x: str(x).endswith("sin"), os.listdir(group_path)):
+                info = os.stat(os.path.join(group_path, name))
+                result.append((inst_group, name[0:-4], info.st_size, info.st_mtime))
+    return result
+
+
+def make_tree(root, groups=GROUPS, per_group=PER_GROUP):
+    for group in range(groups):
+        group_path = os.path.join(root, "Group %02d" % group)
+        os.mkdir(group_path)
+        for index in range(per_group):
+            with open(os.path.join(group_path, "Instrument %03d.sin" % index), "wb") as f:
+                f.write(b"INST")
+
+
+class _SlowEntry(object):
+    def __init__(self, entry, latency):
+        self._entry = entry
+        self._latency = latency
+        self.name = entry.name
+        self.path = entry.path
+
+    def is_file(self):
+        return self._entry.is_file()
+
+    def is_dir(self):
+        return self._entry.is_dir()
+
+    def stat(self):
+        time.sleep(self._latency)
+        return self._entry.stat()
+
+
+class _SlowScandir(object):
+    def __init__(self, entries, latency):
+        self._entries = entries
+        self._latency = latency
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self._entries.close()
+
+    def __iter__(self):
+        return (_SlowEntry(x, self._latency) for x in self._entries)
+
+
+@contextlib.contextmanager
+def delayed_fs(latency):
+    """Add latency seconds to os.scandir, os.listdir, os.stat and DirEntry.stat for the with block"""
+    scandir, listdir, stat = os.scandir, os.listdir, os.stat
+
+    def slow_scandir(path="."):
+        time.sleep(latency)
+        return _SlowScandir(scandir(path), latency)
+
+    def slow_listdir(path="."):
+        time.sleep(latency)
+        return listdir(path)
+
+    def slow_stat(path, *args, **kwargs):
+        time.sleep(latency)
+        return stat(path, *args, **kwargs)
+
+    os.scandir, os.listdir, os.stat = slow_scandir, slow_listdir, slow_stat
+    try:
+        yield
+    finally:
+        os.scandir, os.listdir, os.stat = scandir, listdir, stat
+
+
+def _best(func, repeat=5):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def run(root, repeat=5):
+    results = {"legacy": _best(lambda: legacy_scan(root), repeat)}
+    for jobs in (1, 4, scan.DEFAULT_JOBS):
+        results["scandir_jobs_%d" % jobs] = _best(lambda: list(scan.scan_instruments(root, jobs=jobs)), repeat)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("root", nargs="?", help="Instruments folder, a synthetic tree by default")
+    parser.add_argument("--latency", type=float, default=0.0, help="milliseconds added to each directory read and stat")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per variant, the best is kept")
+    args = parser.parse_args(argv)
+
+    root = args.root
+    temp = None
+    if root is None:
+        temp = root = tempfile.mkdtemp()
+        make_tree(root)
+    try:
+        if args.latency:
+            with delayed_fs(args.latency / 1000.0):
+                results = run(root, args.repeat)
+        else:
+            results = run(root, args.repeat)
+    finally:
+        if temp:
+            shutil.rmtree(temp)
+    for name, seconds in sorted(results.items()):
+        print("{0:<20}{1:.4f}s  {2:.1f}x".format(name, seconds, results["legacy"] / seconds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+""" End to end parsing benchmarks over a synthetic corpus.
+
+    python -m strikeparse.benchmarks.bench_suite [--kits N] [--seed S] [--repeat R]
+                                                 [--corpus DIR] [--output results.json]
+                                                 [--compare baseline.json]
+
+Generates a corpus with benchmarks.synthetic (or uses --corpus, a folder
+laid out the same way) and times each stage:
+
+    scan_kits         find_kits over the Kits folder
+    scan_instruments  scan.scan_instruments over the Instruments folder
+    read              reading each kit file
+    parse             StrikeKit from bytes, plus its header, samples and
+                      instruments sub-stages
+    parse_lazy_rows   lazy StrikeKit, then rows()
+    export            kits.csv rows for already parsed kits
+    export_files      export.export_files from disk, in this process
+
+Every stage reports kits/sec, MB/sec, per-kit latency and its tracemalloc
+peak. Timings are the best of --repeat runs; peaks come from a separate
+traced run so tracing doesn't skew the timings. Results go to --output as
+JSON, and --compare prints the throughput ratio against an earlier file.
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+from strikeparse import constants
+from strikeparse import export
+from strikeparse import helpers
+from strikeparse import layouts
+from strikeparse import scan
+from strikeparse.benchmarks import synthetic
+from strikeparse.data_models import StrikeKit
+from strikeparse.records import find_kits
+
+_FORMAT_VERSION = 1
+
+
+def _parse_header(raw):
+    StrikeKit(None)._parse_header(raw[0:constants.KIT_HEADER_SIZE])
+
+
+def _parse_samples(raw):
+    StrikeKit(None)._parse_samples(raw[layouts.SAMPLE_TABLE_OFFSET:])
+
+
+def _parse_instruments(raw, samples):
+    kit = StrikeKit(None)
+    kit._samples = samples
+    kit._parse_instruments(raw[constants.KIT_HEADER_SIZE:layouts.SAMPLE_TABLE_OFFSET])
+
+
+def _read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+class Corpus(object):
+    """Kit paths, raw kit data and parsed kits shared by the stages"""
+    def __init__(self, root):
+        self.root = root
+        self.kit_root = os.path.join(root, "Kits")
+        self.instrument_root = os.path.join(root, "Instruments")
+        self.paths = find_kits(self.kit_root)
+        self.raw = [_read(x) for x in self.paths]
+        self.names = [helpers.kit_name(x) for x in self.paths]
+        self.kits = [StrikeKit(x) for x in self.raw]
+        # The instruments stage resolves layers against these.
+        self.samples = [x.samples for x in self.kits]
+
+    @property
+    def size(self):
+        return sum(len(x) for x in self.raw)
+
+
+def _each(func, items):
+    # Call func per item, returning the latency of each call.
+    clock = time.perf_counter
+    latencies = []
+    for item in items:
+        start = clock()
+        func(*item)
+        latencies.append(clock() - start)
+    return latencies
+
+
+def _once(func):
+    start = time.perf_counter()
+    func()
+    return [time.perf_counter() - start]
+
+
+def stages(corpus):
+    """Return (name, run) pairs. run() does the work and returns latencies in seconds."""
+    raw = [(x,) for x in corpus.raw]
+    return [
+        ("scan_kits", lambda: _once(lambda: find_kits(corpus.kit_root))),
+        ("scan_instruments", lambda: _once(lambda: list(scan.scan_instruments(corpus.instrument_root)))),
+        ("read", lambda: _each(_read, [(x,) for x in corpus.paths])),
+        ("parse", lambda: _each(StrikeKit, raw)),
+        ("parse.header", lambda: _each(_parse_header, raw)),
+        ("parse.samples", lambda: _each(_parse_samples, raw)),
+        ("parse.instruments", lambda: _each(_parse_instruments, zip(corpus.raw, corpus.samples))),
+        ("parse_lazy_rows", lambda: _each(lambda x: list(StrikeKit(x, lazy=True).rows()), raw)),
+        ("export", lambda: _each(lambda name, kit: export.write_kit(io.StringIO(), name, kit),
+                                 zip(corpus.names, corpus.kits))),
+        ("export_files", lambda: _once(lambda: export.export_files(io.StringIO(), corpus.paths, jobs=1))),
+    ]
+
+
+def _percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def _peak(run):
+    tracemalloc.start()
+    try:
+        run()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measure(run, kits, size, repeat=3):
+    """Time one stage over a corpus of kits totalling size bytes
+
+    :rtype: dict
+    """
+    best = None
+    for _ in range(repeat):
+        latencies = run()
+        if best is None or sum(latencies) < sum(best):
+            best = latencies
+    seconds = sum(best)
+    ordered = sorted(best)
+    per_kit = seconds / kits
+    return {
+        "seconds": seconds,
+        "kits_per_sec": kits / seconds if seconds else 0.0,
+        "mb_per_sec": size / seconds / 1e6 if seconds else 0.0,
+        "latency_us": {
+            "mean": per_kit * 1e6,
+            "p50": _percentile(ordered, 0.5) * 1e6 if len(best) > 1 else per_kit * 1e6,
+            "p95": _percentile(ordered, 0.95) * 1e6 if len(best) > 1 else per_kit * 1e6,
+            "max": ordered[-1] * 1e6 if len(best) > 1 else per_kit * 1e6,
+        },
+        "peak_bytes": _peak(run),
+    }
+
+
+def run(root, repeat=3):
+    """Benchmark every stage against the corpus under root
+
+    :rtype: dict
+    """
+    corpus = Corpus(root)
+    kits = len(corpus.paths)
+    if not kits:
+        raise ValueError("No kits found under {0}".format(corpus.kit_root))
+    size = corpus.size
+    results = {}
+    for name, stage in stages(corpus):
+        results[name] = measure(stage, kits, size, repeat)
+    return {
+        "version": _FORMAT_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "kits": kits,
+        "corpus_bytes": size,
+        "stages": results,
+    }
+
+
+def compare(baseline, results):
+    """Yield (stage, baseline kits/sec, kits/sec, speedup) for stages in both"""
+    for name, stage in sorted(results["stages"].items()):
+        old = baseline["stages"].get(name)
+        if old and old["kits_per_sec"]:
+            yield name, old["kits_per_sec"], stage["kits_per_sec"], stage["kits_per_sec"] / old["kits_per_sec"]
+
+
+def _print(results):
+    print("{0} kits, {1:.1f} MB, Python {2}".format(results["kits"], results["corpus_bytes"] / 1e6,
+                                                    results["python"]))
+    print("{0:<20}{1:>12}{2:>10}{3:>10}{4:>10}{5:>12}".format(
+        "stage", "kits/sec", "MB/sec", "p50 us", "p95 us", "peak KB"))
+    for name, stage in sorted(results["stages"].items()):
+        print("{0:<20}{1:>12.0f}{2:>10.1f}{3:>10.1f}{4:>10.1f}{5:>12.1f}".format(
+            name, stage["kits_per_sec"], stage["mb_per_sec"], stage["latency_us"]["p50"],
+            stage["latency_us"]["p95"], stage["peak_bytes"] / 1024.0))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark kit parsing over a synthetic corpus")
+    parser.add_argument("--kits", type=int, default=1000, help="kits to generate")
+    parser.add_argument("--seed", type=int, default=0, help="corpus random seed")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per stage, the best is kept")
+    parser.add_argument("--corpus", help="existing corpus folder instead of a generated one")
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--compare", help="JSON results to compare against")
+    args = parser.parse_args(argv)
+
+    temp = None
+    root = args.corpus
+    if root is None:
+        temp = root = tempfile.mkdtemp()
+        synthetic.make_corpus(root, args.kits, args.seed)
+    try:
+        results = run(root, args.repeat)
+    finally:
+        if temp:
+            shutil.rmtree(temp)
+    results["seed"] = None if args.corpus else args.seed
+
+    _print(results)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print()
+        for name, old, new, speedup in compare(baseline, results):
+            print("{0:<20}{1:>12.0f}{2:>12.0f}{3:>8.2f}x".format(name, old, new, speedup))
+
+
+if __name__ == "__main__":
+    main()
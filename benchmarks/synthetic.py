@@ -0,0 +1,178 @@
+""" Synthetic kit corpora for benchmarks.
+
+Kits are packed from the documented layout with the layouts structs: the 52
+byte header with reverb and FX settings, 24 voices using the trigger specs
+of a stock kit and a sample table of the names they use. Samples are drawn
+from a fake Instruments tree of GROUPS x PER_GROUP names, picked by the
+voice's input type the way a real kit would. The same seed gives the same
+corpus.
+
+    python -m strikeparse.benchmarks.synthetic root [kits] [seed]
+
+writes root/Kits/Bank NN/NNN_Synthetic NNNNN.skt, 100 kits per bank, and a
+root/Instruments tree with a stub .sin file for every sample.
+"""
+import os
+import random
+import sys
+
+from strikeparse import constants
+from strikeparse import layouts
+
+# Trigger specs of the 24 voices, in the order a stock kit stores them.
+TRIGGERS = [b"K1H", b"K2H", b"S1H", b"S1R", b"T1H", b"T1R", b"T2H", b"T2R", b"T3H", b"T3R",
+            b"T4H", b"T4R", b"H1B", b"H1E", b"H1F", b"C1B", b"C1E", b"C2B", b"C2E", b"C3B",
+            b"C3E", b"R1D", b"R1B", b"R1E"]
+
+# Instrument groups a voice of each input type draws its samples from.
+INPUT_GROUPS = {
+    "K": ["Kicks", "Electronic", "Percussion"],
+    "S": ["Snares", "Electronic", "Percussion"],
+    "T": ["Toms", "Electronic", "Percussion"],
+    "H": ["HiHats"],
+    "C": ["Crashes", "Chinas&Splashes"],
+    "R": ["Rides"],
+}
+
+GROUPS = sorted(set(x for groups in INPUT_GROUPS.values() for x in groups))
+PER_GROUP = 80
+
+KITS_PER_BANK = 100
+
+# Chance a voice has nothing assigned, and that a used voice leaves layer B empty.
+EMPTY_VOICE = 0.1
+EMPTY_LAYER_B = 0.3
+
+_NO_SAMPLE = 255
+
+# Voice settings terminator as found in stock kits.
+_SETTINGS_TERMINATOR = b"\xff" * 5
+
+
+def sample_names(groups=GROUPS, per_group=PER_GROUP):
+    """Return group -> list of sample paths, e.g. "Kicks/Synthetic 012.sin" """
+    return dict((group, ["%s/Synthetic %03d.sin" % (group, x) for x in range(per_group)])
+                for group in groups)
+
+
+def _layer(rng, sample):
+    return layouts.VOICE_LAYER.pack(
+        sample, rng.randint(0, 99), rng.randint(0, 255), rng.randint(0, 99),
+        rng.choice((0, 0, 1, 2, 254, 255)), rng.randint(0, 255), rng.randint(0, 255),
+        rng.randint(0, 1), rng.randint(0, 99), rng.randint(0, 99), rng.randint(0, 99), rng.randint(0, 99),
+        0x7f, b"\0\0\0")
+
+
+def _voice(rng, index, trigger, names, table):
+    if rng.random() < EMPTY_VOICE:
+        samples = []
+    else:
+        groups = INPUT_GROUPS[chr(trigger[0])]
+        samples = [rng.choice(names[rng.choice(groups)])]
+        if rng.random() >= EMPTY_LAYER_B:
+            samples.append(rng.choice(names[rng.choice(groups)]))
+    refs = []
+    for name in samples:
+        if name not in table:
+            table.append(name)
+        refs.append(table.index(name))
+    refs += [_NO_SAMPLE] * (2 - len(refs))
+
+    term = b" " if samples else b"\xff"
+    header = layouts.INSTRUMENT_HEADER.pack(constants.SENTINEL_INSTRUMENT_HEADER, trigger)[:-1] + term
+    settings = layouts.VOICE_SETTINGS.pack(
+        rng.choice((0, 40, 80)), rng.choice((0, 0, 30)), rng.randint(0, 2), rng.randint(0, 4),
+        rng.randint(0, 1), rng.randint(0, 15), 36 + index, rng.choice((0, 0, 50)), rng.randint(0, 2),
+        _SETTINGS_TERMINATOR)
+    return header + _layer(rng, refs[0]) + _layer(rng, refs[1]) + settings
+
+
+def _header(rng):
+    data = bytearray(constants.KIT_HEADER_SIZE)
+    layouts.KIT_HEADER.pack_into(data, 0, b"KIT ", constants.KIT_HEADER_SIZE - 8)
+    data[12] = 0x63
+    offset = layouts.KIT_SETTINGS_OFFSET
+    reverb_type = rng.choice(sorted(constants.REVERB_TYPE_VALUES.values()))
+    layouts.KIT_REVERB.pack_into(data, offset + layouts.KIT_REVERB_OFFSET,
+                                 reverb_type, rng.randint(0, 99), rng.randint(0, 99), rng.randint(0, 99))
+    fx_type = rng.choice([x.value for x in constants.FxType])
+    layouts.KIT_FX.pack_into(data, offset + layouts.KIT_FX_OFFSET,
+                             fx_type, rng.randint(0, 99), rng.randint(0, 1000), rng.randint(0, 1000),
+                             rng.randint(0, 99), rng.randint(0, 99), rng.randint(0, 99), rng.randint(0, 99),
+                             rng.randint(0, 255), 0)
+    return bytes(data)
+
+
+def _sample_table(table):
+    names = b"".join(x.encode("utf-8") + b"\0" for x in table)
+    # Stock kits pad the table out to a multiple of 4 bytes.
+    padding = b"\0" * (-len(names) % 4)
+    return layouts.SAMPLE_TABLE_HEADER.pack(b"str ", len(names)) + names + padding
+
+
+def make_kit(rng, names=None):
+    """Return the bytes of one random kit
+
+    :param rng: random.Random to draw from
+
+    :param names: Group -> sample paths, sample_names() by default
+
+    :rtype: bytes
+    """
+    names = names or sample_names()
+    table = []
+    voices = b"".join(_voice(rng, x, trigger, names, table) for x, trigger in enumerate(TRIGGERS))
+    return _header(rng) + voices + _sample_table(table)
+
+
+def kit_path(root, index):
+    """Return the path of kit number index in a corpus rooted at root"""
+    bank = os.path.join(root, "Bank %02d" % (index // KITS_PER_BANK))
+    return os.path.join(bank, "%03d_Synthetic %05d.skt" % (index % 1000, index))
+
+
+def make_corpus(root, kits=1000, seed=0, instruments=True):
+    """Write a synthetic corpus under root
+
+    :param kits: Number of kit files, written under root/Kits
+
+    :param seed: Random seed, the same seed writes the same corpus
+
+    :param instruments: Also write a root/Instruments tree with a stub .sin per sample
+
+    :return: Kit paths in the order written
+
+    :rtype: list
+    """
+    rng = random.Random(seed)
+    names = sample_names()
+    kit_root = os.path.join(root, "Kits")
+    paths = []
+    for index in range(kits):
+        path = kit_path(kit_root, index)
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        with open(path, "wb") as f:
+            f.write(make_kit(rng, names))
+        paths.append(path)
+    if instruments:
+        for group, samples in names.items():
+            group_path = os.path.join(root, "Instruments", group)
+            os.makedirs(group_path)
+            for sample in samples:
+                with open(os.path.join(group_path, os.path.basename(sample)), "wb") as f:
+                    f.write(layouts.CHUNK_HEADER.pack(constants.SENTINEL_INSTRUMENT_FILE_HEADER,
+                                                      constants.INSTRUMENT_FILE_HEADER_SIZE))
+                    f.write(bytes(constants.INSTRUMENT_FILE_HEADER_SIZE))
+    return paths
+
+
+def main(*args):
+    root = args[1]
+    kits = int(args[2]) if len(args) > 2 else 1000
+    seed = int(args[3]) if len(args) > 3 else 0
+    make_corpus(root, kits, seed)
+
+
+if __name__ == "__main__":
+    main(*sys.argv)
@@ -0,0 +1,144 @@
+""" On-disk cache of parsed kits.
+
+Entries are KitRecords keyed by path and validated by size, mtime and a
+SHA-1 of the file contents:
+
+    size and mtime match        - hit, the file isn't read at all
+    either changed, same digest - hit, the entry is re-stamped (touched/copied files)
+    digest changed or new path  - miss, the kit is parsed and stored
+
+    with KitCache("kits.db") as cache:
+        corpus = KitCorpus.from_records(x for _, x in cache.records(find_kits(root)))
+        print(cache.stats)
+"""
+import hashlib
+import os
+import sqlite3
+
+from strikeparse import helpers
+from strikeparse import layouts
+from strikeparse.records import KitRecord
+from strikeparse.records import REVERB_FIELDS
+from strikeparse.records import kit_record
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS kits (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    digest BLOB NOT NULL,
+    name TEXT NOT NULL,
+    settings BLOB NOT NULL,
+    samples TEXT NOT NULL,
+    voices BLOB NOT NULL
+)
+"""
+
+def _pack_settings(settings):
+    return (layouts.KIT_REVERB.pack(*settings[:REVERB_FIELDS]) +
+            layouts.KIT_FX.pack(*settings[REVERB_FIELDS:]))
+
+
+def _unpack_settings(blob):
+    return (layouts.KIT_REVERB.unpack_from(blob) +
+            layouts.KIT_FX.unpack_from(blob, layouts.KIT_REVERB.size))
+
+
+def digest(data):
+    """Return the SHA-1 digest of a buffer"""
+    return hashlib.sha1(data).digest()
+
+
+class KitCache(object):
+    """
+        SQLite backed KitRecord cache. path defaults to an in-memory database.
+    """
+    def __init__(self, path=":memory:"):
+        self._db = sqlite3.connect(path)
+        self._db.execute(_SCHEMA)
+        self._db.commit()
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self._db.execute("SELECT COUNT(*) FROM kits").fetchone()[0]
+
+    @property
+    def stats(self):
+        """Lookup counters. revalidated hits are included in hits."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "revalidated": self.revalidated,
+            "misses": self.misses,
+            "hit_rate": float(self.hits) / lookups if lookups else 0.0,
+            "entries": len(self),
+        }
+
+    def reset_stats(self):
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+
+    def close(self):
+        self._db.close()
+
+    def get(self, path):
+        """Return the KitRecord for path, parsing it only if the file changed"""
+        record = self._lookup(path)
+        self._db.commit()
+        return record
+
+    def records(self, paths):
+        """Yield (path, KitRecord) for each path in order, committing once at the end"""
+        try:
+            for path in paths:
+                yield path, self._lookup(path)
+        finally:
+            self._db.commit()
+
+    def prune(self, paths):
+        """Drop entries for any path not in paths, returning how many were dropped"""
+        keep = set(paths)
+        stale = [x for x, in self._db.execute("SELECT path FROM kits") if x not in keep]
+        self._db.executemany("DELETE FROM kits WHERE path = ?", [(x,) for x in stale])
+        self._db.commit()
+        return len(stale)
+
+    def _lookup(self, path):
+        stat = os.stat(path)
+        row = self._db.execute(
+            "SELECT size, mtime_ns, digest, name, settings, samples, voices FROM kits WHERE path = ?",
+            (path,)).fetchone()
+        if row and row[0] == stat.st_size and row[1] == stat.st_mtime_ns:
+            self.hits += 1
+            return self._record(row)
+
+        data = helpers.map_file(path)
+        content_digest = digest(data)
+        if row and row[2] == content_digest:
+            self.hits += 1
+            self.revalidated += 1
+            self._db.execute("UPDATE kits SET size = ?, mtime_ns = ? WHERE path = ?",
+                             (stat.st_size, stat.st_mtime_ns, path))
+            return self._record(row)
+
+        self.misses += 1
+        record = kit_record(helpers.kit_name(path), data)
+        self._db.execute(
+            "INSERT OR REPLACE INTO kits VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (path, stat.st_size, stat.st_mtime_ns, content_digest, record.name,
+             _pack_settings(record.settings), "\0".join(record.samples), record.voices))
+        return record
+
+    @staticmethod
+    def _record(row):
+        samples = row[5].split("\0") if row[5] else []
+        return KitRecord(row[3], _unpack_settings(row[4]), samples, bytes(row[6]))
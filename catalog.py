@@ -0,0 +1,265 @@
+""" SQLite catalog of a kit library and its instruments.
+
+Kits, their reverb and FX settings, voices, layers, the samples they use
+and the Instruments tree go into one normalized database:
+
+    kits         id, path, name
+    kit_reverb   kit_id, reverb_type, reverb_name, size, color, level
+    kit_fx       kit_id, fx_type, fx_name, level, delay_left, ... damping
+    voices       id, kit_id, voice, trigger_spec, send_reverb, ... midi_note
+    layers       voice_id, layer, sample_id, level, pan, ... vel_level
+    samples      id, name, grp, instrument
+    instruments  id, grp, name, size, mtime
+
+A sample "Kicks/Metal 2.sin" has grp "Kicks" and instrument "Metal 2",
+matching the grp and name of its instruments row. Pan, tune, fine and
+cutoff are stored signed. Everything is loaded in one transaction with
+executemany, then indexed:
+
+    export_directory("kits.db", kit_root, instrument_root)
+
+    SELECT k.name, v.trigger_spec FROM layers l
+      JOIN samples s ON s.id = l.sample_id
+      JOIN voices v ON v.id = l.voice_id
+      JOIN kits k ON k.id = v.kit_id
+     WHERE s.name = 'Kicks/Metal 2.sin'
+"""
+import sqlite3
+
+from strikeparse import batch
+from strikeparse import constants
+from strikeparse import helpers
+from strikeparse import layouts
+from strikeparse import records
+from strikeparse import scan
+from strikeparse.data_models import StrikeKitVoiceTriggerSpec
+from strikeparse.records import REVERB_FIELDS
+
+_TABLES = ["kits", "kit_reverb", "kit_fx", "voices", "layers", "samples", "instruments"]
+
+_LAYER_NAMES = [name for name, _, _ in layouts.LAYER_FIELDS if name != "sample"]
+_VOICE_NAMES = [name for name, _, _ in layouts.VOICE_SETTINGS_FIELDS]
+_FX_NAMES = [name for name, _, _ in layouts.KIT_FX_FIELDS if name != "fx_type"]
+
+_SCHEMA = """
+CREATE TABLE kits (
+    id INTEGER PRIMARY KEY,
+    path TEXT,
+    name TEXT NOT NULL
+);
+CREATE TABLE kit_reverb (
+    kit_id INTEGER PRIMARY KEY REFERENCES kits (id),
+    reverb_type INTEGER NOT NULL,
+    reverb_name TEXT,
+    size INTEGER NOT NULL,
+    color INTEGER NOT NULL,
+    level INTEGER NOT NULL
+);
+CREATE TABLE kit_fx (
+    kit_id INTEGER PRIMARY KEY REFERENCES kits (id),
+    fx_type INTEGER NOT NULL,
+    fx_name TEXT,
+    {fx_columns}
+);
+CREATE TABLE voices (
+    id INTEGER PRIMARY KEY,
+    kit_id INTEGER NOT NULL REFERENCES kits (id),
+    voice INTEGER NOT NULL,
+    trigger_spec TEXT NOT NULL,
+    {voice_columns}
+);
+CREATE TABLE layers (
+    voice_id INTEGER NOT NULL REFERENCES voices (id),
+    layer TEXT NOT NULL,
+    sample_id INTEGER REFERENCES samples (id),
+    {layer_columns},
+    PRIMARY KEY (voice_id, layer)
+);
+CREATE TABLE samples (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    grp TEXT,
+    instrument TEXT
+);
+CREATE TABLE instruments (
+    id INTEGER PRIMARY KEY,
+    grp TEXT NOT NULL,
+    name TEXT NOT NULL,
+    size INTEGER,
+    mtime REAL
+);
+""".format(fx_columns=",\n    ".join("%s INTEGER NOT NULL" % x for x in _FX_NAMES),
+           voice_columns=",\n    ".join("%s INTEGER NOT NULL" % x for x in _VOICE_NAMES),
+           layer_columns=",\n    ".join("%s INTEGER NOT NULL" % x for x in _LAYER_NAMES))
+
+# Built after the load, a single pass each instead of an update per row.
+_INDEXES = """
+CREATE INDEX kits_name ON kits (name);
+CREATE INDEX voices_kit ON voices (kit_id);
+CREATE INDEX voices_trigger_spec ON voices (trigger_spec);
+CREATE INDEX voices_midi_note ON voices (midi_note);
+CREATE INDEX layers_sample ON layers (sample_id);
+CREATE INDEX samples_instrument ON samples (grp, instrument);
+CREATE UNIQUE INDEX instruments_name ON instruments (grp, name);
+"""
+
+# One unpack per 80 byte voice record: trigger spec, both layers and the settings.
+_VOICE_LAYOUT, _VOICE_FIELDS = layouts.fields_struct(
+    [("trigger_spec", "3s", len(constants.SENTINEL_INSTRUMENT_HEADER))] +
+    [("a_" + name, fmt, layouts.LAYER_A_OFFSET + offset) for name, fmt, offset in layouts.LAYER_FIELDS] +
+    [("b_" + name, fmt, layouts.LAYER_B_OFFSET + offset) for name, fmt, offset in layouts.LAYER_FIELDS] +
+    [(name, fmt, layouts.VOICE_SETTINGS_OFFSET + offset) for name, fmt, offset in layouts.VOICE_SETTINGS_FIELDS])
+
+_FIELD_INDEX = dict((name, x) for x, name in enumerate(_VOICE_FIELDS))
+_LAYER_INDEXES = dict((layer, [_FIELD_INDEX[layer + "_" + name] for name in ["sample"] + _LAYER_NAMES])
+                      for layer in ("a", "b"))
+_SETTINGS_INDEXES = [_FIELD_INDEX[x] for x in _VOICE_NAMES]
+
+# Kits decoded between executemany calls.
+BATCH_SIZE = 256
+
+_NO_SAMPLE = 255
+
+
+def split_sample(name):
+    """Return (group, instrument) for a sample path, e.g. ("Kicks", "Metal 2")"""
+    group, _, instrument = name.rpartition("/")
+    if instrument.lower().endswith(".sin"):
+        instrument = instrument[:-4]
+    return group or None, instrument
+
+
+def _placeholders(count):
+    return ", ".join(["?"] * count)
+
+
+class _Loader(object):
+    """Decodes KitRecords into rows, assigning kit, voice and sample ids"""
+    def __init__(self, db):
+        self._db = db
+        self._sample_ids = {}
+        self._triggers = {}
+        self._kit_id = 0
+        self._instrument_id = 0
+        self.counts = dict((x, 0) for x in _TABLES)
+        self._clear()
+
+    def _clear(self):
+        self._rows = dict((x, []) for x in _TABLES)
+
+    def _sample_id(self, name):
+        sample_id = self._sample_ids.get(name)
+        if sample_id is None:
+            sample_id = self._sample_ids[name] = len(self._sample_ids) + 1
+            group, instrument = split_sample(name)
+            self._rows["samples"].append((sample_id, name, group, instrument))
+        return sample_id
+
+    def _trigger(self, raw_trigger):
+        trigger = self._triggers.get(raw_trigger)
+        if trigger is None:
+            trigger = self._triggers[raw_trigger] = str(StrikeKitVoiceTriggerSpec(raw_trigger))
+        return trigger
+
+    def add(self, path, record):
+        self._kit_id += 1
+        kit_id = self._kit_id
+        rows = self._rows
+        rows["kits"].append((kit_id, path, record.name))
+
+        reverb_type, size, color, level = record.settings[:REVERB_FIELDS]
+        rows["kit_reverb"].append((kit_id, reverb_type, helpers.REVERB_TYPE_TABLE[reverb_type], size, color, level))
+        fx = record.settings[REVERB_FIELDS:]
+        rows["kit_fx"].append((kit_id, fx[0], helpers.FX_NAME_TABLE[fx[0]]) + tuple(fx[1:len(_FX_NAMES) + 1]))
+
+        samples = record.samples
+        for voice in range(constants.INSTRUMENT_COUNT):
+            values = _VOICE_LAYOUT.unpack_from(record.voices, voice * constants.INSTRUMENT_SIZE)
+            voice_id = (kit_id - 1) * constants.INSTRUMENT_COUNT + voice + 1
+            rows["voices"].append((voice_id, kit_id, voice, self._trigger(values[0])) +
+                                  tuple(values[x] for x in _SETTINGS_INDEXES))
+            for layer, indexes in _LAYER_INDEXES.items():
+                layer_values = [values[x] for x in indexes]
+                index = layer_values[0]
+                sample_id = self._sample_id(samples[index]) if index != _NO_SAMPLE and index < len(samples) else None
+                rows["layers"].append((voice_id, layer, sample_id) + tuple(layer_values[1:]))
+
+    def add_instrument(self, entry):
+        self._instrument_id += 1
+        self._rows["instruments"].append((self._instrument_id, entry.group, entry.name, entry.size, entry.mtime))
+
+    def flush(self):
+        for table in _TABLES:
+            rows = self._rows[table]
+            if not rows:
+                continue
+            self.counts[table] += len(rows)
+            self._db.executemany("INSERT INTO %s VALUES (%s)" % (table, _placeholders(len(rows[0]))), rows)
+        self._clear()
+
+
+def write_catalog(target, kits, instruments=()):
+    """Load kits and instruments into a fresh catalog, replacing any already there
+
+    :param target: Database path or an open sqlite3.Connection
+
+    :param kits: Iterable of (path, KitRecord) - e.g. cache.records(paths) or
+        batch.parse_files(paths, compact=True). Consumed in batches, not held.
+
+    :param instruments: Iterable of scan.InstrumentEntry
+
+    :return: Rows written per table
+
+    :rtype: dict
+    """
+    db = target if isinstance(target, sqlite3.Connection) else sqlite3.connect(target)
+    isolation_level = db.isolation_level
+    db.isolation_level = None
+    try:
+        db.execute("BEGIN")
+        try:
+            for table in _TABLES:
+                db.execute("DROP TABLE IF EXISTS %s" % table)
+            for statement in _SCHEMA.split(";"):
+                if statement.strip():
+                    db.execute(statement)
+            loader = _Loader(db)
+            pending = 0
+            for path, record in kits:
+                loader.add(path, record)
+                pending += 1
+                if pending == BATCH_SIZE:
+                    loader.flush()
+                    pending = 0
+            for entry in instruments:
+                loader.add_instrument(entry)
+            loader.flush()
+            for statement in _INDEXES.split(";"):
+                if statement.strip():
+                    db.execute(statement)
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        db.execute("ANALYZE")
+    finally:
+        db.isolation_level = isolation_level
+        if db is not target:
+            db.close()
+    return loader.counts
+
+
+def export_files(target, paths, instrument_root=None, jobs=None):
+    """Parse kit files, scan an Instruments folder and write the catalog
+
+    See batch.parse_files for jobs.
+
+    :rtype: dict
+    """
+    instruments = scan.scan_instruments(instrument_root) if instrument_root else ()
+    return write_catalog(target, batch.parse_files(paths, jobs=jobs, compact=True), instruments)
+
+
+def export_directory(target, root, instrument_root=None, jobs=None):
+    """Write the catalog for every .skt file under root, in sorted path order"""
+    return export_files(target, records.find_kits(root), instrument_root, jobs)
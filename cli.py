@@ -0,0 +1,211 @@
+""" Command line interface.
+
+    python -m strikeparse parse PATH... [--jobs N]
+    python -m strikeparse export PATH... [--jobs N | --readers N [--depth N]] [--output kits.csv] [--stats stats.json]
+    python -m strikeparse scan ROOT [--jobs N] [--output instruments.csv]
+    python -m strikeparse query SAMPLE PATH... [--prefix] [--layer a|b] [--index samples.json]
+    python -m strikeparse catalog DATABASE PATH... [--jobs N] [--instruments ROOT]
+    python -m strikeparse check INSTRUMENTS PATH... [--jobs N] [--output report.csv]
+
+PATH is a kit file or a folder searched for .skt files, check also takes
+kits.csv files for PATH and an instruments.csv for INSTRUMENTS. Subcommands import
+what they use when they run - the kit models, the enums in constants and
+NumPy stay unloaded for --help and for commands that don't touch them, which
+keeps short invocations quick to start.
+"""
+import argparse
+import os
+import sys
+
+__all__ = ["main"]
+
+
+def _kit_paths(paths):
+    # Files as given, folders expanded to their .skt files in sorted order.
+    from strikeparse import records
+
+    result = []
+    for path in paths:
+        if os.path.isdir(path):
+            result.extend(records.find_kits(path))
+        elif os.path.isfile(path):
+            result.append(path)
+        else:
+            raise IOError("No such file or directory: {0}".format(path))
+    return result
+
+
+def _output(args):
+    if args.output:
+        return open(args.output, "w", newline="")
+    return sys.stdout
+
+
+def _parse(args):
+    from strikeparse import batch
+    from strikeparse import helpers
+
+    for path, kit in batch.parse_files(_kit_paths(args.paths), jobs=args.jobs):
+        print(helpers.kit_name(path))
+        print(kit)
+    return 0
+
+
+def _export(args):
+    from strikeparse import export
+
+    if args.stats:
+        from strikeparse import stats
+        stats.enable()
+    stream = _output(args)
+    try:
+        export.export_files(stream, _kit_paths(args.paths), jobs=args.jobs, readers=args.readers, depth=args.depth)
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+        if args.stats:
+            stats.disable()
+    if args.stats:
+        stats.dump(args.stats)
+    return 0
+
+
+def _scan(args):
+    from strikeparse import scan
+
+    stream = _output(args)
+    try:
+        scan.write_catalog(stream, scan.scan_instruments(args.root, jobs=args.jobs or scan.DEFAULT_JOBS,
+                                                         stat=False))
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+    return 0
+
+
+def _query(args):
+    import csv
+    from strikeparse.sampleindex import SampleIndex
+
+    if args.index and os.path.exists(args.index):
+        index = SampleIndex.load(args.index)
+    else:
+        index = SampleIndex()
+    index.update_paths(_kit_paths(args.paths))
+    if args.index:
+        index.save(args.index)
+
+    if args.prefix:
+        matches = sorted(index.prefix(args.sample).items())
+    else:
+        matches = [(args.sample, index.lookup(args.sample))]
+    out = csv.writer(sys.stdout, lineterminator="\n")
+    found = 0
+    for sample, postings in matches:
+        for posting in postings:
+            if args.layer and posting.layer != args.layer:
+                continue
+            out.writerow([sample, posting.kit, posting.trigger_spec, posting.layer])
+            found += 1
+    return 0 if found else 1
+
+
+def _catalog(args):
+    from strikeparse import catalog
+
+    counts = catalog.export_files(args.database, _kit_paths(args.paths), args.instruments, jobs=args.jobs)
+    print("{0} kits, {1} samples, {2} instruments".format(counts["kits"], counts["samples"], counts["instruments"]))
+    return 0
+
+
+def _check(args):
+    import itertools
+    from strikeparse import integrity
+    from strikeparse import scan
+
+    if os.path.isdir(args.instruments):
+        instruments = list(scan.scan_instruments(args.instruments, jobs=args.jobs or scan.DEFAULT_JOBS, stat=False))
+    else:
+        with open(args.instruments, newline="") as f:
+            instruments = list(integrity.read_instruments_csv(f))
+
+    csv_paths = [x for x in args.paths if x.lower().endswith(".csv")]
+    references = [integrity.parse_references(_kit_paths([x for x in args.paths if x not in csv_paths]),
+                                             jobs=args.jobs)]
+    for path in csv_paths:
+        with open(path, newline="") as f:
+            references.append(list(integrity.read_kits_csv(f)))
+    report = integrity.check(itertools.chain.from_iterable(references), instruments)
+
+    stream = _output(args)
+    try:
+        integrity.write_report(stream, report)
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+    return 1 if report.dangling else 0
+
+
+def _parser():
+    parser = argparse.ArgumentParser(prog="strikeparse", description="Read Alesis Strike kit and instrument files")
+    commands = parser.add_subparsers(dest="command", metavar="command")
+    commands.required = True
+
+    jobs = argparse.ArgumentParser(add_help=False)
+    jobs.add_argument("-j", "--jobs", type=int, help="worker processes (threads for scan), 1 runs serially")
+
+    parse = commands.add_parser("parse", parents=[jobs], help="print the voices of kits")
+    parse.add_argument("paths", nargs="+", metavar="PATH", help="kit file or folder")
+    parse.set_defaults(func=_parse)
+
+    # --readers parses in this process, so it can't be combined with --jobs.
+    export = commands.add_parser("export", help="write kits.csv rows")
+    export.add_argument("paths", nargs="+", metavar="PATH", help="kit file or folder")
+    export.add_argument("-o", "--output", help="write to a file instead of stdout")
+    workers = export.add_mutually_exclusive_group()
+    workers.add_argument("-j", "--jobs", type=int, help="worker processes, 1 runs serially")
+    workers.add_argument("--readers", type=int, help="parse in this process with N threads reading ahead")
+    export.add_argument("--depth", type=int, help="files the readers keep ahead of parsing, readers * 2 by default")
+    export.add_argument("--stats", metavar="FILE", help="write parser stats as JSON, including the read overlap")
+    export.set_defaults(func=_export)
+
+    scan = commands.add_parser("scan", parents=[jobs], help="write instruments.csv rows for an Instruments folder")
+    scan.add_argument("root", metavar="ROOT", help="Instruments folder, e.g. the root of the SD card's")
+    scan.add_argument("-o", "--output", help="write to a file instead of stdout")
+    scan.set_defaults(func=_scan)
+
+    query = commands.add_parser("query", help="list the kits, voices and layers using a sample")
+    query.add_argument("sample", metavar="SAMPLE", help='sample path, e.g. "Kicks/Metal 2.sin"')
+    query.add_argument("paths", nargs="+", metavar="PATH", help="kit file or folder")
+    query.add_argument("--prefix", action="store_true", help="match every sample starting with SAMPLE")
+    query.add_argument("--layer", choices=("a", "b"), help="only this layer")
+    query.add_argument("--index", help="sample index file to reuse and update")
+    query.set_defaults(func=_query)
+
+    catalog = commands.add_parser("catalog", parents=[jobs], help="write kits and instruments to a SQLite database")
+    catalog.add_argument("database", metavar="DATABASE", help="SQLite file, its catalog tables are replaced")
+    catalog.add_argument("paths", nargs="+", metavar="PATH", help="kit file or folder")
+    catalog.add_argument("--instruments", metavar="ROOT", help="Instruments folder to catalog as well")
+    catalog.set_defaults(func=_catalog)
+
+    check = commands.add_parser("check", parents=[jobs], help="list missing samples and unused instruments")
+    check.add_argument("instruments", metavar="INSTRUMENTS", help="Instruments folder or instruments.csv")
+    check.add_argument("paths", nargs="+", metavar="PATH", help="kit file, folder or kits.csv")
+    check.add_argument("-o", "--output", help="write to a file instead of stdout")
+    check.set_defaults(func=_check)
+    return parser
+
+
+def main(argv=None):
+    """Run the command line, returning the exit status
+
+    :param argv: Arguments without the program name, sys.argv[1:] by default
+
+    :rtype: int
+    """
+    args = _parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except (IOError, OSError, ValueError) as e:
+        print("strikeparse: error: {0}".format(e), file=sys.stderr)
+        return 1
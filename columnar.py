@@ -0,0 +1,120 @@
+""" Columnar decoding of the kit instrument block with NumPy.
+
+The 24 x 80 byte instrument block maps straight onto a structured dtype, so a
+whole kit - or N kits stacked - decodes with one frombuffer call instead of
+building 24 voices and 48 layers per kit.
+
+NumPy is optional. Importing this module works without it, calling into it
+raises ImportError.
+
+Pan, tune, fine and cutoff are signed in the file and decode as int8 here.
+Everything else is unsigned, sample 255 means the layer has no sample.
+"""
+from strikeparse import constants
+from strikeparse import layouts
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+
+# Struct byte formats to their NumPy equivalents.
+_DTYPES = {"B": "u1", "b": "i1"}
+
+# Name, dtype and offset of each layer field, relative to the layer.
+LAYER_FIELDS = [(name, _DTYPES[fmt], offset) for name, fmt, offset in layouts.LAYER_FIELDS]
+
+# Name, dtype and offset of each voice settings field, relative to the settings.
+SETTINGS_FIELDS = [(name, _DTYPES[fmt], offset) for name, fmt, offset in layouts.VOICE_SETTINGS_FIELDS]
+
+LAYER_NAMES = ("a", "b")
+
+# Flat column names in to_columns order.
+COLUMNS = (["trigger_spec"] +
+           ["%s_%s" % (layer, name) for layer in LAYER_NAMES for name, _, _ in LAYER_FIELDS] +
+           [name for name, _, _ in SETTINGS_FIELDS])
+
+
+def _require_numpy():
+    if numpy is None:
+        raise ImportError("NumPy is required for columnar decoding")
+
+
+def _voice_dtype_spec():
+    names = ["trigger_spec"]
+    formats = ["S3"]
+    offsets = [8]
+    for layer, layer_offset in zip(LAYER_NAMES, (layouts.LAYER_A_OFFSET, layouts.LAYER_B_OFFSET)):
+        for name, fmt, offset in LAYER_FIELDS:
+            names.append("%s_%s" % (layer, name))
+            formats.append(fmt)
+            offsets.append(layer_offset + offset)
+    for name, fmt, offset in SETTINGS_FIELDS:
+        names.append(name)
+        formats.append(fmt)
+        offsets.append(layouts.VOICE_SETTINGS_OFFSET + offset)
+    return {"names": names, "formats": formats, "offsets": offsets,
+            "itemsize": constants.INSTRUMENT_SIZE}
+
+
+_VOICE_DTYPE = None
+
+
+def voice_dtype():
+    """Return the structured dtype for one 80 byte voice record
+
+    :rtype: numpy.dtype
+    """
+    global _VOICE_DTYPE
+    _require_numpy()
+    if _VOICE_DTYPE is None:
+        _VOICE_DTYPE = numpy.dtype(_voice_dtype_spec())
+    return _VOICE_DTYPE
+
+
+def decode_instruments(data, offset=constants.KIT_HEADER_SIZE):
+    """Decode the 24 voices of one kit
+
+    :param data: Raw kit file - bytes, bytearray, memoryview or mmap
+
+    :param offset: Start of the instrument block, the kit header size by default
+
+    :return: Structured array of shape (24,). A view into data, not a copy.
+
+    :rtype: numpy.ndarray
+    """
+    return numpy.frombuffer(data, dtype=voice_dtype(), count=constants.INSTRUMENT_COUNT,
+                            offset=offset)
+
+
+def decode_kits(kits, offset=constants.KIT_HEADER_SIZE):
+    """Decode the instrument blocks of many kits into one stacked array
+
+    :param kits: Iterable of raw kit files
+
+    :param offset: Start of the instrument block in each, 0 for bare instrument blocks
+
+    :return: Structured array of shape (N, 24)
+
+    :rtype: numpy.ndarray
+    """
+    dtype = voice_dtype()
+    begin = offset
+    end = begin + constants.INSTRUMENT_COUNT * constants.INSTRUMENT_SIZE
+    block = b"".join(bytes(memoryview(x)[begin:end]) for x in kits)
+    voices = numpy.frombuffer(block, dtype=dtype)
+    return voices.reshape(-1, constants.INSTRUMENT_COUNT)
+
+
+def to_columns(voices):
+    """Split decoded voices into flat, contiguous columns
+
+    :param voices: Array from decode_instruments or decode_kits
+
+    :return: Column name to 1-D array, one row per voice
+
+    :rtype: dict
+    """
+    flat = voices.reshape(-1)
+    return dict((name, numpy.ascontiguousarray(flat[name])) for name in COLUMNS)
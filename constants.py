@@ -64,6 +64,8 @@ INSTRUMENT_COUNT = 24
 INSTRUMENT_HEADER_SIZE = 12
 INSTRUMENT_LAYER_SIZE = 20
 INSTRUMENT_VOICE_SIZE = 28
+INSTRUMENT_FILE_HEADER_SIZE = 24
+CHUNK_HEADER_SIZE = 8
 
 SWAP_KV = lambda x: dict([(v, k) for k, v in x.items()])
 TUPLE_SWAP = lambda x: (x[1], x[0])
@@ -176,4 +178,4 @@ FX_GROUP = [
 
 ]
 SENTINEL_INSTRUMENT_HEADER = b"instH\x00\x00\x00"
-
+SENTINEL_INSTRUMENT_FILE_HEADER = b"INST"
@@ -0,0 +1,286 @@
+""" In-memory columnar table of a whole kit library.
+
+One row per voice layer - 48 rows per kit - holding the kit, trigger spec,
+layer, sample and every numeric voice/layer parameter as NumPy columns, so
+library-wide questions are array expressions rather than re-parsing files:
+
+    corpus = KitCorpus.from_directory(root)
+    loud_flat_snares = corpus.filter(corpus.trigger_mask("S") &
+                                     (corpus["level"] > 90) &
+                                     (corpus["tune"] < 0))
+
+Requires NumPy.
+
+from_files with jobs > 1 loads across a process pool without pickling kits
+back: workers copy each kit's fixed 24 x 80 byte voice block straight into a
+multiprocessing.shared_memory buffer and send only the kit name and sample
+table, which the parent decodes in place with one frombuffer call.
+"""
+import os
+from functools import partial
+
+from strikeparse import columnar
+from strikeparse import constants
+from strikeparse import helpers
+from strikeparse import samplepool
+from strikeparse import layouts
+from strikeparse import records
+from strikeparse.data_models import StrikeKitVoiceInstruments
+from strikeparse.data_models import StrikeKitVoiceTriggerSpec
+from strikeparse.records import KitRecord
+from strikeparse.records import kit_record
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+
+# Sample column value for layers without a sample.
+NO_SAMPLE = samplepool.NO_SAMPLE
+
+LAYERS_PER_KIT = constants.INSTRUMENT_COUNT * len(columnar.LAYER_NAMES)
+
+LAYER_COLUMNS = [name for name, _, _ in columnar.LAYER_FIELDS if name != "sample"]
+VOICE_COLUMNS = [name for name, _, _ in columnar.SETTINGS_FIELDS]
+
+# kit, voice and layer are row positions, sample is a samplepool id.
+COLUMNS = ["kit", "voice", "layer", "trigger_spec", "sample"] + LAYER_COLUMNS + VOICE_COLUMNS
+
+
+def _require_numpy():
+    if numpy is None:
+        raise ImportError("NumPy is required for KitCorpus")
+
+
+def _sample_lut(pool, samples):
+    # Sample table index -> pool id. 255 stays NO_SAMPLE.
+    lut = numpy.full(256, NO_SAMPLE, dtype=numpy.int32)
+    ids = pool.intern_all(samples[:255])
+    lut[:len(ids)] = ids
+    return lut
+
+
+# Bytes of one kit's instrument block in the shared buffer.
+VOICE_BLOCK_SIZE = constants.INSTRUMENT_COUNT * constants.INSTRUMENT_SIZE
+
+
+def _copy_voices(block_name, start, paths):
+    # Pool worker - voice blocks go into the shared buffer from kit start on,
+    # only (kit name, sample table) per kit is pickled back.
+    from multiprocessing import shared_memory
+    block = shared_memory.SharedMemory(name=block_name)
+    try:
+        result = []
+        for position, path in enumerate(paths, start):
+            view = memoryview(helpers.map_file(path))
+            offset = position * VOICE_BLOCK_SIZE
+            block.buf[offset:offset + VOICE_BLOCK_SIZE] = view[constants.KIT_HEADER_SIZE:layouts.SAMPLE_TABLE_OFFSET]
+            samples = StrikeKitVoiceInstruments(view[layouts.SAMPLE_TABLE_OFFSET:]).sample_table
+            result.append((helpers.kit_name(path), samples))
+            view.release()
+        return result
+    finally:
+        block.close()
+
+
+def _empty_voices():
+    return dict((name, numpy.zeros(0, dtype=columnar.voice_dtype()[name])) for name in columnar.COLUMNS)
+
+
+class KitCorpus(object):
+    """
+        Columnar table of kit voice layers.
+
+        kit_names is shared by every corpus filtered from the same load and
+        the kit column indexes into it. The sample column holds ids from the
+        sample pool, samplepool.POOL by default, so corpora loaded in the
+        same process compare and group samples by id.
+    """
+    def __init__(self, columns, kit_names, pool=None):
+        self._columns = columns
+        self._kit_names = kit_names
+        self._pool = pool if pool is not None else samplepool.POOL
+
+    @classmethod
+    def from_directory(cls, root, index=None, jobs=1):
+        """Load every .skt file under root, see from_files for jobs"""
+        return cls.from_files(records.find_kits(root), index=index, jobs=jobs)
+
+    @classmethod
+    def from_files(cls, paths, index=None, jobs=1, chunksize=None):
+        """
+            Load the given kit files, named by helpers.kit_name.
+
+            Pass a sampleindex.SampleIndex as index to fill it, keyed by path,
+            as the kits are loaded.
+
+            jobs above 1 loads in that many worker processes through shared
+            memory, None uses os.cpu_count(). chunksize is the paths handed to
+            a worker at a time.
+        """
+        if jobs != 1:
+            return cls._from_files_shared(list(paths), index, jobs or os.cpu_count() or 1, chunksize)
+
+        def records():
+            for path in paths:
+                record = kit_record(helpers.kit_name(path), helpers.map_file(path))
+                if index is not None:
+                    index.add_record(path, record)
+                yield record
+        return cls.from_records(records())
+
+    @classmethod
+    def _from_files_shared(cls, paths, index, jobs, chunksize):
+        _require_numpy()
+        count = len(paths)
+        if count < 2:
+            return cls.from_files(paths, index=index)
+        from multiprocessing import Pool
+        from multiprocessing import shared_memory
+
+        jobs = min(jobs, count)
+        # A few chunks per worker, as batch.parse_files.
+        chunksize = chunksize or max(1, count // (jobs * 4))
+        block = shared_memory.SharedMemory(create=True, size=count * VOICE_BLOCK_SIZE)
+        try:
+            tasks = [(block.name, start, paths[start:start + chunksize]) for start in range(0, count, chunksize)]
+            with Pool(jobs) as pool:
+                kits = [kit for chunk in pool.starmap(_copy_voices, tasks) for kit in chunk]
+
+            sample_pool = samplepool.POOL
+            kit_names = [name for name, _ in kits]
+            sample_luts = [_sample_lut(sample_pool, samples) for _, samples in kits]
+            if index is not None:
+                for position, (path, (name, samples)) in enumerate(zip(paths, kits)):
+                    offset = position * VOICE_BLOCK_SIZE
+                    voices = bytes(block.buf[offset:offset + VOICE_BLOCK_SIZE])
+                    index.add_record(path, KitRecord(name, None, samples, voices))
+            # to_columns copies each field out, nothing is left pointing into the block.
+            decoded = numpy.frombuffer(block.buf, dtype=columnar.voice_dtype(),
+                                       count=count * constants.INSTRUMENT_COUNT)
+            voices = columnar.to_columns(decoded)
+            del decoded
+        finally:
+            block.close()
+            block.unlink()
+        return cls._from_voices(voices, sample_luts, kit_names, sample_pool)
+
+    @classmethod
+    def from_raw(cls, kits):
+        """Build a corpus from (kit name, raw kit data) pairs"""
+        return cls.from_records(kit_record(name, raw) for name, raw in kits)
+
+    @classmethod
+    def from_records(cls, records, pool=None):
+        """Build a corpus from KitRecords"""
+        _require_numpy()
+        pool = pool if pool is not None else samplepool.POOL
+        kit_names = []
+        voice_blocks = []
+        sample_luts = []
+        for record in records:
+            kit_names.append(record.name)
+            voice_blocks.append(record.voices)
+            sample_luts.append(_sample_lut(pool, record.samples))
+
+        if voice_blocks:
+            voices = columnar.to_columns(columnar.decode_kits(voice_blocks, offset=0))
+        else:
+            voices = _empty_voices()
+        return cls._from_voices(voices, sample_luts, kit_names, pool)
+
+    @classmethod
+    def _from_voices(cls, voices, sample_luts, kit_names, pool):
+        # voices - columnar.to_columns output for len(kit_names) kits.
+        count = len(kit_names)
+        luts = numpy.stack(sample_luts) if count else numpy.zeros((0, 256), dtype=numpy.int32)
+        columns = {}
+        columns["kit"] = numpy.repeat(numpy.arange(count, dtype=numpy.int32), LAYERS_PER_KIT)
+        columns["voice"] = numpy.tile(
+            numpy.repeat(numpy.arange(constants.INSTRUMENT_COUNT, dtype=numpy.uint8), 2), count)
+        columns["layer"] = numpy.tile(numpy.arange(2, dtype=numpy.uint8), count * constants.INSTRUMENT_COUNT)
+        for name in ["trigger_spec"] + VOICE_COLUMNS:
+            columns[name] = numpy.repeat(voices[name], 2)
+        for name in LAYER_COLUMNS + ["sample"]:
+            # interleave a/b so rows go kit, voice, layer.
+            columns[name] = numpy.stack([voices["a_" + name], voices["b_" + name]], axis=1).reshape(-1)
+        columns["sample"] = luts[columns["kit"], columns["sample"]]
+        return cls(columns, kit_names, pool)
+
+    def __len__(self):
+        return len(self._columns["kit"])
+
+    def __getitem__(self, column):
+        return self._columns[column]
+
+    def __repr__(self):
+        return "<KitCorpus {0} rows, {1} kits>".format(len(self), len(numpy.unique(self["kit"])))
+
+    @property
+    def columns(self):
+        return self._columns
+
+    @property
+    def kit_names(self):
+        return self._kit_names
+
+    @property
+    def pool(self):
+        return self._pool
+
+    @property
+    def sample_names(self):
+        """Names indexed by the sample column. Covers the whole pool, not just this corpus."""
+        return self._pool.names
+
+    def filter(self, mask):
+        """Return a corpus of the rows selected by a boolean mask or index array"""
+        columns = dict((name, values[mask]) for name, values in self._columns.items())
+        return KitCorpus(columns, self._kit_names, self._pool)
+
+    def trigger_mask(self, spec):
+        """Return a mask of rows whose trigger spec starts with spec, e.g. "S", "T2", "C1E" """
+        if not isinstance(spec, bytes):
+            spec = spec.encode("ascii")
+        return numpy.char.startswith(self["trigger_spec"], spec)
+
+    def kit_mask(self, name):
+        """Return a mask of rows belonging to the named kit"""
+        ids = [i for i, x in enumerate(self._kit_names) if x == name]
+        return numpy.isin(self["kit"], ids)
+
+    def sample_mask(self, name):
+        """Return a mask of rows using the named sample"""
+        sample_id = self._pool.get_id(name)
+        if sample_id == NO_SAMPLE:
+            return numpy.zeros(len(self), dtype=bool)
+        return self["sample"] == sample_id
+
+    def has_sample(self):
+        """Return a mask of rows with a sample assigned"""
+        return self["sample"] != NO_SAMPLE
+
+    def group_by(self, column):
+        """Return value -> row index array for each distinct value of column"""
+        values = self[column]
+        order = numpy.argsort(values, kind="stable")
+        keys, starts = numpy.unique(values[order], return_index=True)
+        groups = numpy.split(order, starts[1:])
+        return dict((key.item(), rows) for key, rows in zip(keys, groups))
+
+    def counts(self, column):
+        """Return value -> number of rows for each distinct value of column"""
+        keys, counts = numpy.unique(self[column], return_counts=True)
+        return dict((key.item(), int(count)) for key, count in zip(keys, counts))
+
+    def rows(self):
+        """Yield each row as a dict, with kit, trigger spec and sample names resolved"""
+        names = list(self._columns)
+        for values in zip(*[self._columns[x].tolist() for x in names]):
+            row = dict(zip(names, values))
+            row["kit"] = self._kit_names[row["kit"]]
+            row["trigger_spec"] = str(StrikeKitVoiceTriggerSpec(row["trigger_spec"]))
+            row["layer"] = columnar.LAYER_NAMES[row["layer"]]
+            row["sample"] = self._pool.name(row["sample"])
+            yield row
@@ -1,6 +1,7 @@
-import os
 import sys
 
+from strikeparse import scan
+
 PARSE_DIR = None
 DEBUG = True
 
@@ -21,30 +22,20 @@ Args:
     """)
 
 def main(*args):
+    parse_dir = PARSE_DIR
     if DEBUG:
         if len(args) == 1:
-            PARSE_DIR = "D:\\Projects\\Music\\StrikePro\\internalSD\\Instruments"
+            parse_dir = "D:\\Projects\\Music\\StrikePro\\internalSD\\Instruments"
     # print help and bail
-    if len(args) == 1 and not PARSE_DIR:
+    if len(args) == 1 and not parse_dir:
         print_help()
         return
     else:
-        PARSE_DIR = PARSE_DIR or args[1]
-
-    for inst_group in os.listdir(PARSE_DIR):
-        # dirs are Instrument groups.
-        group_path = os.path.join(PARSE_DIR, inst_group)
-
-        if os.path.isdir(group_path):
-            # import pdb; pdb.set_trace()
-            for name in filter(lambda x: str(x).endswith("sin"), os.listdir(group_path)):
-                # All files in an instrument group are SIN files.
-                print("{0},{1}".format(inst_group,
-                                       name[0:-4]))
-
-                
-
+        parse_dir = parse_dir or args[1]
 
+    # dirs are Instrument groups, scanned concurrently.
+    # All files in an instrument group are SIN files.
+    scan.write_catalog(sys.stdout, scan.scan_instruments(parse_dir, stat=False))
 
 
 if __name__ == "__main__":
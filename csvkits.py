@@ -1,22 +1,18 @@
 import os
+import sys
 
-from strikeparse.data_models import StrikeKit
+from strikeparse import export
 
 PARSE_DIR = "d:\\Projects\\Music\\StrikePro\\strikeparse\\strikeparse\\data"
 
-def main():
+def main(jobs=None, readers=None, depth=None):
     # Iterate through the files in the data folder.
-    # Print the file name.
-    # Print the CSV representation of the kit indented.
-    files = filter(lambda x: x.endswith(".skt"), os.listdir(PARSE_DIR))
-    for x in files:
-        kit_name = x[4:-4]
-        full_path = "\\".join([PARSE_DIR, x])
-        with open(full_path, 'rb') as f:
-            d = f.read()
-            kit = StrikeKit(raw_data=d)
-            for i in kit.instruments:
-                print(",".join([kit_name, i.csv()]))
+    # Write a kits.csv row per voice: kit name, trigger spec, layer samples.
+    files = sorted(filter(lambda x: x.endswith(".skt"), os.listdir(PARSE_DIR)))
+    paths = [os.path.join(PARSE_DIR, x) for x in files]
+    # Kits parse across processes and stream out in file order. With readers,
+    # threads read ahead off the card while this process parses instead.
+    export.export_files(sys.stdout, paths, jobs=jobs, readers=readers, depth=depth)
 
 
 if __name__ == "__main__":
@@ -1,5 +1,32 @@
+from collections import namedtuple
+
 from strikeparse import constants
 from strikeparse import helpers
+from strikeparse import layouts
+from strikeparse import samplepool
+
+# Regions of a kit that differ between two versions of the file. voices holds
+# the indices of the changed voice records, header and samples are bools.
+KitDiff = namedtuple("KitDiff", ["header", "voices", "samples"])
+
+
+def diff_kit(old_data, new_data):
+    """
+        Compare two raw kits region by region - the header, each 80 byte
+        voice record and the sample table.
+
+        :rtype: KitDiff
+    """
+    with memoryview(old_data) as old, memoryview(new_data) as new:
+        header = old[:constants.KIT_HEADER_SIZE] != new[:constants.KIT_HEADER_SIZE]
+        voices = []
+        for x in range(constants.INSTRUMENT_COUNT):
+            start_index = constants.KIT_HEADER_SIZE + x * constants.INSTRUMENT_SIZE
+            end_index = start_index + constants.INSTRUMENT_SIZE
+            if old[start_index:end_index] != new[start_index:end_index]:
+                voices.append(x)
+        samples = old[layouts.SAMPLE_TABLE_OFFSET:] != new[layouts.SAMPLE_TABLE_OFFSET:]
+    return KitDiff(header, voices, samples)
 
 
 class StrikeKit(object):
@@ -121,17 +148,41 @@ class StrikeKit(object):
                               00 = ??
 
     33 byte Kit data?       - Appears to be kit-specific settings, needs decoding.
+
+    Pass lazy=True to keep a single memoryview over the raw data instead of
+    parsing up front. Header, sample table and each voice are then decoded
+    the first time they're asked for.
     """
+    __slots__ = ("_kit_settings", "_instruments", "_samples", "_data")
+
     def __init__(self, *args, **kwargs):
         self._kit_settings = None
         self._instruments = None
         self._samples = None
+        self._data = None
 
         raw_data = kwargs.get("raw_data") or args[0]
         # parse raw data if it's there
         if raw_data:
-            # Yea assignment by side effect
-            self._parse_raw_kit(raw_data)
+            if kwargs.get("lazy"):
+                self._data = memoryview(raw_data)
+            else:
+                # Yea assignment by side effect
+                self._parse_raw_kit(raw_data)
+
+    @classmethod
+    def from_path(cls, path, lazy=False, use_mmap=True):
+        """
+            Load a kit file, memory mapped by default.
+
+            Eager kits copy what they decode and drop the mapping once parsed.
+            Lazy kits keep it open for as long as the kit is alive.
+        """
+        data = helpers.map_file(path, use_mmap)
+        if not lazy:
+            # Parse through a memoryview so slicing doesn't copy out of the map.
+            data = memoryview(data)
+        return cls(data, lazy=lazy)
 
     def __str__(self):
         return "\n".join(map(str, self.instruments))
@@ -139,18 +190,68 @@ class StrikeKit(object):
     def csv(self):
         return "\n".join(map(str, map(StrikeKitVoice.csv, self.instruments)))
 
+    def rows(self):
+        """Yield a csv row - trigger spec, layer A sample, layer B sample - per voice."""
+        for voice in self.instruments:
+            yield voice.row()
+
+    @property
+    def lazy(self):
+        return self._data is not None
+
     @property
     def kit_settings(self):
+        if self._kit_settings is None and self.lazy:
+            self._parse_header(self._data[0:constants.KIT_HEADER_SIZE])
         return self._kit_settings
 
     @property
     def instruments(self):
+        if self._instruments is None and self.lazy:
+            self._instruments = StrikeKitVoiceList(self._data[constants.KIT_HEADER_SIZE:layouts.SAMPLE_TABLE_OFFSET],
+                                                   self)
         return self._instruments
 
     @property
     def samples(self):
+        if self._samples is None and self.lazy:
+            self._parse_samples(self._data[layouts.SAMPLE_TABLE_OFFSET:])
         return self._samples
 
+    def reparse(self, data, old_data):
+        """
+            Return a StrikeKit for data, re-decoding only what differs from
+            old_data - the bytes this kit was parsed from. Hold on to a copy
+            of those, a kit mapped from the file that changed won't do.
+
+            Unchanged voices are shared with this kit. With a changed sample
+            table they're still shared as long as their layers resolve to the
+            same sample names.
+        """
+        diff = diff_kit(old_data, data)
+        view = memoryview(data)
+        kit = type(self)(None)
+        if diff.header:
+            kit._parse_header(view[0:constants.KIT_HEADER_SIZE])
+        else:
+            kit._kit_settings = self.kit_settings
+        if diff.samples:
+            kit._parse_samples(view[layouts.SAMPLE_TABLE_OFFSET:])
+        else:
+            kit._samples = self.samples
+
+        result = []
+        for x, voice in enumerate(self.instruments):
+            if x in diff.voices or (diff.samples and not voice._uses_samples(kit.samples)):
+                start_index = constants.KIT_HEADER_SIZE + x * constants.INSTRUMENT_SIZE
+                end_index = start_index + constants.INSTRUMENT_SIZE
+                voice = StrikeKitVoice(view[start_index:end_index], samples=kit.samples)
+            else:
+                voice._detach(kit.samples)
+            result.append(voice)
+        kit._instruments = result
+        return kit
+
     def _parse_raw_kit(self, data):
         raw_header = data[0:constants.KIT_HEADER_SIZE]
         self._parse_header(raw_header)
@@ -170,11 +271,8 @@ class StrikeKit(object):
             4 byte little endian integer declaring header length? 0x2c/44 in every file we've found.
             What follows isn't much.
         """
-        kit_header = data[0:4]
-        header_length = helpers.parse_dword(data[4:8])
-        raw_header = data[8:8+header_length]
-        raw_settings = raw_header[8:24]
-        self._kit_settings = StrikeKitSettings(raw_settings)
+        kit_header, header_length = layouts.KIT_HEADER.unpack_from(data)
+        self._kit_settings = StrikeKitSettings(data, offset=layouts.KIT_SETTINGS_OFFSET)
 
     def _parse_samples(self, data):
         self._samples = StrikeKitVoiceInstruments(data)
@@ -190,6 +288,44 @@ class StrikeKit(object):
             result.append(instrument)
         self._instruments = result
 
+
+class StrikeKitVoiceList(object):
+    """
+        Read-only sequence of the 24 voices in a lazy kit.
+
+        Voices are built from a slice of the kit's memoryview the first time
+        they're indexed, then cached.
+    """
+    __slots__ = ("_data", "_kit", "_voices")
+
+    def __init__(self, data, kit):
+        self._data = data
+        self._kit = kit
+        self._voices = [None] * constants.INSTRUMENT_COUNT
+
+    def __len__(self):
+        return constants.INSTRUMENT_COUNT
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[x] for x in range(*index.indices(len(self)))]
+        if index < 0:
+            index += constants.INSTRUMENT_COUNT
+        if not 0 <= index < constants.INSTRUMENT_COUNT:
+            raise IndexError("voice index out of range")
+        voice = self._voices[index]
+        if voice is None:
+            start_index = index * constants.INSTRUMENT_SIZE
+            end_index = start_index + constants.INSTRUMENT_SIZE
+            voice = StrikeKitVoice(self._data[start_index:end_index], samples=self._kit.samples, lazy=True)
+            self._voices[index] = voice
+        return voice
+
+    def __iter__(self):
+        for x in range(constants.INSTRUMENT_COUNT):
+            yield self[x]
+
+
 class StrikeKitVoice(object):
     """
         Instrument section
@@ -261,12 +397,25 @@ class StrikeKitVoice(object):
         62          1 byte 0 pad?
         63          5 byte FF terminator
         68         11 byte zero pad?
+
+        With lazy=True only the trigger spec is decoded up front; layers and
+        voice settings are decoded from raw_data on first access.
         """
-    
-    #
-    def __init__(self, raw_data=None, samples=[]):
+    __slots__ = ("_data", "_samples", "_trigger_spec", "_layer_a", "_layer_b", "_instrument_settings")
+
+    def __init__(self, raw_data=None, samples=[], lazy=False):
+        self._data = None
+        self._samples = samples
+        self._trigger_spec = None
+        self._layer_a = None
+        self._layer_b = None
+        self._instrument_settings = None
         if raw_data:
-            self._parse(raw_data, samples)
+            if lazy:
+                self._data = raw_data
+                self._parse_header(raw_data)
+            else:
+                self._parse(raw_data, samples)
 
     def __str__(self):
         return """{0}
@@ -275,7 +424,10 @@ class StrikeKitVoice(object):
         """.format(self.trigger_spec, self.layer_a, self.layer_b)
 
     def csv(self):
-        return ",".join([self.trigger_spec.csv(), self.layer_a.csv(), self.layer_b.csv()])
+        return ",".join(self.row())
+
+    def row(self):
+        return [self.trigger_spec.csv(), self.layer_a.csv(), self.layer_b.csv()]
 
     @property
     def trigger_spec(self):
@@ -283,30 +435,65 @@ class StrikeKitVoice(object):
 
     @property
     def layer_a(self):
+        if self._layer_a is None and self._data is not None:
+            self._parse_layers(self._data, self._samples)
         return self._layer_a
 
     @property
     def layer_b(self):
+        if self._layer_b is None and self._data is not None:
+            self._parse_layers(self._data, self._samples)
         return self._layer_b
 
+    @property
+    def instrument_settings(self):
+        if self._instrument_settings is None and self._data is not None:
+            self._parse_settings(self._data)
+        return self._instrument_settings
+
+    def _uses_samples(self, samples):
+        # True if both layers resolve to the same sample names in samples.
+        for layer in (self.layer_a, self.layer_b):
+            if layer._sample_index == 255:
+                continue
+            ids = samples.sample_ids
+            if layer._sample_index >= len(ids) or ids[layer._sample_index] != layer.sample_id:
+                return False
+        return True
+
+    def _detach(self, samples):
+        # Finish decoding so the voice no longer needs the buffer it came from.
+        self.layer_a
+        self.instrument_settings
+        self._data = None
+        self._samples = samples
+
     def _parse(self, data, samples=[]):
-        raw_header = data[0:constants.INSTRUMENT_HEADER_SIZE]
+        self._parse_header(data)
+        self._parse_layers(data, samples)
+        self._parse_settings(data)
+
+    def _parse_header(self, data):
         # throwaway data.
-        inst_header = raw_header[0:8]
+        inst_header, trigger_spec = layouts.INSTRUMENT_HEADER.unpack_from(data)
         # but make sure it's the right throwaway data.
         assert inst_header == constants.SENTINEL_INSTRUMENT_HEADER
-        self._trigger_spec = StrikeKitVoiceTriggerSpec(raw_header[8:11])
-        raw_layers = data[constants.INSTRUMENT_HEADER_SIZE:constants.INSTRUMENT_HEADER_SIZE+(constants.INSTRUMENT_LAYER_SIZE*2)]
-        assert len(raw_layers) == constants.INSTRUMENT_LAYER_SIZE*2
+        self._trigger_spec = StrikeKitVoiceTriggerSpec(trigger_spec)
+
+    def _parse_layers(self, data, samples=[]):
+        assert len(data) == constants.INSTRUMENT_SIZE
 
-        self._layer_a = StrikeKitVoiceLayer(raw_data=raw_layers[0:constants.INSTRUMENT_LAYER_SIZE], samples=samples)
-        self._layer_b = StrikeKitVoiceLayer(raw_data=raw_layers[constants.INSTRUMENT_LAYER_SIZE:], samples=samples)
-        raw_voice = data[constants.INSTRUMENT_HEADER_SIZE+(2*constants.INSTRUMENT_LAYER_SIZE):]
-        assert len(raw_voice) == constants.INSTRUMENT_VOICE_SIZE
-        self.instrument_settings = StrikeKitVoiceSettings(raw_data=raw_voice)
+        self._layer_a = StrikeKitVoiceLayer(raw_data=data, samples=samples, offset=layouts.LAYER_A_OFFSET)
+        self._layer_b = StrikeKitVoiceLayer(raw_data=data, samples=samples, offset=layouts.LAYER_B_OFFSET)
+
+    def _parse_settings(self, data):
+        assert len(data) == constants.INSTRUMENT_SIZE
+        self._instrument_settings = StrikeKitVoiceSettings(raw_data=data, offset=layouts.VOICE_SETTINGS_OFFSET)
 
 
 class StrikeKitVoiceTriggerSpec(object):
+    __slots__ = ("input_type", "input_index", "input_pin")
+
     def __init__(self, raw_data=None, *args, **kwargs):
         if raw_data:
             self._parse(raw_data)
@@ -323,13 +510,38 @@ class StrikeKitVoiceTriggerSpec(object):
         return str(self)
 
 class StrikeKitVoiceLayer(object):
-    def __init__(self, raw_data=None, samples=None, *args, **kwargs):
+    """
+        Layer sample names are held as samplepool ids.
+    """
+    __slots__ = ("_sample_index", "_sample_id",
+                 "lvl_level", "lvl_pan", "lvl_decay",
+                 "tone_tune", "tone_fine", "tone_cutoff",
+                 "vel_filtertype", "vel_decay", "vel_pitch", "vel_filter", "vel_level",
+                 "pad1", "term_pad")
+
+    def __init__(self, raw_data=None, samples=None, offset=0, *args, **kwargs):
         if raw_data:
-            self._parse(raw_data, samples)
+            self._parse(raw_data, samples, offset)
+
+    def __getstate__(self):
+        # Pool ids don't survive a process boundary, names do.
+        state = dict((x, getattr(self, x)) for x in self.__slots__ if hasattr(self, x))
+        state["_sample_id"] = self.sample_name
+        return state
+
+    def __setstate__(self, state):
+        name = state.pop("_sample_id")
+        self._sample_id = samplepool.POOL.intern(name) if name else samplepool.NO_SAMPLE
+        for key, value in state.items():
+            setattr(self, key, value)
+
+    @property
+    def sample_id(self):
+        return self._sample_id
 
     @property
     def sample_name(self):
-        return self._sample_name
+        return samplepool.POOL.name(self._sample_id)
 
     @property
     def settings_str(self):
@@ -350,7 +562,7 @@ FILTER:
     Pitch:  {8}
     Filter: {9}
     Level:  {10}
-        """.format(self.lvl_level, helpers.pretty_pan(self.lvl_pan), self.lvl_decay,
+        """.format(self.lvl_level, helpers.PAN_TABLE[self.lvl_pan], self.lvl_decay,
                    self.tone_tune, self.tone_fine, self.tone_cutoff,
                    helpers.pretty_filter_type(self.vel_filtertype),
                    self.vel_decay, self.vel_pitch, self.vel_filter, self.vel_level)
@@ -361,37 +573,29 @@ FILTER:
     def csv(self):
         return "{0}".format(self.sample_name)
 
-    def _parse(self, data, samples=None):
+    def _parse(self, data, samples=None, offset=0):
+        # Mystery pad byte after the sample ref and pad0 are skipped by the layout.
+        (self._sample_index,
+         self.lvl_level, self.lvl_pan, self.lvl_decay,
+         self.tone_tune, self.tone_fine, self.tone_cutoff,
+         self.vel_filtertype, self.vel_decay, self.vel_pitch, self.vel_filter, self.vel_level,
+         self.pad1, self.term_pad) = layouts.VOICE_LAYER.unpack_from(data, offset)
         # 0-47 if there's a sample. FF if not
-        self._sample_index = helpers.parse_signed_byte(data[0])
         if self._sample_index >= 0 and self._sample_index != 255:
-            self._sample_name = samples.get_sample_by_index(self._sample_index)
+            self._sample_id = samples.get_sample_id_by_index(self._sample_index)
         else:
-            self._sample_name = ""
-        # mystery pad byte.
-        byte2 = data[1]
-        self.lvl_level = helpers.parse_signed_byte(data[2])
-        self.lvl_pan = helpers.parse_signed_byte(data[3])
-        self.lvl_decay = helpers.parse_signed_byte(data[4])
-        pad0 = data[5:8]
-        self.tone_tune = helpers.parse_signed_byte(data[8])
-        self.tone_fine = helpers.parse_signed_byte(data[9])
-        self.tone_cutoff = helpers.parse_signed_byte(data[10])
-        self.vel_filtertype = helpers.parse_signed_byte(data[11])
-        self.vel_decay = helpers.parse_signed_byte(data[12])
-        self.vel_pitch = helpers.parse_signed_byte(data[13])
-        self.vel_filter = helpers.parse_signed_byte(data[14])
-        self.vel_level = helpers.parse_signed_byte(data[15])
-        self.pad1 = data[16]
-        self.term_pad = data[17:20]
+            self._sample_id = samplepool.NO_SAMPLE
     
 
 class StrikeKitVoiceSettings(object):
+    __slots__ = ("send_reverb", "send_fx", "priority", "mutegroup", "playback",
+                 "midi_channel", "midi_note", "midi_gate", "midi_noteoff")
+
     def __init__(self, *args, **kwargs):
         raw_data = kwargs.get("raw_data")
 
         if raw_data:
-            self._parse(raw_data)
+            self._parse(raw_data, kwargs.get("offset", 0))
 
     def __str__(self):
         return """
@@ -408,39 +612,48 @@ MIDI Gate Time: {7}
 MIDI Note Off:  {8}
         """.format(self.send_reverb, self.send_fx, helpers.pretty_priority(self.priority),
                    helpers.pretty_mute_group(self.mutegroup),
-                   helpers.pretty_priority(self.priority),
                    helpers.pretty_playback(self.playback),
                    self.midi_channel, self.midi_note, self.midi_gate,
                    helpers.pretty_note_off(self.midi_noteoff))
 
-    def _parse(self, data):
-        self.send_reverb = helpers.parse_signed_byte(data[0])
-        self.send_fx =  helpers.parse_signed_byte(data[1])
-        pad0 = data[2:4]
-        self.priority =  helpers.parse_signed_byte(data[4])
-        self.mutegroup =  helpers.parse_signed_byte(data[5])
-        self.playback =  helpers.parse_signed_byte(data[6])
-        self.midi_channel = helpers.parse_signed_byte(data[7])
-        self.midi_note =  helpers.parse_signed_byte(data[8])
-        self.midi_gate = helpers.parse_signed_byte(data[7])
-        self.midi_noteoff = helpers.parse_signed_byte(data[8])
-        pad1 = data[9]
-        ffterminator = data[10:15]
-        pad2 = data[15:]
+    def _parse(self, data, offset=0):
+        (self.send_reverb, self.send_fx,
+         self.priority, self.mutegroup, self.playback,
+         self.midi_channel, self.midi_note, self.midi_gate, self.midi_noteoff,
+         ffterminator) = layouts.VOICE_SETTINGS.unpack_from(data, offset)
 
 
 class StrikeKitVoiceInstruments(object):
+    """
+        Kit sample table, held as samplepool ids.
+    """
+    __slots__ = ("_sample_ids",)
+
     def __init__(self, raw_data=None, *args, **kwargs):
         if raw_data:
             self._parse(raw_data)
 
+    def __getstate__(self):
+        return self.sample_table
+
+    def __setstate__(self, state):
+        self._sample_ids = samplepool.POOL.intern_all(state)
+
     @property
     def sample_table(self):
-        return self._sample_table
+        names = samplepool.POOL.names
+        return [names[x] for x in self._sample_ids]
+
+    @property
+    def sample_ids(self):
+        return self._sample_ids
 
     def get_sample_by_index(self, index):
 
-        return self._sample_table[index]
+        return samplepool.POOL.names[self._sample_ids[index]]
+
+    def get_sample_id_by_index(self, index):
+        return self._sample_ids[index]
 
     def _parse(self, data):
         """
@@ -454,26 +667,25 @@ class StrikeKitVoiceInstruments(object):
         Read that size til end of string. Alesis was nice and split them all on NUL boundaries
         """
 
-        str_header = data[0:4]
-        size_bytes = data[4:8]
-        # Hey one of our more complicated functions, we only get to use it once
-
-        table_size = helpers.parse_dword(size_bytes)
-        raw_samples = data[8:]
+        str_header, table_size = layouts.SAMPLE_TABLE_HEADER.unpack_from(data)
+        # memoryviews can't split, copy just the table out.
+        raw_samples = bytes(data[8:])
         split_samples = map(lambda x:x.decode("utf-8"), raw_samples.split(b"\0"))
-        self._sample_table = list([str(x) for x in split_samples if x != ""])
+        self._sample_ids = samplepool.POOL.intern_all(x for x in split_samples if x != "")
 
 
 class StrikeKitSettings(object):
-    def __init__(self, raw_data=None, *args, **kwargs):
+    __slots__ = ("_reverb", "_fx")
+
+    def __init__(self, raw_data=None, offset=0, *args, **kwargs):
         # TODO(future) - Enum-type thing for reverb_type, map values to names
         if raw_data:
-            self._parse(raw_data)
+            self._parse(raw_data, offset)
 
         
-    def _parse(self, data):
-            self._reverb = StrikeReverbSettings(raw_data=data[0:4])
-            self._fx = StrikeFxSettings(raw_data=data[4:16])
+    def _parse(self, data, offset=0):
+            self._reverb = StrikeReverbSettings(raw_data=data, offset=offset + layouts.KIT_REVERB_OFFSET)
+            self._fx = StrikeFxSettings(raw_data=data, offset=offset + layouts.KIT_FX_OFFSET)
 
     @property
     def reverb(self):
@@ -484,10 +696,12 @@ class StrikeKitSettings(object):
         return self._fx
 
 class StrikeReverbSettings(object):
-    def __init__(self, raw_data=None, *args, **kwargs):
+    __slots__ = ("_reverb_type_val", "_reverb_type", "_reverb_size", "_reverb_color", "_reverb_level")
+
+    def __init__(self, raw_data=None, offset=0, *args, **kwargs):
         # TODO(future) - Enum-type thing for reverb_type, map values to names
         if raw_data:
-            self._parse(raw_data)
+            self._parse(raw_data, offset)
         else:
             self._reverb_type = kwargs.get("reverb_type")
             self._reverb_size = kwargs.get("reverb_size")
@@ -510,17 +724,18 @@ class StrikeReverbSettings(object):
     def color(self):
         return self._reverb_color
 
-    def _parse(self, data):
-        self._reverb_type_val = data[0]
+    def _parse(self, data, offset=0):
+        (self._reverb_type_val, self._reverb_size,
+         self._reverb_color, self._reverb_level) = layouts.KIT_REVERB.unpack_from(data, offset)
         self._reverb_type = helpers.pretty_reverb_type(self._reverb_type_val)
-        self._reverb_size = data[1]
-        self._reverb_color = data[2]
-        self._reverb_level = data[3]
 
 class StrikeFxSettings(object):
-    def __init__(self, raw_data=None, *args, **kwargs):
+    __slots__ = ("_fx_type_val", "_fx_type", "_fx_level", "_delay_left", "_delay_right",
+                 "_feedback_left", "_feedback_right", "_depth", "_rate", "_damping")
+
+    def __init__(self, raw_data=None, offset=0, *args, **kwargs):
         if raw_data:
-            self._parse(raw_data)
+            self._parse(raw_data, offset)
         else:
             self._fx_type = kwargs.get("fx_type")
             self._fx_level = kwargs.get("fx_level")
@@ -532,18 +747,13 @@ class StrikeFxSettings(object):
             self._rate = kwargs.get("rate")
             self._damping = kwargs.get("damp")
 
-    def _parse(self, data):
-        self._fx_type_val = data[0]
+    def _parse(self, data, offset=0):
+        (self._fx_type_val, self._fx_level,
+         self._delay_left, self._delay_right,
+         self._feedback_left, self._feedback_right,
+         self._depth, self._rate, self._damping,
+         mystery_byte) = layouts.KIT_FX.unpack_from(data, offset)
         self._fx_type = helpers.pretty_fx_type(self._fx_type_val)
-        self._fx_level = data[1]
-        self._delay_left = helpers.parse_dword(data[2:4])
-        self._delay_right = helpers.parse_dword(data[4:6])
-        self._feedback_left = data[6]
-        self._feedback_right = data[7]
-        self._depth = data[8]
-        self._rate = data[9]
-        self._damping = helpers.parse_signed_byte(data[10])
-        mystery_byte = data[11]
 
 
         """
@@ -598,10 +808,17 @@ class StrikeFxSettings(object):
 
 
 class StrikeInstrument(object):
+    """
+        The INST header of an instrument file.
+
+        Only the INST tag and the header length are read. No real .sin file
+        has been checked against this code, so the header payload and
+        everything after it are left undecoded.
+    """
+    __slots__ = ("_header_length",)
+
     def __init__(self, *args, **kwargs):
-        self._instrument_settings = None
-        self._instruments = None
-        self._samples = None
+        self._header_length = None
 
         raw_data = kwargs.get("raw_data") or args[0]
         # parse raw data if it's there
@@ -610,81 +827,50 @@ class StrikeInstrument(object):
             self._parse(raw_data)
 
     def __str__(self):
-        return "\n".join(map(str, self.instruments))
+        return "INST header, {0} bytes".format(self.header_length)
 
-    def csv(self):
-        return "\n".join(map(str, map(StrikeKitVoice.csv, self.instruments)))
+    @property
+    def header_length(self):
+        return self._header_length
 
     def _parse(self, data):
-        inst_header = data[0: 4]
-        header_length = helpers
-
-class StrikeInstrumentVelocityRange(object):
-    def __init__(self, *args, **kwargs):
-        # A velocity range includes min-max pairs and a list of samples.
-        pass
+        # make sure it's an instrument file.
+        assert len(data) >= constants.CHUNK_HEADER_SIZE
+        tag, self._header_length = layouts.CHUNK_HEADER.unpack_from(data, 0)
+        assert tag == constants.SENTINEL_INSTRUMENT_FILE_HEADER
 
 
-class StrikeInstrumentSettings(object):
-    def __init__(self, *args, **kwargs):
-        self._level = 0
-        self._pan = 0
-        self._decay = 0
-        self._cutoff = 0
-        self._tune_semi = 0
-        self._tune_fine = 0
-
-        raw_data = kwargs.get("raw_data")
-        if raw_data:
-            self._parse(raw_data)
-        else:
-            pass
-
-    def _parse(self, data):
-        pass
+class StrikeInstrumentFile(object):
+    """
+        .sin instrument file.
 
-    @property
-    def level(self):
-        return self._level
+        offset
+        0           4 byte 0x494e5354       - Begin "INST" header
+        4           4 byte 0x18000000       - 24 bytes of header data - dword
 
-    @property
-    def pan(self):
-        return self._pan
+        Only the tag and length above are read. The header data and the rest
+        of the file are not decoded.
+    """
+    __slots__ = ("_data", "_instrument")
 
-    @property
-    def decay(self):
-        return self._decay
+    def __init__(self, raw_data=None, *args, **kwargs):
+        self._data = raw_data
+        self._instrument = None
 
-    @property
-    def cutoff(self):
-        return self._cutoff
+    @classmethod
+    def from_path(cls, path, use_mmap=True):
+        """
+            Load an instrument file, memory mapped by default. The mapping
+            stays open for as long as the instrument file is alive.
+        """
+        return cls(raw_data=helpers.map_file(path, use_mmap))
 
     @property
-    def tune_semitones(self):
-        return self._tune_semi
+    def data(self):
+        return self._data
 
     @property
-    def tune_fine(self):
-        return self._tune_fine
-
-
-
-class StrikeInstrumentFile(object):
-    """
-        offset      12 (that's weird) byte header
-                    ------------------
-        0           4 byte 0x696e7374       - Begin "INST" header
-        4           4 byte 0x18000000       - 24 bytes of header data - dword
-
-
-        5           3 byte 0x00             - Padding
-        8           3 byte trigger spec     - (K|S|T|H|C|R)([1-4])(H|R|F|B|E|D)
-                                                Kick/Snare/Tom/Hat/Crash/Ride
-                                                1-4 for Toms, 1-3 Crash, 1 everything else
-                                                Head/Rim for pads
-                                                Foot/Edge/Bow for Hat
-                                                Edge/Bow for Crashes
-                                                D/B/E for Rides, not sure which is bow and bell    
-        11          1 byte                  - 0x20 (SPC) terminator ?     FF if not set    
-
-    """
\ No newline at end of file
+    def instrument(self):
+        if self._instrument is None and self._data:
+            self._instrument = StrikeInstrument(self._data)
+        return self._instrument
@@ -0,0 +1,81 @@
+""" Stream kits out as CSV rows.
+
+Rows go straight to a file handle through csv.writer, one kit at a time, so
+memory stays flat however many kits are written. The format is kits.csv:
+
+    kit name, trigger spec, layer A sample, layer B sample
+
+Names containing commas or quotes are quoted, everything else is written bare.
+"""
+import csv
+
+from strikeparse import batch
+from strikeparse import helpers
+
+
+def kit_rows(name, kit):
+    """Yield the kits.csv rows for one kit
+
+    :param name: Kit name for the first column
+
+    :param kit: StrikeKit
+
+    :rtype: generator
+    """
+    for row in kit.rows():
+        yield [name] + row
+
+
+def writer(stream):
+    """Return a csv.writer producing kits.csv formatted rows on stream"""
+    return csv.writer(stream, lineterminator="\n")
+
+
+def write_kits(stream, kits):
+    """Write kits.csv rows for many kits
+
+    :param stream: Text file handle, opened with newline=""
+
+    :param kits: Iterable of (kit name, StrikeKit) pairs. Consumed lazily.
+
+    :return: Number of rows written
+
+    :rtype: int
+    """
+    out = writer(stream)
+    count = 0
+    for name, kit in kits:
+        for row in kit_rows(name, kit):
+            out.writerow(row)
+            count += 1
+    return count
+
+
+def write_kit(stream, name, kit):
+    """Write kits.csv rows for one kit, returning the number of rows written"""
+    return write_kits(stream, [(name, kit)])
+
+
+def export_files(stream, paths, jobs=None, readers=None, depth=None):
+    """Parse kit files and write their kits.csv rows as they're parsed
+
+    See batch.parse_files for jobs. Giving readers parses in this process
+    instead, with that many threads prefetching depth files ahead - see
+    batch.parse_prefetched.
+
+    :return: Number of rows written
+
+    :rtype: int
+    """
+    if readers:
+        results = batch.parse_prefetched(paths, readers=readers, depth=depth)
+    else:
+        results = batch.parse_files(paths, jobs=jobs)
+    kits = ((helpers.kit_name(path), kit) for path, kit in results)
+    return write_kits(stream, kits)
+
+
+def export_directory(stream, root, jobs=None):
+    """Write kits.csv rows for every .skt file under root, in sorted path order"""
+    kits = ((helpers.kit_name(path), kit) for path, kit in batch.parse_directory(root, jobs=jobs))
+    return write_kits(stream, kits)
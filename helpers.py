@@ -1,7 +1,14 @@
+import mmap
+import os
 import struct
 
 from strikeparse import constants
 
+# Precompiled little endian unsigned word layouts, keyed by word size.
+_WORD_FORMATS = {1: "B", 2: "H", 4: "I", 8: "Q"}
+_WORD_STRUCTS = dict((k, struct.Struct("<" + v)) for k, v in _WORD_FORMATS.items())
+
+
 def parse_dword(raw, wordsize=4):
     """Return unsigned integer from <param:wordsize> byte word
 
@@ -11,6 +18,8 @@ def parse_dword(raw, wordsize=4):
 
     :return: Unsigned value of reversed bytes
 
+    :raises TypeError: raw isn't bytes-like
+
     :rtype: signed int
     """
     """
@@ -25,37 +34,40 @@ def parse_dword(raw, wordsize=4):
     00c8 = 200
     02c8 = 712
 
+    Words of any length decode, wordsize is kept for callers that pass it.
     """
+    return int.from_bytes(raw, "little")
 
-    rv = 0
-    try:
-        unpck_fmt = '<%sB' % len(raw)
-        hexv = struct.unpack(unpck_fmt, raw)
-        hexv = [x for x in reversed(hexv)]
-        rv = int(''.join("%01x" % i for i in hexv), 16)
-    except TypeError:
-        print("Error - could not parse %s " % raw)
-    except struct.error:
-        rv = 0
-    
-    
 
-    # #hexv = bytes([hex(c) for t in zip(raw[1::2], raw[::2]) for c in t])
-    
-    # print(hexv)
-    # # we expect we don't have the necessary 0x prefix.
-    # rv = int("0x%s" % hexv, 16)
+def parse_dwords(data, offsets=None, wordsize=4):
+    """Return unsigned integers from many <param:wordsize> byte words in one buffer
+
+    :param data: Buffer to read from - bytes, bytearray, memoryview or mmap
 
-    # reverse the bytes, make life easy
-    return rv
+    :param offsets: Byte offsets of each word. None reads consecutive words from the start.
+
+    :param wordsize: 1, 2, 4 or 8
+
+    :return: Unsigned values of reversed bytes
+
+    :rtype: list
+    """
+    if offsets is None:
+        count = len(data) // wordsize
+        fmt = "<%d%s" % (count, _WORD_FORMATS[wordsize])
+        return list(struct.unpack_from(fmt, data))
+    unpack_from = _WORD_STRUCTS[wordsize].unpack_from
+    return [unpack_from(data, x)[0] for x in offsets]
 
 
 def parse_signed_byte(raw):
     """Returns signed integer from byte
 
-        :param raw: Raw byte value read from file
+        :param raw: Hex string of a byte read from file. An int is taken as
+            already converted and returned unchanged, use signed_bytes or
+            SIGNED_BYTE_TABLE for raw byte values.
 
-        :type bytestring: Accepts string of bytes
+        :type bytestring: Accepts int or string of bytes
 
         :return: Signed value of byte
 
@@ -72,53 +84,154 @@ def parse_signed_byte(raw):
     
 
     """
-    # if type(raw) is int:
-
-    retval = 0
     if isinstance(raw, int):
-        retval = raw
-        return retval
-    try:
-        retval = int(raw, 16)
-    except TypeError as typeex:
-        raise
-    
-    if retval > 127:
-        retval = retval - 256
-    return retval
+        return raw
+    value = int(raw, 16)
+    return value - 256 if value > 127 else value
 
 
 def pretty_pan(pan_data):
     """
     Prints [LR]{value} for left/right panning and returns 0 if center.
+
+    Takes the signed value, PAN_TABLE renders raw bytes.
     """
     prefix = "" if pan_data == 0 else "L" if pan_data < 0 else "R"
 
     return "{0}{1}".format(prefix, abs(pan_data))
 
+def _table_entry(table, value, kind):
+    # Tables hold None for values with no name, lookup() passes those through.
+    entry = table[value]
+    if entry is None:
+        raise ValueError("Unknown {0} {1}".format(kind, value))
+    return entry
+
 def pretty_filter_type(filter_type):
-    return constants.FILTER_TYPE[filter_type]
+    return _table_entry(FILTER_TYPE_TABLE, filter_type, "filter type")
 
 def pretty_mute_group(mute_group):
     return "OFF" if mute_group == 0 else mute_group
 
 def pretty_note_off(note_off):
-    return constants.NOTE_OFF[note_off]
+    return _table_entry(NOTE_OFF_TABLE, note_off, "note off")
 
 def pretty_priority(priority):
-    return constants.PRIORITY[priority]
+    return _table_entry(PRIORITY_TABLE, priority, "priority")
 
 def pretty_playback(playback):
-    return constants.PLAYBACK[playback]
+    return _table_entry(PLAYBACK_TABLE, playback, "playback")
 
 def pretty_reverb_type(reverb_type):
-    return constants.REVERB_TYPE[reverb_type]
+    return _table_entry(REVERB_TYPE_TABLE, reverb_type, "reverb type")
 
 def pretty_fx_type(fx_type):
-    return constants.FxType(fx_type)
+    if isinstance(fx_type, constants.FxType):
+        return fx_type
+    return _table_entry(FX_TYPE_TABLE, fx_type, "fx type")
+
+
+def _byte_table(names):
+    """Return a 256 entry tuple mapping each byte value to its entry in names
+
+    :param names: Sequence indexed by value, or dict of value to entry
+
+    :return: Entry per byte value, None for values names doesn't cover
+
+    :rtype: tuple
+    """
+    if not isinstance(names, dict):
+        names = dict(enumerate(names))
+    return tuple(names.get(x) for x in range(256))
+
+
+# Byte value -> decoded value, built once so decoding is an index rather than
+# a call per byte. Values without a name map to None.
+SIGNED_BYTE_TABLE = tuple(x - 256 if x > 127 else x for x in range(256))
+PAN_TABLE = tuple(pretty_pan(x) for x in SIGNED_BYTE_TABLE)
+FILTER_TYPE_TABLE = _byte_table(constants.FILTER_TYPE)
+MUTE_GROUP_TABLE = ("OFF",) + tuple(range(1, 256))
+NOTE_OFF_TABLE = _byte_table(constants.NOTE_OFF)
+PRIORITY_TABLE = _byte_table(constants.PRIORITY)
+PLAYBACK_TABLE = _byte_table(constants.PLAYBACK)
+REVERB_TYPE_TABLE = _byte_table(constants.REVERB_TYPE)
+FX_TYPE_TABLE = _byte_table(dict((x.value, x) for x in constants.FxType))
+FX_NAME_TABLE = _byte_table(dict((x.value, x.name) for x in constants.FxType))
+
+_NUMPY_TABLES = {}
+
+
+def _numpy_table(table):
+    import numpy
+
+    result = _NUMPY_TABLES.get(id(table))
+    if result is None:
+        if all(isinstance(x, int) for x in table):
+            result = numpy.array(table)
+        else:
+            result = numpy.array(table, dtype=object)
+        _NUMPY_TABLES[id(table)] = result
+    return result
+
+
+def lookup(table, values):
+    """Decode many byte values through one of the 256 entry tables
+
+    :param table: e.g. PAN_TABLE
+
+    :param values: bytes, iterable of ints 0-255, or a NumPy integer array
+
+    :return: List of entries, or a NumPy array for NumPy input
+
+    :rtype: list
+    """
+    if hasattr(values, "dtype"):
+        return _numpy_table(table)[values]
+    return list(map(table.__getitem__, values))
+
+
+def signed_bytes(values):
+    """Signed values of many bytes, see lookup"""
+    return lookup(SIGNED_BYTE_TABLE, values)
+
+
+def pretty_pans(values):
+    """Pan text for many raw pan bytes, see lookup"""
+    return lookup(PAN_TABLE, values)
 
 def reverb_by_index_or_name(value):
     return _name_or_id(value, constants.REVERB_TYPE, constants.REVERB_TYPE_VALUES)
 
 def name_or_id(value, named={}, identified={}):
-    return named.get(value, identified.get(value))
\ No newline at end of file
+    return named.get(value, identified.get(value))
+
+
+def kit_name(filename):
+    """Return the kit name from a kit file name
+
+    "001 Rock'n Kit.skt" is "Rock'n Kit". The first 4 characters are the kit
+    number and a space, the last 4 the extension.
+    """
+    return os.path.basename(filename)[4:-4]
+
+
+def map_file(path, use_mmap=True):
+    """Return the contents of a file without copying it into a bytes object
+
+    :param path: File to open
+
+    :param use_mmap: Map the file read only. False, or a file that can't be
+                     mapped (empty, special files), falls back to a buffered read.
+
+    :return: Read only buffer over the file
+
+    :rtype: mmap.mmap or bytes
+    """
+    with open(path, "rb") as f:
+        if use_mmap:
+            try:
+                # The mapping outlives the file handle.
+                return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (ValueError, OSError):
+                pass
+        return f.read()
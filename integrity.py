@@ -0,0 +1,115 @@
+""" Cross-check kit sample references against the instruments on the card.
+
+Kits name their samples as "Group/Instrument.sin". The instrument catalog -
+scan.scan_instruments, or an instruments.csv from csvinstruments - lists
+what is really there. check() hash-joins the two: one pass building a set
+of (group, instrument) keys from the catalog, one pass probing it with every
+reference. Linear in kits plus instruments whatever the library size.
+
+    report = check(parse_references(find_kits(kit_root)), scan_instruments(instrument_root))
+    report.dangling   # References to samples missing from the card
+    report.orphans    # InstrumentEntries no kit uses
+
+Keys are case-folded, the card is FAT and doesn't care about case either.
+"""
+import csv
+from collections import namedtuple
+
+from strikeparse import batch
+from strikeparse.catalog import split_sample
+from strikeparse.scan import InstrumentEntry
+from strikeparse.sampleindex import record_postings
+
+# kit is the kit name, trigger_spec as printed ("Snare1 Rim"), layer "a" or "b".
+Reference = namedtuple("Reference", ["kit", "trigger_spec", "layer", "sample"])
+
+# dangling and orphans in input order, references and instruments the totals seen.
+IntegrityReport = namedtuple("IntegrityReport", ["dangling", "orphans", "references", "instruments"])
+
+
+def sample_key(group, instrument):
+    """Return the join key for an instrument, e.g. ("kicks", "metal 2")"""
+    return (group or "").casefold(), instrument.casefold()
+
+
+def reference_key(sample):
+    """Return the join key for a sample name, e.g. "Kicks/Metal 2.sin" -> ("kicks", "metal 2")"""
+    return sample_key(*split_sample(sample))
+
+
+def record_references(record):
+    """Yield a Reference for each layer with a sample in a KitRecord"""
+    for sample, posting in record_postings(record):
+        yield Reference(posting.kit, posting.trigger_spec, posting.layer, sample)
+
+
+def parse_references(paths, jobs=None):
+    """Parse kit files and yield their References, see batch.parse_files for jobs"""
+    for _, record in batch.parse_files(paths, jobs=jobs, compact=True):
+        for reference in record_references(record):
+            yield reference
+
+
+def read_kits_csv(stream):
+    """Yield the References in kits.csv rows - kit, trigger spec, layer A, layer B"""
+    for row in csv.reader(stream):
+        if len(row) < 4:
+            continue
+        kit, trigger_spec, sample_a, sample_b = row[:4]
+        if sample_a:
+            yield Reference(kit, trigger_spec, "a", sample_a)
+        if sample_b:
+            yield Reference(kit, trigger_spec, "b", sample_b)
+
+
+def read_instruments_csv(stream):
+    """Yield InstrumentEntries from instruments.csv rows - group, name. size and mtime are None."""
+    for row in csv.reader(stream):
+        if len(row) >= 2:
+            yield InstrumentEntry(row[0], row[1], None, None)
+
+
+def check(references, instruments):
+    """Join sample references against the instrument catalog
+
+    :param references: Iterable of References - record_references, parse_references or read_kits_csv
+
+    :param instruments: Iterable of InstrumentEntries - scan.scan_instruments or read_instruments_csv
+
+    :rtype: IntegrityReport
+    """
+    # Build side: every catalog key, the entries kept in order for the orphan pass.
+    listed = [(sample_key(entry.group, entry.name), entry) for entry in instruments]
+    catalog = set(key for key, _ in listed)
+
+    # Probe side: each distinct sample name is split and folded once.
+    keys = {}
+    used = set()
+    dangling = []
+    reference_count = 0
+    for reference in references:
+        reference_count += 1
+        key = keys.get(reference.sample)
+        if key is None:
+            key = keys[reference.sample] = reference_key(reference.sample)
+        if key in catalog:
+            used.add(key)
+        else:
+            dangling.append(reference)
+
+    orphans = [entry for key, entry in listed if key not in used]
+    return IntegrityReport(dangling, orphans, reference_count, len(listed))
+
+
+def write_report(stream, report):
+    """Write a report as CSV rows, returning the number written
+
+        missing, kit, trigger spec, layer, sample
+        unused, group, instrument
+    """
+    out = csv.writer(stream, lineterminator="\n")
+    for reference in report.dangling:
+        out.writerow(["missing", reference.kit, reference.trigger_spec, reference.layer, reference.sample])
+    for entry in report.orphans:
+        out.writerow(["unused", entry.group, entry.name])
+    return len(report.dangling) + len(report.orphans)
@@ -2,8 +2,6 @@ from . import helpers
 from . import constants
 from .data_models import StrikeKit
 
-kit_file = "layerb.skt"
-
 
 # This function exists purely because VS Code can't collapse comment blocks.
 # Ignore freely.
@@ -22,10 +20,8 @@ def print_field(descriptor, data):
     print("{0}\t:{1}\tLength:{2}".format(descriptor, data, len(data)))
 
 def parse_file(filepath):
-    with open(kit_file, "rb") as f:
-        raw_data = f.read()
-        x = StrikeKit(raw_data)
-        print(x)
+    x = StrikeKit.from_path(filepath)
+    print(x)
         # header = f.read(header_size)
         # instruments = f.read(instrument_count * instrument_size)
         # samples = f.read()
@@ -63,5 +59,4 @@ def parse_instruments(data):
         result.append(instrument)
     return instrument
 
-# parse_file(kit_file)
 
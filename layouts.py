@@ -0,0 +1,167 @@
+""" Precompiled struct layouts for the fixed size kit records.
+
+Each record decodes with a single unpack_from at an offset rather than a
+helper call per byte. Byte fields come back unsigned - index
+helpers.SIGNED_BYTE_TABLE for signed ones - and 2 byte fields are little endian.
+"""
+import struct
+
+from strikeparse import constants
+
+# 4 byte "KIT " marker, 4 byte header length (0x2c), rest undecoded here.
+KIT_HEADER = struct.Struct("<4sI44x")
+
+# 8 byte "instH\0\0\0" sentinel, 3 byte trigger spec, 1 byte terminator.
+INSTRUMENT_HEADER = struct.Struct("<8s3sx")
+
+# sample ref, pad, level, pan, decay, 3 pad, tune, fine, cutoff,
+# vel filtertype, vel decay, vel pitch, vel filter, vel level, pad1, 3 byte terminator.
+VOICE_LAYER = struct.Struct("<BxBBB3x9B3s")
+
+# reverb send, fx send, 2 pad, priority, mute group, playback, MIDI channel,
+# MIDI note, gate time, note off, pad, 5 byte FF terminator, 11 byte pad.
+VOICE_SETTINGS = struct.Struct("<BB2xBBBBBBBx5s11x")
+
+# reverb type, size, color, level.
+KIT_REVERB = struct.Struct("<4B")
+
+# fx type, fx level, delay l, delay r, feedback l, feedback r, depth, rate,
+# damping, mystery byte.
+KIT_FX = struct.Struct("<BBHHBBBBBB")
+
+# Every block in kit and instrument files opens with a 4 byte tag and a 4 byte
+# payload length: "KIT " 0x2c, "inst" 0x48, "str " table length, "INST" 0x18.
+CHUNK_HEADER = struct.Struct("<4sI")
+
+# "str " marker, 4 byte table length.
+SAMPLE_TABLE_HEADER = CHUNK_HEADER
+
+# Sample table starts right after the fixed size voice block.
+SAMPLE_TABLE_OFFSET = constants.KIT_HEADER_SIZE + (constants.INSTRUMENT_COUNT * constants.INSTRUMENT_SIZE)
+
+# Offsets of the records within their parent block.
+KIT_SETTINGS_OFFSET = 16
+KIT_REVERB_OFFSET = 0
+KIT_FX_OFFSET = KIT_REVERB_OFFSET + KIT_REVERB.size
+LAYER_A_OFFSET = constants.INSTRUMENT_HEADER_SIZE
+LAYER_B_OFFSET = LAYER_A_OFFSET + constants.INSTRUMENT_LAYER_SIZE
+VOICE_SETTINGS_OFFSET = LAYER_B_OFFSET + constants.INSTRUMENT_LAYER_SIZE
+
+# Name, struct format and offset of each field, relative to its record. Lets a
+# single field be read or written in place without touching the rest.
+LAYER_FIELDS = [
+    ("sample", "B", 0),
+    ("level", "B", 2),
+    ("pan", "b", 3),
+    ("decay", "B", 4),
+    ("tune", "b", 8),
+    ("fine", "b", 9),
+    ("cutoff", "b", 10),
+    ("vel_filtertype", "B", 11),
+    ("vel_decay", "B", 12),
+    ("vel_pitch", "B", 13),
+    ("vel_filter", "B", 14),
+    ("vel_level", "B", 15),
+]
+
+VOICE_SETTINGS_FIELDS = [
+    ("send_reverb", "B", 0),
+    ("send_fx", "B", 1),
+    ("priority", "B", 4),
+    ("mutegroup", "B", 5),
+    ("playback", "B", 6),
+    ("midi_channel", "B", 7),
+    ("midi_note", "B", 8),
+    ("midi_gate", "B", 9),
+    ("midi_noteoff", "B", 10),
+]
+
+KIT_REVERB_FIELDS = [
+    ("reverb_type", "B", 0),
+    ("size", "B", 1),
+    ("color", "B", 2),
+    ("level", "B", 3),
+]
+
+KIT_FX_FIELDS = [
+    ("fx_type", "B", 0),
+    ("level", "B", 1),
+    ("delay_left", "<H", 2),
+    ("delay_right", "<H", 4),
+    ("feedback_left", "B", 6),
+    ("feedback_right", "B", 7),
+    ("depth", "B", 8),
+    ("rate", "B", 9),
+    ("damping", "B", 10),
+]
+
+LAYOUTS = {
+    "kit_header": KIT_HEADER,
+    "instrument_header": INSTRUMENT_HEADER,
+    "voice_layer": VOICE_LAYER,
+    "voice_settings": VOICE_SETTINGS,
+    "kit_reverb": KIT_REVERB,
+    "kit_fx": KIT_FX,
+    "sample_table_header": SAMPLE_TABLE_HEADER,
+    "chunk_header": CHUNK_HEADER,
+}
+
+assert KIT_HEADER.size == constants.KIT_HEADER_SIZE
+assert INSTRUMENT_HEADER.size == constants.INSTRUMENT_HEADER_SIZE
+assert VOICE_LAYER.size == constants.INSTRUMENT_LAYER_SIZE
+assert VOICE_SETTINGS.size == constants.INSTRUMENT_VOICE_SIZE
+assert VOICE_SETTINGS_OFFSET + VOICE_SETTINGS.size == constants.INSTRUMENT_SIZE
+assert CHUNK_HEADER.size == constants.CHUNK_HEADER_SIZE
+
+
+def get_layout(name):
+    """Return the precompiled struct.Struct registered under <param:name>
+
+    :param name: Record name, e.g. "voice_layer"
+
+    :return: Layout for the record
+
+    :rtype: struct.Struct
+    """
+    return LAYOUTS[name]
+
+
+def unpack(name, data, offset=0):
+    """Decode one record from <param:data> at <param:offset>
+
+    :param name: Record name, e.g. "voice_layer"
+
+    :param data: Any buffer - bytes, bytearray, memoryview or mmap
+
+    :return: Tuple of decoded fields
+
+    :rtype: tuple
+    """
+    return LAYOUTS[name].unpack_from(data, offset)
+
+
+def fields_struct(fields, offset=0):
+    """Build one struct decoding every field of a field table, skipping the gaps
+
+    :param fields: (name, format, offset) triples such as LAYER_FIELDS, in any order
+
+    :param offset: Added to every field offset, to place the fields inside a larger record
+
+    :return: Layout unpacking the fields in offset order, and their names in the same order
+
+    :rtype: tuple
+    """
+    parts = ["<"]
+    names = []
+    position = 0
+    for name, fmt, field_offset in sorted(fields, key=lambda x: x[2]):
+        field_offset += offset
+        if field_offset < position:
+            raise ValueError("Field {0} overlaps the one before it".format(name))
+        if field_offset > position:
+            parts.append("%dx" % (field_offset - position))
+        code = fmt.lstrip("<")
+        parts.append(code)
+        names.append(name)
+        position = field_offset + struct.calcsize("<" + code)
+    return struct.Struct("".join(parts)), names
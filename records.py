@@ -0,0 +1,63 @@
+""" Compact kit records and kit discovery.
+
+Kept apart from corpus, which needs NumPy, so batch parsing, the cache and
+the sample index load without it.
+"""
+import os
+from collections import namedtuple
+
+from strikeparse import constants
+from strikeparse import layouts
+from strikeparse.data_models import StrikeKitVoiceInstruments
+
+
+# Compact, picklable form of a kit. settings is the kit reverb and fx layout
+# fields, samples the sample table and voices the raw 24 x 80 byte instrument block.
+KitRecord = namedtuple("KitRecord", ["name", "settings", "samples", "voices"])
+
+# settings opens with the reverb fields, the fx fields follow.
+REVERB_FIELDS = len(layouts.KIT_REVERB_FIELDS)
+
+
+def kit_record(name, data):
+    """Return a KitRecord for raw kit data
+
+    :param name: Kit name
+
+    :param data: Raw kit file - bytes, bytearray, memoryview or mmap
+
+    :rtype: KitRecord
+    """
+    view = memoryview(data)
+    settings_offset = layouts.KIT_SETTINGS_OFFSET
+    settings = (layouts.KIT_REVERB.unpack_from(view, settings_offset + layouts.KIT_REVERB_OFFSET) +
+                layouts.KIT_FX.unpack_from(view, settings_offset + layouts.KIT_FX_OFFSET))
+    samples = StrikeKitVoiceInstruments(view[layouts.SAMPLE_TABLE_OFFSET:]).sample_table
+    voices = bytes(view[constants.KIT_HEADER_SIZE:layouts.SAMPLE_TABLE_OFFSET])
+    return KitRecord(name, settings, samples, voices)
+
+
+def walk_kits(root):
+    """Yield the paths of every .skt file under root as the walk reaches them
+
+    Same order as find_kits, without holding the whole list.
+
+    :param root: Directory to walk
+
+    :rtype: generator
+    """
+    for path, dirs, names in os.walk(root):
+        dirs.sort()
+        for name in sorted(names):
+            if name.lower().endswith(".skt"):
+                yield os.path.join(path, name)
+
+
+def find_kits(root):
+    """Return the paths of every .skt file under root, sorted
+
+    :param root: Directory to walk
+
+    :rtype: list
+    """
+    return list(walk_kits(root))
@@ -0,0 +1,174 @@
+""" Reverse index from sample to the kits, voices and layers that use it.
+
+    index = SampleIndex()
+    index.update_paths(find_kits(root))
+    index.lookup("Snares/BronzeLgnd6x5 Rimshot.sin", layer="b")
+    index.prefix("Snares/Bronze")
+    index.save("samples.json")
+
+Kits are added under a key - their path for update_paths - so a changed kit
+replaces its own entries. update_paths skips kits whose size and mtime
+haven't moved since they were indexed. Lookups are a dict hit on the pool
+id; prefix queries bisect a sorted list of the indexed names.
+"""
+import bisect
+import json
+import os
+from collections import namedtuple
+
+from strikeparse import constants
+from strikeparse import helpers
+from strikeparse import layouts
+from strikeparse import samplepool
+from strikeparse.data_models import StrikeKitVoiceTriggerSpec
+from strikeparse.records import kit_record
+
+# kit is the kit name, trigger_spec as printed ("Snare1 Rim"), layer "a" or "b".
+Posting = namedtuple("Posting", ["kit", "trigger_spec", "layer"])
+
+_FORMAT_VERSION = 1
+
+_LAYERS = (("a", layouts.LAYER_A_OFFSET), ("b", layouts.LAYER_B_OFFSET))
+
+
+def record_postings(record):
+    """Yield (sample name, Posting) for each layer with a sample in a KitRecord"""
+    for voice in range(constants.INSTRUMENT_COUNT):
+        start = voice * constants.INSTRUMENT_SIZE
+        trigger = None
+        for layer, offset in _LAYERS:
+            index = record.voices[start + offset]
+            if index == 255 or index >= len(record.samples):
+                continue
+            if trigger is None:
+                _, raw_trigger = layouts.INSTRUMENT_HEADER.unpack_from(record.voices, start)
+                trigger = str(StrikeKitVoiceTriggerSpec(raw_trigger))
+            yield record.samples[index], Posting(record.name, trigger, layer)
+
+
+class SampleIndex(object):
+    def __init__(self, pool=None):
+        self._pool = pool if pool is not None else samplepool.POOL
+        # pool id -> {kit key -> [Posting]}
+        self._postings = {}
+        # kit key -> (stamp, [pool id])
+        self._kits = {}
+        self._sorted_names = None
+
+    def __len__(self):
+        """Number of distinct samples indexed"""
+        return len(self._postings)
+
+    def __contains__(self, sample):
+        return self._pool.get_id(sample) in self._postings
+
+    @property
+    def kits(self):
+        """Keys of every indexed kit"""
+        return list(self._kits)
+
+    def add_record(self, key, record, stamp=None):
+        """Index a KitRecord under key, replacing anything already there
+
+        :param stamp: Optional (size, mtime_ns) used by update_paths
+        """
+        self.remove(key)
+        ids = []
+        for sample, posting in record_postings(record):
+            sample_id = self._pool.intern(sample)
+            self._postings.setdefault(sample_id, {}).setdefault(key, []).append(posting)
+            ids.append(sample_id)
+        self._kits[key] = (stamp, ids)
+        self._sorted_names = None
+
+    def remove(self, key):
+        """Drop a kit's entries. Returns False if it wasn't indexed."""
+        entry = self._kits.pop(key, None)
+        if entry is None:
+            return False
+        for sample_id in set(entry[1]):
+            kits = self._postings[sample_id]
+            kits.pop(key, None)
+            if not kits:
+                del self._postings[sample_id]
+        self._sorted_names = None
+        return True
+
+    def update_paths(self, paths):
+        """Index kit files, skipping those unchanged since they were indexed
+
+        Kits indexed by path that aren't in paths are left alone, call
+        remove for deleted files.
+
+        :return: Number of kits (re)indexed
+
+        :rtype: int
+        """
+        count = 0
+        for path in paths:
+            stat = os.stat(path)
+            stamp = (stat.st_size, stat.st_mtime_ns)
+            entry = self._kits.get(path)
+            if entry is not None and entry[0] == stamp:
+                continue
+            record = kit_record(helpers.kit_name(path), helpers.map_file(path))
+            self.add_record(path, record, stamp)
+            count += 1
+        return count
+
+    def lookup(self, sample, layer=None):
+        """Return the Postings for a sample name, optionally only layer "a" or "b" """
+        kits = self._postings.get(self._pool.get_id(sample))
+        if not kits:
+            return []
+        result = [x for postings in kits.values() for x in postings]
+        if layer is not None:
+            result = [x for x in result if x.layer == layer]
+        return result
+
+    def samples(self):
+        """Every indexed sample name, sorted"""
+        if self._sorted_names is None:
+            self._sorted_names = sorted(self._pool.name(x) for x in self._postings)
+        return self._sorted_names
+
+    def prefix(self, prefix):
+        """Return sample name -> Postings for every sample starting with prefix, e.g. a folder"""
+        names = self.samples()
+        start = bisect.bisect_left(names, prefix)
+        result = {}
+        for name in names[start:]:
+            if not name.startswith(prefix):
+                break
+            result[name] = self.lookup(name)
+        return result
+
+    def save(self, path):
+        """Write the index to a JSON file"""
+        kits = {}
+        for key, (stamp, _) in self._kits.items():
+            kits[key] = {"stamp": stamp, "postings": []}
+        for sample_id, postings in self._postings.items():
+            name = self._pool.name(sample_id)
+            for key, entries in postings.items():
+                kits[key]["postings"].extend([name] + list(x) for x in entries)
+        with open(path, "w") as f:
+            json.dump({"version": _FORMAT_VERSION, "kits": kits}, f)
+
+    @classmethod
+    def load(cls, path, pool=None):
+        """Read an index written by save"""
+        with open(path) as f:
+            data = json.load(f)
+        if data.get("version") != _FORMAT_VERSION:
+            raise ValueError("Unsupported sample index version %s" % data.get("version"))
+        index = cls(pool)
+        for key, kit in data["kits"].items():
+            ids = []
+            for entry in kit["postings"]:
+                sample_id = index._pool.intern(entry[0])
+                index._postings.setdefault(sample_id, {}).setdefault(key, []).append(Posting(*entry[1:]))
+                ids.append(sample_id)
+            stamp = tuple(kit["stamp"]) if kit["stamp"] else None
+            index._kits[key] = (stamp, ids)
+        return index
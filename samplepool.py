@@ -0,0 +1,59 @@
+""" Process-wide pool of interned sample names.
+
+The same sample paths ("Kicks/Metal 2.sin") turn up in thousands of kits.
+The pool keeps one copy of each name and hands out small integer ids in
+first-seen order, so layers and corpora store and compare ints instead of
+strings.
+
+Ids are only meaningful within one process. Anything crossing a process
+boundary carries names and re-interns them on the other side.
+"""
+
+# Id for "no sample assigned".
+NO_SAMPLE = -1
+
+
+class SamplePool(object):
+    __slots__ = ("_ids", "_names")
+
+    def __init__(self, names=()):
+        self._ids = {}
+        self._names = []
+        self.intern_all(names)
+
+    def __len__(self):
+        return len(self._names)
+
+    def __contains__(self, name):
+        return name in self._ids
+
+    @property
+    def names(self):
+        """Every interned name, indexed by id. Don't modify."""
+        return self._names
+
+    def intern(self, name):
+        """Return the id for name, adding it if it's new"""
+        sample_id = self._ids.get(name)
+        if sample_id is None:
+            sample_id = len(self._names)
+            self._ids[name] = sample_id
+            self._names.append(name)
+        return sample_id
+
+    def intern_all(self, names):
+        """Return the ids for names, adding any that are new"""
+        return [self.intern(x) for x in names]
+
+    def get_id(self, name):
+        """Return the id for name, NO_SAMPLE if it was never interned"""
+        return self._ids.get(name, NO_SAMPLE)
+
+    def name(self, sample_id):
+        """Return the name for an id, "" for NO_SAMPLE"""
+        if sample_id == NO_SAMPLE:
+            return ""
+        return self._names[sample_id]
+
+
+POOL = SamplePool()
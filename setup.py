@@ -32,7 +32,7 @@
 #    "package_dir": {"": ""},
 #    "packages": find_packages(""),
 ##    "entry_points": {
-##        "console_scripts": ("cli = strikeparse.kitparse:main",),
+##        "console_scripts": ("cli = strikeparse.cli:main",),
 ##    },
 #    "data_files": list(chain.from_iterable(_listdir(root) for root in _DATA))
 #}
@@ -0,0 +1,218 @@
+""" Optional counters and per-stage timings for the parser.
+
+Off by default and free when off - enable() wraps the instrumented functions
+and disable() puts the originals back, so nothing is checked on the hot path
+while it isn't collecting.
+
+    stats.enable()
+    export.export_directory(sys.stdout, root, jobs=1)
+    stats.disable()
+    stats.dump("stats.json")
+
+Counters:
+
+    kits      StrikeKits built from data, eager or lazy
+    bytes     raw kit bytes handed to them
+    voices    voice headers decoded
+    layers    voice layers decoded
+    samples   sample table entries decoded
+    files     kit files read by batch.parse_file
+    paths     kit paths found by records.find_kits
+
+Stages, each with calls, total seconds and mean/max microseconds:
+
+    kit.parse, kit.header, kit.samples, kit.instruments   StrikeKit parse stages
+    batch.parse_file                                      reading and parsing one file
+    batch.parse_files, batch.iter_kits                    time spent producing results
+    records.find_kits                                     directory walk
+    pipeline.read                                         one prefetch read, on a reader thread
+    pipeline.wait                                         parse_prefetched waiting on that read
+    pipeline.parse                                        parse_prefetched parsing it
+
+overlap is the share of pipeline.read time hidden behind parsing - 1.0 when
+the parser never waited on a read, 0.0 when it waited out every one, None
+without pipeline runs. More readers or depth help while it is well below 1.
+
+Only this process is measured. Kits parsed by batch worker processes don't
+show up beyond the batch.parse_files time; use jobs=1 for a full breakdown.
+"""
+import functools
+import json
+import time
+
+_clock = time.perf_counter
+
+_counters = {}
+_stages = {}
+# (owner, attribute, original) for everything enable() wrapped.
+_patched = []
+
+
+def enabled():
+    return bool(_patched)
+
+
+def reset():
+    """Zero every counter and stage"""
+    _counters.clear()
+    _stages.clear()
+
+
+def count(counter, amount=1):
+    _counters[counter] = _counters.get(counter, 0) + amount
+
+
+def record(stage, seconds):
+    entry = _stages.get(stage)
+    if entry is None:
+        entry = _stages[stage] = [0, 0.0, 0.0]
+    entry[0] += 1
+    entry[1] += seconds
+    if seconds > entry[2]:
+        entry[2] = seconds
+
+
+def get_stats():
+    """Return a copy of the counters and stage timings
+
+    :rtype: dict
+    """
+    stages = {}
+    for stage, (calls, seconds, longest) in _stages.items():
+        stages[stage] = {
+            "calls": calls,
+            "seconds": seconds,
+            "mean_us": seconds / calls * 1e6,
+            "max_us": longest * 1e6,
+        }
+    return {"enabled": enabled(), "counters": dict(_counters), "stages": stages, "overlap": _overlap()}
+
+
+def _overlap():
+    read = _stages.get("pipeline.read")
+    wait = _stages.get("pipeline.wait")
+    if not read or not wait or not read[1]:
+        return None
+    return max(0.0, read[1] - wait[1]) / read[1]
+
+
+def dump(target):
+    """Write get_stats() as JSON to a path or a text file handle"""
+    if hasattr(target, "write"):
+        json.dump(get_stats(), target, indent=2, sort_keys=True)
+        return
+    with open(target, "w") as f:
+        json.dump(get_stats(), f, indent=2, sort_keys=True)
+
+
+def _timed(stage, func, counts=None):
+    # counts(args, kwargs, result) yields (counter, amount) after each call.
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = _clock()
+        result = func(*args, **kwargs)
+        record(stage, _clock() - start)
+        if counts:
+            for counter, amount in counts(args, kwargs, result):
+                count(counter, amount)
+        return result
+    return wrapper
+
+
+def _counted(func, counts):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        result = func(*args, **kwargs)
+        for counter, amount in counts(args, kwargs, result):
+            count(counter, amount)
+        return result
+    return wrapper
+
+
+def _timed_generator(stage, func):
+    # Times each next() on the generator, not the caller's work in between.
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        results = func(*args, **kwargs)
+        while True:
+            start = _clock()
+            try:
+                item = next(results)
+            except StopIteration:
+                return
+            finally:
+                record(stage, _clock() - start)
+            yield item
+    return wrapper
+
+
+def _kit_counts(args, kwargs, result):
+    raw_data = kwargs.get("raw_data") or (args[1] if len(args) > 1 else None)
+    if raw_data:
+        yield "kits", 1
+        yield "bytes", len(raw_data)
+
+
+def _path_counts(args, kwargs, result):
+    yield "paths", len(result)
+
+
+def _targets():
+    from strikeparse import batch
+    from strikeparse import records
+    from strikeparse.data_models import StrikeKit
+    from strikeparse.data_models import StrikeKitVoice
+
+    return [
+        (StrikeKit, "__init__", lambda x: _counted(x, _kit_counts)),
+        (StrikeKit, "_parse_raw_kit", lambda x: _timed("kit.parse", x)),
+        (StrikeKit, "_parse_header", lambda x: _timed("kit.header", x)),
+        (StrikeKit, "_parse_samples", lambda x: _timed(
+            "kit.samples", x, lambda args, kwargs, result: [("samples", len(args[0]._samples.sample_ids))])),
+        (StrikeKit, "_parse_instruments", lambda x: _timed("kit.instruments", x)),
+        (StrikeKitVoice, "_parse_header", lambda x: _counted(x, lambda *_: [("voices", 1)])),
+        (StrikeKitVoice, "_parse_layers", lambda x: _counted(x, lambda *_: [("layers", 2)])),
+        (batch, "parse_file", lambda x: _timed("batch.parse_file", x, lambda *_: [("files", 1)])),
+        (batch, "parse_files", lambda x: _timed_generator("batch.parse_files", x)),
+        (batch, "iter_kits", lambda x: _timed_generator("batch.iter_kits", x)),
+        # Callers go through records.find_kits, so one wrap covers them all.
+        (records, "find_kits", lambda x: _timed("records.find_kits", x, _path_counts)),
+    ]
+
+
+def enable(clear=True):
+    """Start collecting. Does nothing if already collecting.
+
+    :param clear: reset() first
+    """
+    if clear:
+        reset()
+    if _patched:
+        return
+    for owner, name, wrap in _targets():
+        original = owner.__dict__[name]
+        setattr(owner, name, wrap(original))
+        _patched.append((owner, name, original))
+
+
+def disable():
+    """Stop collecting, keeping what was collected"""
+    while _patched:
+        owner, name, original = _patched.pop()
+        setattr(owner, name, original)
+
+
+class collect(object):
+    """
+        Collect for the duration of a with block, then disable.
+
+            with stats.collect():
+                StrikeKit.from_path(path)
+            print(stats.get_stats())
+    """
+    def __enter__(self):
+        enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        disable()
@@ -0,0 +1,103 @@
+import unittest
+import os
+import shutil
+import tempfile
+
+from strikeparse import batch as target
+from strikeparse import helpers
+from strikeparse.records import KitRecord
+
+from strikeparse.data_models import StrikeKit
+from strikeparse.records import find_kits
+
+
+class TestBatch(unittest.TestCase):
+    def setUp(self):
+        test_file = os.path.join(os.path.dirname(os.path.realpath(__file__)), "testdata.skt")
+        with open(test_file, "rb") as f:
+            self.raw_data = f.read()
+        self.root = tempfile.mkdtemp()
+        os.mkdir(os.path.join(self.root, "b"))
+        self.names = ["%03d Kit %d.skt" % (x, x) for x in range(6)]
+        for index, name in enumerate(self.names):
+            folder = self.root if index % 2 else os.path.join(self.root, "b")
+            with open(os.path.join(folder, name), "wb") as f:
+                f.write(self.raw_data)
+        with open(os.path.join(self.root, "notes.txt"), "w") as f:
+            f.write("not a kit")
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_parse_file(self):
+        path = os.path.join(self.root, self.names[1])
+        kit = target.parse_file(path)
+        self.assertEqual(kit.csv(), StrikeKit(self.raw_data).csv())
+
+    def test_parse_file_compact(self):
+        path = os.path.join(self.root, self.names[1])
+        record = target.parse_file(path, compact=True)
+        assert isinstance(record, KitRecord)
+        self.assertEqual(record.name, "Kit 1")
+        self.assertEqual(record.samples, StrikeKit(self.raw_data).samples.sample_table)
+        self.assertEqual(len(record.voices), 24 * 80)
+
+    def test_parse_directory_order(self):
+        serial = [path for path, _ in target.parse_directory(self.root, jobs=1)]
+        parallel = [path for path, _ in target.parse_directory(self.root, jobs=2, chunksize=1)]
+        self.assertEqual(serial, parallel)
+        self.assertEqual(len(serial), len(self.names))
+        self.assertEqual(serial, sorted(serial))
+
+    def test_parse_directory_parallel_results(self):
+        expected = StrikeKit(self.raw_data).csv()
+        for path, kit in target.parse_directory(self.root, jobs=2):
+            self.assertEqual(kit.csv(), expected)
+
+    def test_parse_directory_parallel_compact(self):
+        records = [x for _, x in target.parse_directory(self.root, jobs=2, compact=True)]
+        self.assertEqual(sorted(x.name for x in records), ["Kit %d" % x for x in range(6)])
+
+    def test_iter_kits_order(self):
+        expected = [path for path, _ in target.parse_directory(self.root, jobs=1)]
+        self.assertEqual([path for path, _ in target.iter_kits(self.root, jobs=1)], expected)
+        for window, chunksize in ((1, 1), (3, 2), (None, 4)):
+            paths = [path for path, _ in target.iter_kits(self.root, jobs=2, window=window, chunksize=chunksize)]
+            self.assertEqual(paths, expected)
+
+    def test_iter_kits_roots(self):
+        other = tempfile.mkdtemp()
+        try:
+            with open(os.path.join(other, "000 Other.skt"), "wb") as f:
+                f.write(self.raw_data)
+            results = list(target.iter_kits([other, self.root], jobs=2, compact=True))
+            self.assertEqual(len(results), len(self.names) + 1)
+            self.assertEqual(results[0][1].name, "Other")
+        finally:
+            shutil.rmtree(other)
+
+    def test_iter_kits_rows(self):
+        expected = tuple(tuple(x) for x in StrikeKit(self.raw_data).rows())
+        for _, rows in target.iter_kits(self.root, jobs=2, parse=target.parse_rows):
+            self.assertEqual(rows, expected)
+
+    def test_iter_kits_stop_early(self):
+        kits = target.iter_kits(self.root, jobs=2, window=2)
+        path, kit = next(kits)
+        kits.close()
+        self.assertEqual(kit.csv(), StrikeKit(self.raw_data).csv())
+
+    def test_prefetch_files(self):
+        paths = find_kits(self.root)
+        results = list(target.prefetch_files(paths, readers=3, depth=2))
+        self.assertEqual([path for path, _ in results], paths)
+        self.assertTrue(all(data == self.raw_data for _, data in results))
+
+    def test_parse_prefetched(self):
+        paths = find_kits(self.root)
+        expected = StrikeKit(self.raw_data).csv()
+        results = list(target.parse_prefetched(paths, readers=2))
+        self.assertEqual([path for path, _ in results], paths)
+        self.assertTrue(all(kit.csv() == expected for _, kit in results))
+        records = [x for _, x in target.parse_prefetched(paths, readers=1, depth=1, compact=True)]
+        self.assertEqual([x.name for x in records], [helpers.kit_name(x) for x in paths])
@@ -0,0 +1,23 @@
+import unittest
+
+from strikeparse import data_models
+from strikeparse.benchmarks import bench_memory as target
+
+
+class TestBenchMemory(unittest.TestCase):
+    def test_dict_backed(self):
+        with open(target.TEST_KIT, "rb") as f:
+            raw = f.read()
+        slotted = data_models.StrikeKit
+        with target.dict_backed():
+            kit = target._lazy_touched(raw)
+            assert hasattr(kit, "__dict__")
+            assert hasattr(kit.instruments[0].instrument_settings, "__dict__")
+            self.assertEqual(kit.instruments[0].instrument_settings.midi_note, 36)
+        self.assertIs(data_models.StrikeKit, slotted)
+        assert not hasattr(data_models.StrikeKit(None), "__dict__")
+
+    def test_run(self):
+        results = target.run(2)
+        for name in ("eager", "lazy", "lazy_touched", "eager_dict", "lazy_touched_dict"):
+            assert name in results, name
@@ -0,0 +1,41 @@
+import unittest
+import os
+import shutil
+import tempfile
+
+from strikeparse.benchmarks import bench_suite as target
+from strikeparse.benchmarks import synthetic
+
+
+class TestBenchSuite(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.paths = synthetic.make_corpus(self.root, kits=3, seed=1)
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_make_corpus(self):
+        self.assertEqual(len(self.paths), 3)
+        for index, path in enumerate(self.paths):
+            self.assertEqual(path, synthetic.kit_path(os.path.join(self.root, "Kits"), index))
+            assert os.path.isfile(path)
+        assert os.listdir(os.path.join(self.root, "Instruments"))
+
+    def test_run(self):
+        results = target.run(self.root, repeat=1)
+        self.assertEqual(results["kits"], 3)
+        self.assertEqual(set(results["stages"]), set(name for name, _ in target.stages(target.Corpus(self.root))))
+        for name, stage in results["stages"].items():
+            for key in ("kits_per_sec", "mb_per_sec", "peak_bytes"):
+                self.assertGreaterEqual(stage[key], 0, name)
+            for key in ("p50", "p95"):
+                self.assertGreaterEqual(stage["latency_us"][key], 0, name)
+            assert stage["latency_us"]["p50"] <= stage["latency_us"]["p95"] <= stage["latency_us"]["max"], name
+
+    def test_run_empty(self):
+        empty = tempfile.mkdtemp()
+        try:
+            self.assertRaises(ValueError, target.run, empty, repeat=1)
+        finally:
+            shutil.rmtree(empty)
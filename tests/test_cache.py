@@ -0,0 +1,75 @@
+import unittest
+import os
+import shutil
+import tempfile
+
+from strikeparse import cache as target
+from strikeparse.records import kit_record
+
+
+class TestKitCache(unittest.TestCase):
+    def setUp(self):
+        test_file = os.path.join(os.path.dirname(os.path.realpath(__file__)), "testdata.skt")
+        with open(test_file, "rb") as f:
+            self.raw_data = f.read()
+        self.root = tempfile.mkdtemp()
+        self.kit_path = os.path.join(self.root, "001 Rock'n Kit.skt")
+        with open(self.kit_path, "wb") as f:
+            f.write(self.raw_data)
+        self.db_path = os.path.join(self.root, "kits.db")
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_miss_then_hit(self):
+        with target.KitCache(self.db_path) as cache:
+            first = cache.get(self.kit_path)
+            second = cache.get(self.kit_path)
+            self.assertEqual(first, second)
+            self.assertEqual(first, kit_record("Rock'n Kit", self.raw_data))
+            self.assertEqual(cache.stats["misses"], 1)
+            self.assertEqual(cache.stats["hits"], 1)
+            self.assertEqual(cache.stats["entries"], 1)
+
+    def test_persists(self):
+        with target.KitCache(self.db_path) as cache:
+            cache.get(self.kit_path)
+        with target.KitCache(self.db_path) as cache:
+            record = cache.get(self.kit_path)
+            self.assertEqual(cache.stats["hits"], 1)
+            self.assertEqual(record.name, "Rock'n Kit")
+
+    def test_touched_file_revalidates(self):
+        with target.KitCache(self.db_path) as cache:
+            cache.get(self.kit_path)
+            stat = os.stat(self.kit_path)
+            os.utime(self.kit_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+            cache.get(self.kit_path)
+            cache.get(self.kit_path)
+            self.assertEqual(cache.stats["revalidated"], 1)
+            self.assertEqual(cache.stats["hits"], 2)
+            self.assertEqual(cache.stats["misses"], 1)
+
+    def test_changed_file_reparses(self):
+        with target.KitCache(self.db_path) as cache:
+            cache.get(self.kit_path)
+            changed = bytearray(self.raw_data)
+            # layer A level of the first voice.
+            changed[66] = 12
+            stat = os.stat(self.kit_path)
+            with open(self.kit_path, "wb") as f:
+                f.write(changed)
+            os.utime(self.kit_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+            record = cache.get(self.kit_path)
+            self.assertEqual(record.voices[66 - 52], 12)
+            self.assertEqual(cache.stats["misses"], 2)
+
+    def test_records_and_prune(self):
+        other = os.path.join(self.root, "002 Other.skt")
+        with open(other, "wb") as f:
+            f.write(self.raw_data)
+        with target.KitCache() as cache:
+            paths = [path for path, _ in cache.records([other, self.kit_path])]
+            self.assertEqual(paths, [other, self.kit_path])
+            self.assertEqual(cache.prune([self.kit_path]), 1)
+            self.assertEqual(len(cache), 1)
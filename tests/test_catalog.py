@@ -0,0 +1,95 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+from strikeparse import catalog as target
+from strikeparse import constants
+from strikeparse import helpers
+from strikeparse import scan
+
+from strikeparse.data_models import StrikeKit
+from strikeparse.records import kit_record
+
+
+class TestCatalog(unittest.TestCase):
+    def setUp(self):
+        self.test_file = os.path.join(os.path.dirname(os.path.realpath(__file__)), "testdata.skt")
+        with open(self.test_file, "rb") as f:
+            self.raw_data = f.read()
+        self.record = kit_record("data", self.raw_data)
+        self.db = sqlite3.connect(":memory:")
+
+    def tearDown(self):
+        self.db.close()
+
+    def _write(self, kits=1, instruments=()):
+        return target.write_catalog(self.db, [(self.test_file, self.record)] * kits, instruments)
+
+    def test_split_sample(self):
+        self.assertEqual(target.split_sample("Kicks/Metal 2.sin"), ("Kicks", "Metal 2"))
+        self.assertEqual(target.split_sample("Metal 2.sin"), (None, "Metal 2"))
+
+    def test_counts(self):
+        instruments = [scan.InstrumentEntry("Kicks", "Metal 2", 10, 0.0)]
+        counts = self._write(kits=2, instruments=instruments)
+        self.assertEqual(counts["kits"], 2)
+        self.assertEqual(counts["voices"], constants.INSTRUMENT_COUNT * 2)
+        self.assertEqual(counts["layers"], constants.INSTRUMENT_COUNT * 4)
+        self.assertEqual(counts["samples"], 25)
+        self.assertEqual(counts["instruments"], 1)
+        for table, count in counts.items():
+            self.assertEqual(self.db.execute("SELECT COUNT(*) FROM %s" % table).fetchone()[0], count)
+
+    def test_matches_kit(self):
+        self._write()
+        kit = StrikeKit(self.raw_data)
+        voice = kit.instruments[3]
+        row = self.db.execute("SELECT trigger_spec, midi_note, send_reverb FROM voices WHERE voice = 3").fetchone()
+        self.assertEqual(row, (str(voice.trigger_spec), voice.instrument_settings.midi_note,
+                               voice.instrument_settings.send_reverb))
+        sample, pan = self.db.execute("SELECT s.name, l.pan FROM layers l JOIN samples s ON s.id = l.sample_id "
+                                      "WHERE l.voice_id = 4 AND l.layer = 'a'").fetchone()
+        self.assertEqual(sample, "Snares/BJ DWMaple Rimshot.sin")
+        self.assertEqual(pan, helpers.SIGNED_BYTE_TABLE[voice.layer_a.lvl_pan])
+        self.assertEqual(self.db.execute("SELECT size FROM kit_reverb").fetchone()[0], kit.kit_settings.reverb.size)
+
+    def test_sample_query_uses_index(self):
+        self._write()
+        plan = " ".join(str(x) for x in self.db.execute(
+            "EXPLAIN QUERY PLAN SELECT voice_id FROM layers WHERE sample_id = 1"))
+        self.assertIn("layers_sample", plan)
+        rows = self.db.execute("SELECT k.name, v.trigger_spec, l.layer FROM layers l "
+                               "JOIN samples s ON s.id = l.sample_id "
+                               "JOIN voices v ON v.id = l.voice_id "
+                               "JOIN kits k ON k.id = v.kit_id "
+                               "WHERE s.name = ?", ("Kicks/Metal 2.sin",)).fetchall()
+        self.assertIn(("data", "Kick1 Head", "a"), rows)
+
+    def test_replaces_tables(self):
+        self._write(kits=3)
+        self._write()
+        self.assertEqual(self.db.execute("SELECT COUNT(*) FROM kits").fetchone()[0], 1)
+
+    def test_rollback_on_error(self):
+        self._write()
+
+        def kits():
+            yield self.test_file, self.record
+            raise ValueError("bad kit")
+
+        with self.assertRaises(ValueError):
+            target.write_catalog(self.db, kits())
+        self.assertEqual(self.db.execute("SELECT COUNT(*) FROM voices").fetchone()[0], constants.INSTRUMENT_COUNT)
+
+    def test_export_directory(self):
+        temp = tempfile.mkdtemp()
+        try:
+            path = os.path.join(temp, "kits.db")
+            counts = target.export_directory(path, os.path.dirname(self.test_file), jobs=1)
+            self.assertEqual(counts["kits"], 1)
+            with sqlite3.connect(path) as db:
+                self.assertEqual(db.execute("SELECT name FROM kits").fetchone()[0], "data")
+        finally:
+            shutil.rmtree(temp)
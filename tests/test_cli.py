@@ -0,0 +1,148 @@
+import contextlib
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+import strikeparse
+from strikeparse import cli as target
+
+
+def _run(*argv):
+    stdout = io.StringIO()
+    with contextlib.redirect_stdout(stdout):
+        status = target.main(list(argv))
+    return status, stdout.getvalue()
+
+
+class TestCli(unittest.TestCase):
+    def setUp(self):
+        self.tests_dir = os.path.dirname(os.path.realpath(__file__))
+        self.test_file = os.path.join(self.tests_dir, "testdata.skt")
+
+    def test_help(self):
+        with self.assertRaises(SystemExit) as e:
+            with contextlib.redirect_stdout(io.StringIO()):
+                target.main(["--help"])
+        self.assertEqual(e.exception.code, 0)
+
+    def test_parse(self):
+        status, output = _run("parse", self.test_file, "--jobs", "1")
+        self.assertEqual(status, 0)
+        self.assertIn("Kick1 Head", output)
+        self.assertIn("Kicks/Metal 2.sin", output)
+
+    def test_export_folder(self):
+        status, output = _run("export", self.tests_dir, "-j", "1")
+        self.assertEqual(status, 0)
+        lines = output.splitlines()
+        self.assertEqual(len(lines), 24)
+        self.assertEqual(lines[0], "data,Kick1 Head,Kicks/Metal 2.sin,Kicks/Metal 1.sin")
+
+    def test_export_output_file(self):
+        temp = tempfile.mkdtemp()
+        try:
+            path = os.path.join(temp, "kits.csv")
+            status, output = _run("export", self.test_file, "--output", path)
+            self.assertEqual(output, "")
+            with open(path) as f:
+                self.assertEqual(len(f.read().splitlines()), 24)
+        finally:
+            shutil.rmtree(temp)
+
+    def test_missing_path(self):
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr):
+            status, _ = _run("export", os.path.join(self.tests_dir, "missing.skt"))
+        self.assertEqual(status, 1)
+        self.assertIn("missing.skt", stderr.getvalue())
+
+    def test_scan(self):
+        temp = tempfile.mkdtemp()
+        try:
+            os.mkdir(os.path.join(temp, "Kicks"))
+            open(os.path.join(temp, "Kicks", "Metal 2.sin"), "wb").close()
+            status, output = _run("scan", temp)
+            self.assertEqual(output, "Kicks,Metal 2\n")
+        finally:
+            shutil.rmtree(temp)
+
+    def test_query(self):
+        status, output = _run("query", "Kicks/Metal 2.sin", self.test_file)
+        self.assertEqual(status, 0)
+        self.assertEqual(output, "Kicks/Metal 2.sin,data,Kick1 Head,a\n")
+
+    def test_query_prefix_and_layer(self):
+        status, output = _run("query", "Snares/", self.test_file, "--prefix", "--layer", "b")
+        self.assertEqual(status, 0)
+        rows = output.splitlines()
+        self.assertTrue(rows)
+        self.assertTrue(all(x.startswith("Snares/") and x.endswith(",b") for x in rows))
+
+    def test_query_no_match(self):
+        status, output = _run("query", "Kicks/Nothing.sin", self.test_file)
+        self.assertEqual(status, 1)
+        self.assertEqual(output, "")
+
+    def test_lazy_imports(self):
+        # Run in a fresh interpreter, this one has loaded everything already.
+        package = os.path.dirname(os.path.abspath(strikeparse.__file__))
+        code = ("import sys\n"
+                "from strikeparse import cli\n"
+                "cli.main(['export', sys.argv[1], '-j', '1'])\n"
+                "loaded = [x for x in ('numpy', 'strikeparse.corpus', 'multiprocessing') if x in sys.modules]\n"
+                "sys.stderr.write(','.join(loaded))\n")
+        env = dict(os.environ, PYTHONPATH=os.path.dirname(package))
+        result = subprocess.run([sys.executable, "-c", code, self.test_file], env=env,
+                                stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        self.assertEqual(result.stderr.decode(), "")
+
+    def test_catalog(self):
+        temp = tempfile.mkdtemp()
+        try:
+            path = os.path.join(temp, "kits.db")
+            status, output = _run("catalog", path, self.test_file, "-j", "1")
+            self.assertEqual(status, 0)
+            self.assertEqual(output, "1 kits, 25 samples, 0 instruments\n")
+            self.assertTrue(os.path.exists(path))
+        finally:
+            shutil.rmtree(temp)
+
+    def test_check(self):
+        temp = tempfile.mkdtemp()
+        try:
+            instruments = os.path.join(temp, "instruments.csv")
+            with open(instruments, "w") as f:
+                f.write("Kicks,Metal 2\nToms,Unused\n")
+            status, output = _run("check", instruments, self.test_file, "-j", "1")
+            self.assertEqual(status, 1)
+            lines = output.splitlines()
+            self.assertIn("unused,Toms,Unused", lines)
+            self.assertNotIn("Kicks/Metal 2.sin", output)
+            self.assertIn("missing,data,Kick1 Head,b,Kicks/Metal 1.sin", lines)
+        finally:
+            shutil.rmtree(temp)
+
+    def test_export_readers_with_jobs(self):
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr):
+            self.assertRaises(SystemExit, _run, "export", self.test_file, "--jobs", "2", "--readers", "2")
+        self.assertIn("not allowed with argument", stderr.getvalue())
+
+    def test_export_readers_stats(self):
+        temp = tempfile.mkdtemp()
+        try:
+            path = os.path.join(temp, "stats.json")
+            status, output = _run("export", self.test_file, self.test_file, "--readers", "2", "--stats", path)
+            self.assertEqual(status, 0)
+            self.assertEqual(len(output.splitlines()), 48)
+            with open(path) as f:
+                result = json.load(f)
+            self.assertEqual(result["stages"]["pipeline.read"]["calls"], 2)
+            self.assertIsNotNone(result["overlap"])
+        finally:
+            shutil.rmtree(temp)
@@ -0,0 +1,54 @@
+import unittest
+import os
+
+from strikeparse import constants
+from strikeparse import columnar as target
+
+from strikeparse.data_models import StrikeKit
+
+
+def _signed(value):
+    return value - 256 if value > 127 else value
+
+
+@unittest.skipIf(target.numpy is None, "NumPy not installed")
+class TestColumnar(unittest.TestCase):
+    def setUp(self):
+        test_file = os.path.join(os.path.dirname(os.path.realpath(__file__)), "testdata.skt")
+        with open(test_file, "rb") as f:
+            self.raw_data = f.read()
+        self.kit = StrikeKit(self.raw_data)
+
+    def test_dtype_itemsize(self):
+        self.assertEqual(target.voice_dtype().itemsize, constants.INSTRUMENT_SIZE)
+
+    def test_decode_instruments_shape(self):
+        voices = target.decode_instruments(self.raw_data)
+        self.assertEqual(voices.shape, (constants.INSTRUMENT_COUNT,))
+
+    def test_decode_instruments_matches_models(self):
+        voices = target.decode_instruments(self.raw_data)
+        for row, voice in zip(voices, self.kit.instruments):
+            settings = voice.instrument_settings
+            self.assertEqual(row["a_sample"], voice.layer_a._sample_index)
+            self.assertEqual(row["a_level"], voice.layer_a.lvl_level)
+            self.assertEqual(row["b_decay"], voice.layer_b.lvl_decay)
+            self.assertEqual(row["a_tune"], _signed(voice.layer_a.tone_tune))
+            self.assertEqual(row["b_pan"], _signed(voice.layer_b.lvl_pan))
+            self.assertEqual(row["send_reverb"], settings.send_reverb)
+            self.assertEqual(row["midi_note"], settings.midi_note)
+            self.assertEqual(row["midi_channel"], settings.midi_channel)
+
+    def test_trigger_spec(self):
+        voices = target.decode_instruments(self.raw_data)
+        self.assertEqual(voices["trigger_spec"][0], b"K1H")
+
+    def test_decode_kits_stacks(self):
+        voices = target.decode_kits([self.raw_data, memoryview(self.raw_data)])
+        self.assertEqual(voices.shape, (2, constants.INSTRUMENT_COUNT))
+        self.assertTrue((voices[0] == voices[1]).all())
+
+    def test_to_columns(self):
+        columns = target.to_columns(target.decode_kits([self.raw_data] * 3))
+        self.assertEqual(sorted(columns), sorted(target.COLUMNS))
+        self.assertEqual(len(columns["a_level"]), 3 * constants.INSTRUMENT_COUNT)
@@ -0,0 +1,117 @@
+import unittest
+import os
+import shutil
+import tempfile
+
+from strikeparse import constants
+from strikeparse import corpus as target
+from strikeparse import sampleindex
+from strikeparse import samplepool
+
+from strikeparse.data_models import StrikeKit
+from strikeparse.records import kit_record
+
+
+@unittest.skipIf(target.numpy is None, "NumPy not installed")
+class TestKitCorpus(unittest.TestCase):
+    def setUp(self):
+        test_file = os.path.join(os.path.dirname(os.path.realpath(__file__)), "testdata.skt")
+        with open(test_file, "rb") as f:
+            self.raw_data = f.read()
+        self.kit = StrikeKit(self.raw_data)
+        self.corpus = target.KitCorpus.from_raw([("One", self.raw_data), ("Two", self.raw_data)])
+
+    def test_row_count(self):
+        self.assertEqual(len(self.corpus), 2 * target.LAYERS_PER_KIT)
+
+    def test_columns(self):
+        self.assertEqual(sorted(self.corpus.columns), sorted(target.COLUMNS))
+
+    def test_samples_shared_across_kits(self):
+        ids = self.corpus.filter(self.corpus.has_sample())["sample"]
+        one, two = ids.reshape(2, -1)
+        self.assertTrue((one == two).all())
+
+    def test_sample_ids_match_models(self):
+        self.assertEqual(self.corpus["sample"][0], self.kit.instruments[0].layer_a.sample_id)
+        self.assertEqual(self.corpus.sample_names[self.corpus["sample"][0]], "Kicks/Metal 2.sin")
+
+    def test_rows_match_models(self):
+        rows = list(self.corpus.filter(self.corpus.kit_mask("One")).rows())
+        self.assertEqual(len(rows), target.LAYERS_PER_KIT)
+        for voice_index, voice in enumerate(self.kit.instruments):
+            for layer_index, layer in enumerate([voice.layer_a, voice.layer_b]):
+                row = rows[voice_index * 2 + layer_index]
+                self.assertEqual(row["kit"], "One")
+                self.assertEqual(row["trigger_spec"], str(voice.trigger_spec))
+                self.assertEqual(row["sample"], layer.sample_name)
+                self.assertEqual(row["level"], layer.lvl_level)
+                self.assertEqual(row["midi_note"], voice.instrument_settings.midi_note)
+
+    def test_filter(self):
+        mask = self.corpus.trigger_mask("S") & (self.corpus["level"] > 90) & self.corpus.has_sample()
+        snares = self.corpus.filter(mask)
+        assert len(snares)
+        self.assertTrue(all(x["trigger_spec"].startswith("Snare") for x in snares.rows()))
+        self.assertTrue((snares["level"] > 90).all())
+
+    def test_sample_mask(self):
+        name = "Kicks/Metal 2.sin"
+        rows = list(self.corpus.filter(self.corpus.sample_mask(name)).rows())
+        self.assertEqual(len(rows), 2)
+        self.assertEqual([x["kit"] for x in rows], ["One", "Two"])
+        self.assertEqual(len(self.corpus.filter(self.corpus.sample_mask("nope"))), 0)
+
+    def test_group_by_and_counts(self):
+        groups = self.corpus.group_by("kit")
+        self.assertEqual(sorted(groups), [0, 1])
+        self.assertEqual(len(groups[0]), target.LAYERS_PER_KIT)
+        self.assertEqual(self.corpus.counts("layer"), {0: constants.INSTRUMENT_COUNT * 2,
+                                                       1: constants.INSTRUMENT_COUNT * 2})
+
+    def test_from_directory(self):
+        root = tempfile.mkdtemp()
+        try:
+            os.mkdir(os.path.join(root, "backup"))
+            for name in ["001 Rock'n Kit.skt", os.path.join("backup", "002 Jazz, Brushes.skt")]:
+                with open(os.path.join(root, name), "wb") as f:
+                    f.write(self.raw_data)
+            corpus = target.KitCorpus.from_directory(root)
+            self.assertEqual(corpus.kit_names, ["Rock'n Kit", "Jazz, Brushes"])
+        finally:
+            shutil.rmtree(root)
+
+    def test_from_files_shared_memory(self):
+        root = tempfile.mkdtemp()
+        try:
+            changed = bytearray(self.raw_data)
+            # layer A level of the first voice.
+            changed[66] = 7
+            paths = []
+            for index in range(5):
+                path = os.path.join(root, "%03d Kit %d.skt" % (index, index))
+                with open(path, "wb") as f:
+                    f.write(bytes(changed) if index == 3 else self.raw_data)
+                paths.append(path)
+            index = sampleindex.SampleIndex()
+            shared = target.KitCorpus.from_files(paths, index=index, jobs=2, chunksize=2)
+            serial = target.KitCorpus.from_files(paths)
+            self.assertEqual(shared.kit_names, ["Kit %d" % x for x in range(5)])
+            for name in target.COLUMNS:
+                self.assertTrue((shared[name] == serial[name]).all(), name)
+            self.assertEqual(shared.filter(shared.kit_mask("Kit 3"))["level"][0], 7)
+            self.assertEqual(len(index.lookup("Kicks/Metal 2.sin")), 5)
+        finally:
+            shutil.rmtree(root)
+
+    def test_empty(self):
+        corpus = target.KitCorpus.from_raw([])
+        self.assertEqual(len(corpus), 0)
+
+    def test_empty_custom_pool_kept(self):
+        pool = samplepool.SamplePool()
+        self.assertIs(target.KitCorpus({}, [], pool).pool, pool)
+        corpus = target.KitCorpus.from_records([kit_record("One", self.raw_data)], pool=pool)
+        self.assertIs(corpus.pool, pool)
+        self.assertEqual(corpus.sample_names[corpus["sample"][0]], "Kicks/Metal 2.sin")
+        self.assertEqual(len(pool), 25)
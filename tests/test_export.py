@@ -0,0 +1,64 @@
+import unittest
+import csv
+import io
+import os
+import shutil
+import tempfile
+
+from strikeparse import export as target
+
+from strikeparse.data_models import StrikeKit
+
+
+class TestExport(unittest.TestCase):
+    def setUp(self):
+        self.test_file = os.path.join(os.path.dirname(os.path.realpath(__file__)), "testdata.skt")
+        self.kit = StrikeKit.from_path(self.test_file)
+
+    def test_kit_rows(self):
+        rows = list(target.kit_rows("Rock'n Kit", self.kit))
+        self.assertEqual(len(rows), len(self.kit.instruments))
+        self.assertEqual(rows[0], ["Rock'n Kit", "Kick1 Head", "Kicks/Metal 2.sin", "Kicks/Metal 1.sin"])
+
+    def test_matches_kits_csv_format(self):
+        stream = io.StringIO()
+        target.write_kit(stream, "Rock'n Kit", self.kit)
+        lines = stream.getvalue().split("\n")
+        self.assertEqual(lines[0], "Rock'n Kit,Kick1 Head,Kicks/Metal 2.sin,Kicks/Metal 1.sin")
+        self.assertEqual(lines[1], "Rock'n Kit,Kick2 Head,,")
+        self.assertEqual(lines[-1], "")
+
+    def test_quotes_commas(self):
+        stream = io.StringIO()
+        count = target.write_kits(stream, [("Jazz, Brushes", self.kit), ("Rock'n Kit", self.kit)])
+        self.assertEqual(count, 2 * len(self.kit.instruments))
+        assert stream.getvalue().startswith('"Jazz, Brushes",Kick1 Head,')
+        rows = list(csv.reader(io.StringIO(stream.getvalue())))
+        self.assertEqual(rows[0][0], "Jazz, Brushes")
+        self.assertEqual(rows[-1][0], "Rock'n Kit")
+        self.assertTrue(all(len(x) == 4 for x in rows))
+
+    def test_write_kits_consumes_lazily(self):
+        class Interrupted(Exception):
+            pass
+
+        def kits():
+            yield "One", self.kit
+            raise Interrupted()
+
+        stream = io.StringIO()
+        self.assertRaises(Interrupted, target.write_kits, stream, kits())
+        self.assertEqual(len(stream.getvalue().splitlines()), len(self.kit.instruments))
+
+    def test_export_directory(self):
+        root = tempfile.mkdtemp()
+        try:
+            shutil.copy(self.test_file, os.path.join(root, "002 Pop Rock Kit.skt"))
+            shutil.copy(self.test_file, os.path.join(root, "001 Rock'n Kit.skt"))
+            stream = io.StringIO()
+            target.export_directory(stream, root, jobs=1)
+            names = [x[0] for x in csv.reader(io.StringIO(stream.getvalue()))]
+            self.assertEqual(names[0], "Rock'n Kit")
+            self.assertEqual(names[-1], "Pop Rock Kit")
+        finally:
+            shutil.rmtree(root)
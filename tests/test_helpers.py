@@ -11,25 +11,23 @@ from strikeparse import helpers as target
 
 
 class TestHelpers(unittest.TestCase):
-    def test_parse_dword_invalid_returns_zero(self):
-        expected = 0
-        # h isn't a valid hex character.
-        actual = target.parse_dword("habcd")
-        self.assertEqual(expected, actual)
+    def test_parse_dword_invalid_raises(self):
+        # A str, not bytes.
+        self.assertRaises(TypeError, target.parse_dword, "habcd")
 
     def test_parse_dword_reverses_bytepairs(self):
-        # 4096  + 2 = 4098
+        # 0x01000002 = 16777216 + 2 = 16777218
         value = b"\x02\x00\x00\x01"
-        expected = 4098
+        expected = 16777218
         actual = target.parse_dword(value)
         self.assertEqual(expected, actual)
 
     def test_parse_word_hexcases(self):
-        # this is read in as C002E... ?
+        # this is read in as 0C00002E
         raw = b"2e00000c"
         trans = binascii.a2b_hex(raw)
         actual = target.parse_dword(trans)
-        self.assertEqual(786478, actual)
+        self.assertEqual(0x0c00002e, actual)
 
     def test_parse_dword_2_bytes(self):
         # a4 01 = 420
@@ -39,12 +37,37 @@ class TestHelpers(unittest.TestCase):
         self.assertEqual(expected, actual)
 
     def test_parse_dword_3_bytes_pads(self):
-        # a4 1 03 00 = 420
+        # a4 01 03 = 0x0301a4
         value = b"\xa4\x01\x03"
-        expected = 12708
+        expected = 197028
+        actual = target.parse_dword(value)
+        self.assertEqual(expected, actual)
+
+    def test_parse_dword_keeps_zero_nibbles(self):
+        # 05 01 = 0x0105, not 0x15
+        value = b"\x05\x01"
+        expected = 261
+        actual = target.parse_dword(value, 2)
+        self.assertEqual(expected, actual)
+
+    def test_parse_dword_memoryview(self):
+        value = memoryview(b"\xc8\x02\x00\x00")
+        expected = 712
         actual = target.parse_dword(value)
         self.assertEqual(expected, actual)
 
+    def test_parse_dwords_offsets(self):
+        value = b"\xff\xc8\x02\x00\x00\xa4\x01\x00\x00"
+        expected = [712, 420]
+        actual = target.parse_dwords(value, [1, 5])
+        self.assertEqual(expected, actual)
+
+    def test_parse_dwords_consecutive_words(self):
+        value = b"\xa4\x01\x2c\x01\x20\x03"
+        expected = [420, 300, 800]
+        actual = target.parse_dwords(value, wordsize=2)
+        self.assertEqual(expected, actual)
+
     def test_signed_byte_int(self):
         expected = 7
         actual = target.parse_signed_byte(expected)
@@ -215,3 +238,74 @@ class TestHelpers(unittest.TestCase):
         self.assertEqual(actual.feedback_left, 88)
         self.assertEqual(actual.level, 99)
 
+
+    def test_FxSetting_delay_keeps_zero_nibbles(self):
+        # 05 01 = 256 + 5 = 261
+        hex_data = "0e6305012c01374e00001f00"
+        raw_data = binascii.a2b_hex(hex_data)
+        actual = data_models.StrikeFxSettings(raw_data)
+        self.assertEqual(actual.delay_left, 261)
+        self.assertEqual(actual.delay_right, 300)
+
+    def test_FxSetting_offset(self):
+        hex_data = "ffffffff0163010001005855461c0000"
+        raw_data = binascii.a2b_hex(hex_data)
+        actual = data_models.StrikeFxSettings(raw_data, offset=4)
+        self.assertEqual(actual.fx_type, constants.FxType.StereoFlanger)
+        self.assertEqual(actual.rate, 28)
+
+    def test_parse_signed_byte_int_unchanged(self):
+        self.assertEqual(target.parse_signed_byte(255), 255)
+        self.assertEqual(target.parse_signed_byte(-1), -1)
+
+    def test_pretty_mute_group_above_byte(self):
+        self.assertEqual(target.pretty_mute_group(300), 300)
+
+    def test_pretty_fx_type_value(self):
+        self.assertIs(target.pretty_fx_type(8), constants.FxType.Vibrato)
+        self.assertIs(target.pretty_fx_type(255), constants.FxType.OFF)
+
+    def test_tables_cover_every_byte(self):
+        tables = [target.SIGNED_BYTE_TABLE, target.PAN_TABLE, target.FILTER_TYPE_TABLE,
+                  target.MUTE_GROUP_TABLE, target.NOTE_OFF_TABLE, target.PRIORITY_TABLE,
+                  target.PLAYBACK_TABLE, target.REVERB_TYPE_TABLE, target.FX_TYPE_TABLE,
+                  target.FX_NAME_TABLE]
+        for table in tables:
+            self.assertEqual(len(table), 256)
+
+    def test_tables_match_pretty_functions(self):
+        for value in range(256):
+            self.assertEqual(target.PAN_TABLE[value], target.pretty_pan(target.SIGNED_BYTE_TABLE[value]))
+        self.assertEqual(target.PAN_TABLE[251], "L5")
+        self.assertEqual(target.REVERB_TYPE_TABLE[18], "Studio")
+        self.assertEqual(target.REVERB_TYPE_TABLE[255], "OFF")
+        self.assertEqual(target.FX_NAME_TABLE[15], "PingPong")
+        self.assertEqual(target.MUTE_GROUP_TABLE[0], "OFF")
+        self.assertEqual(target.MUTE_GROUP_TABLE[3], 3)
+
+    def test_tables_unknown_values(self):
+        self.assertIsNone(target.FILTER_TYPE_TABLE[2])
+        self.assertIsNone(target.FX_TYPE_TABLE[100])
+        self.assertIsNone(target.lookup(target.REVERB_TYPE_TABLE, [100])[0])
+
+    def test_pretty_unknown_values_raise(self):
+        self.assertRaises(ValueError, target.pretty_fx_type, 200)
+        self.assertRaises(ValueError, target.pretty_filter_type, 99)
+        self.assertRaises(ValueError, target.pretty_priority, 50)
+        self.assertRaises(ValueError, target.pretty_reverb_type, 100)
+        self.assertRaises(ValueError, target.pretty_note_off, 3)
+        self.assertRaises(ValueError, target.pretty_playback, 9)
+
+    def test_lookup(self):
+        self.assertEqual(target.signed_bytes([0, 127, 128, 255]), [0, 127, -128, -1])
+        self.assertEqual(target.pretty_pans(b"\x00\x05\xfb"), ["0", "R5", "L5"])
+        self.assertEqual(target.lookup(target.PRIORITY_TABLE, [2, 0]), ["HI", "LOW"])
+
+    def test_lookup_numpy(self):
+        try:
+            import numpy
+        except ImportError:
+            self.skipTest("NumPy not installed")
+        values = numpy.array([0, 5, 251], dtype=numpy.uint8)
+        self.assertEqual(list(target.signed_bytes(values)), [0, 5, -5])
+        self.assertEqual(list(target.pretty_pans(values)), ["0", "R5", "L5"])
@@ -0,0 +1,43 @@
+import unittest
+import os
+import shutil
+import struct
+import tempfile
+
+from strikeparse import constants
+
+from strikeparse.data_models import StrikeInstrument
+from strikeparse.data_models import StrikeInstrumentFile
+
+
+def _chunk(tag, payload):
+    return tag + struct.pack("<I", len(payload)) + payload
+
+
+INSTRUMENT = _chunk(b"INST", bytes(constants.INSTRUMENT_FILE_HEADER_SIZE)) + bytes(12)
+
+
+class TestStrikeInstrument(unittest.TestCase):
+    def test_header_length(self):
+        inst = StrikeInstrument(INSTRUMENT)
+        self.assertEqual(inst.header_length, constants.INSTRUMENT_FILE_HEADER_SIZE)
+        assert str(inst)
+
+    def test_not_an_instrument(self):
+        self.assertRaises(AssertionError, StrikeInstrument, _chunk(b"KIT ", bytes(44)))
+
+    def test_truncated(self):
+        self.assertRaises(AssertionError, StrikeInstrument, b"INST")
+
+    def test_file(self):
+        root = tempfile.mkdtemp()
+        try:
+            path = os.path.join(root, "Metal 2.sin")
+            with open(path, "wb") as f:
+                f.write(INSTRUMENT)
+            inst = StrikeInstrumentFile.from_path(path)
+            self.assertIsNone(inst._instrument)
+            self.assertEqual(inst.instrument.header_length, constants.INSTRUMENT_FILE_HEADER_SIZE)
+            self.assertEqual(bytes(inst.data), INSTRUMENT)
+        finally:
+            shutil.rmtree(root)
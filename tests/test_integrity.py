@@ -0,0 +1,63 @@
+import io
+import os
+import unittest
+
+from strikeparse import integrity as target
+
+from strikeparse.records import kit_record
+from strikeparse.scan import InstrumentEntry
+
+
+class TestIntegrity(unittest.TestCase):
+    def setUp(self):
+        self.test_file = os.path.join(os.path.dirname(os.path.realpath(__file__)), "testdata.skt")
+        with open(self.test_file, "rb") as f:
+            self.record = kit_record("data", f.read())
+        self.references = list(target.record_references(self.record))
+        self.samples = sorted(set(x.sample for x in self.references))
+
+    def _instruments(self, samples):
+        return [InstrumentEntry(group, name, None, None)
+                for group, name in (target.split_sample(x) for x in samples)]
+
+    def test_reference_key(self):
+        self.assertEqual(target.reference_key("Kicks/Metal 2.sin"), ("kicks", "metal 2"))
+        self.assertEqual(target.reference_key("KICKS/Metal 2.SIN"), target.sample_key("Kicks", "Metal 2"))
+
+    def test_record_references(self):
+        self.assertIn(target.Reference("data", "Kick1 Head", "a", "Kicks/Metal 2.sin"), self.references)
+
+    def test_all_present(self):
+        report = target.check(self.references, self._instruments(self.samples))
+        self.assertEqual(report.dangling, [])
+        self.assertEqual(report.orphans, [])
+        self.assertEqual(report.references, len(self.references))
+        self.assertEqual(report.instruments, len(self.samples))
+
+    def test_dangling_and_orphans(self):
+        missing = "Kicks/Metal 2.sin"
+        extra = InstrumentEntry("Toms", "Unused", 10, 0.0)
+        instruments = self._instruments([x for x in self.samples if x != missing]) + [extra]
+        report = target.check(self.references, instruments)
+        self.assertEqual(report.dangling, [x for x in self.references if x.sample == missing])
+        self.assertEqual(report.orphans, [extra])
+
+    def test_case_insensitive(self):
+        instruments = self._instruments(x.upper() for x in self.samples)
+        self.assertEqual(target.check(self.references, instruments).dangling, [])
+
+    def test_csv_inputs(self):
+        kits = io.StringIO("Rock,Kick1 Head,Kicks/Metal 2.sin,Kicks/Metal 1.sin\nRock,Kick2 Head,,\n")
+        instruments = io.StringIO("Kicks,Metal 1\nSnares,Maple\n")
+        report = target.check(target.read_kits_csv(kits), target.read_instruments_csv(instruments))
+        self.assertEqual(report.dangling, [target.Reference("Rock", "Kick1 Head", "a", "Kicks/Metal 2.sin")])
+        self.assertEqual(report.orphans, [InstrumentEntry("Snares", "Maple", None, None)])
+        self.assertEqual(report.references, 2)
+
+    def test_write_report(self):
+        report = target.IntegrityReport([target.Reference("Rock", "Kick1 Head", "a", "Kicks/Metal 2.sin")],
+                                         [InstrumentEntry("Snares", "Maple", None, None)], 2, 2)
+        stream = io.StringIO()
+        self.assertEqual(target.write_report(stream, report), 2)
+        self.assertEqual(stream.getvalue(),
+                         "missing,Rock,Kick1 Head,a,Kicks/Metal 2.sin\nunused,Snares,Maple\n")
@@ -1,25 +1,24 @@
 import unittest
 import os
+import pickle
 
 from strikeparse import constants
 from strikeparse import helpers
+from strikeparse import layouts
 
 from strikeparse.data_models import StrikeKit
+from strikeparse.data_models import diff_kit
+from strikeparse.writer import KitPatch
+
+
+def _fields(obj):
+    return [getattr(obj, x) for x in type(obj).__slots__]
 
 
 class TestStrikeKit(unittest.TestCase):
     def setUp(self):
-        test_file = "%s\\%s" % (os.path.dirname(os.path.realpath(__file__)), "testdata.skt")
-        with open(test_file, "rb") as f:
-            raw_data = f.read()
-            self.kit = StrikeKit(raw_data)
-            # header = f.read(header_size)
-            # instruments = f.read(instrument_count * instrument_size)
-            # samples = f.read()
-
-            # parse_instruments(instruments)
-            # print_kit_header(header)
-            # print_field("Sample data", samples)
+        test_file = os.path.join(os.path.dirname(os.path.realpath(__file__)), "testdata.skt")
+        self.kit = StrikeKit.from_path(test_file)
 
     def test_not_none(self):
         assert self.kit is not None
@@ -53,6 +52,12 @@ class TestStrikeKit(unittest.TestCase):
         for x in self.kit.instruments:
             print("%s\n\t%s\t%s" % (x.trigger_spec, x.layer_a.sample_name, x.layer_a.settings_str))
 
+    def test_instrument_setting_midi(self):
+        settings = self.kit.instruments[0].instrument_settings
+        self.assertEqual((settings.midi_channel, settings.midi_note), (1, 36))
+        self.assertEqual((settings.midi_gate, settings.midi_noteoff), (0, 1))
+        self.assertIn("MIDI Note Off:  SENT", str(settings))
+
     def test_kit_settings_not_none(self):
         ks = self.kit.kit_settings
         assert ks
@@ -75,4 +80,166 @@ class TestStrikeKit(unittest.TestCase):
         self.assertEqual(fx.feedback_left, 55)
         self.assertEqual(fx.feedback_right, 78)
         self.assertEqual(fx.damping, 00)
-        self.assertEqual(fx.level, 99)
\ No newline at end of file
+        self.assertEqual(fx.level, 99)
+
+
+class TestStrikeKitLazy(unittest.TestCase):
+    def setUp(self):
+        test_file = os.path.join(os.path.dirname(os.path.realpath(__file__)), "testdata.skt")
+        with open(test_file, "rb") as f:
+            self.raw_data = f.read()
+        self.kit = StrikeKit(self.raw_data, lazy=True)
+        self.eager = StrikeKit(self.raw_data)
+
+    def test_lazy_flag(self):
+        assert self.kit.lazy
+        assert not self.eager.lazy
+
+    def test_nothing_decoded_up_front(self):
+        self.assertIsNone(self.kit._kit_settings)
+        self.assertIsNone(self.kit._samples)
+        self.assertIsNone(self.kit._instruments)
+
+    def test_kit_settings_without_voices(self):
+        self.assertEqual(self.kit.kit_settings.reverb.reverb_type, "BigGate")
+        self.assertEqual(self.kit.kit_settings.fx.delay_left, 800)
+        self.assertIsNone(self.kit._instruments)
+        self.assertIsNone(self.kit._samples)
+
+    def test_voice_decoded_on_access(self):
+        voice = self.kit.instruments[2]
+        self.assertIsNone(voice._layer_a)
+        self.assertEqual(voice.layer_a.sample_name, self.eager.instruments[2].layer_a.sample_name)
+        self.assertIsNone(voice._instrument_settings)
+        self.assertIsNone(self.kit.instruments._voices[3])
+
+    def test_voices_cached(self):
+        self.assertIs(self.kit.instruments[5], self.kit.instruments[5])
+        self.assertIs(self.kit.instruments[-1], self.kit.instruments[constants.INSTRUMENT_COUNT - 1])
+
+    def test_index_out_of_range(self):
+        self.assertRaises(IndexError, lambda: self.kit.instruments[constants.INSTRUMENT_COUNT])
+
+    def test_matches_eager(self):
+        self.assertEqual(len(self.kit.instruments), len(self.eager.instruments))
+        self.assertEqual(self.kit.csv(), self.eager.csv())
+        self.assertEqual(str(self.kit), str(self.eager))
+        self.assertEqual(self.kit.samples.sample_table, self.eager.samples.sample_table)
+        for lazy, eager in zip(self.kit.instruments, self.eager.instruments):
+            self.assertEqual(_fields(lazy.instrument_settings), _fields(eager.instrument_settings))
+            self.assertEqual(_fields(lazy.layer_b), _fields(eager.layer_b))
+
+
+class TestStrikeKitFromPath(unittest.TestCase):
+    def setUp(self):
+        self.test_file = os.path.join(os.path.dirname(os.path.realpath(__file__)), "testdata.skt")
+        with open(self.test_file, "rb") as f:
+            self.expected = StrikeKit(f.read()).csv()
+
+    def test_map_file_mmap(self):
+        data = helpers.map_file(self.test_file)
+        with open(self.test_file, "rb") as f:
+            self.assertEqual(data[:], f.read())
+
+    def test_map_file_buffered(self):
+        data = helpers.map_file(self.test_file, use_mmap=False)
+        assert isinstance(data, bytes)
+
+    def test_from_path(self):
+        self.assertEqual(StrikeKit.from_path(self.test_file).csv(), self.expected)
+
+    def test_from_path_lazy(self):
+        kit = StrikeKit.from_path(self.test_file, lazy=True)
+        assert kit.lazy
+        self.assertEqual(kit.csv(), self.expected)
+
+    def test_from_path_buffered(self):
+        kit = StrikeKit.from_path(self.test_file, use_mmap=False)
+        self.assertEqual(kit.csv(), self.expected)
+
+
+class TestStrikeKitSlots(unittest.TestCase):
+    def setUp(self):
+        test_file = os.path.join(os.path.dirname(os.path.realpath(__file__)), "testdata.skt")
+        self.kit = StrikeKit.from_path(test_file)
+
+    def test_no_instance_dicts(self):
+        voice = self.kit.instruments[0]
+        for obj in [self.kit, voice, voice.trigger_spec, voice.layer_a, voice.instrument_settings,
+                    self.kit.samples, self.kit.kit_settings, self.kit.kit_settings.reverb,
+                    self.kit.kit_settings.fx]:
+            assert not hasattr(obj, "__dict__"), type(obj).__name__
+
+    def test_layers_share_pooled_names(self):
+        kick = self.kit.instruments[0]
+        other = StrikeKit.from_path(os.path.join(os.path.dirname(os.path.realpath(__file__)), "testdata.skt"))
+        self.assertEqual(kick.layer_a.sample_id, other.instruments[0].layer_a.sample_id)
+        self.assertIs(kick.layer_a.sample_name, other.instruments[0].layer_a.sample_name)
+
+    def test_pickle_round_trip(self):
+        copy = pickle.loads(pickle.dumps(self.kit))
+        self.assertEqual(copy.csv(), self.kit.csv())
+        self.assertEqual(copy.samples.sample_table, self.kit.samples.sample_table)
+
+
+class TestStrikeKitReparse(unittest.TestCase):
+    def setUp(self):
+        test_file = os.path.join(os.path.dirname(os.path.realpath(__file__)), "testdata.skt")
+        with open(test_file, "rb") as f:
+            self.raw_data = f.read()
+        self.kit = StrikeKit(self.raw_data)
+
+    def _patched(self, patch):
+        data = bytearray(self.raw_data)
+        patch.apply(data)
+        return bytes(data)
+
+    def _renamed(self, old, new):
+        names = self.kit.samples.sample_table
+        names[names.index(old)] = new
+        table = b"\0".join(x.encode("utf-8") for x in names) + b"\0"
+        return (self.raw_data[:layouts.SAMPLE_TABLE_OFFSET] +
+                layouts.SAMPLE_TABLE_HEADER.pack(b"str ", len(table)) + table)
+
+    def test_diff_unchanged(self):
+        diff = diff_kit(self.raw_data, self.raw_data)
+        self.assertEqual(diff, (False, [], False))
+
+    def test_diff_regions(self):
+        data = self._patched(KitPatch().set_voice(5, "midi_note", 1).set_reverb("level", 1))
+        self.assertEqual(diff_kit(self.raw_data, data), (True, [5], False))
+
+    def test_reparse_reuses_unchanged_voices(self):
+        data = self._patched(KitPatch().set_voice(3, "midi_note", 50))
+        kit = self.kit.reparse(data, self.raw_data)
+        self.assertEqual(kit.instruments[3].instrument_settings.midi_note, 50)
+        self.assertEqual(self.kit.instruments[3].instrument_settings.midi_note, 40)
+        self.assertIsNot(kit.instruments[3], self.kit.instruments[3])
+        for x in range(constants.INSTRUMENT_COUNT):
+            if x != 3:
+                self.assertIs(kit.instruments[x], self.kit.instruments[x])
+        self.assertIs(kit.kit_settings, self.kit.kit_settings)
+        self.assertIs(kit.samples, self.kit.samples)
+
+    def test_reparse_header(self):
+        data = self._patched(KitPatch().set_reverb("level", 7))
+        kit = self.kit.reparse(data, self.raw_data)
+        self.assertEqual(kit.kit_settings.reverb.level, 7)
+        self.assertIs(kit.instruments[0], self.kit.instruments[0])
+
+    def test_reparse_sample_table(self):
+        data = self._renamed("Snares/BJ DWMaple Rimshot.sin", "Snares/Renamed.sin")
+        kit = self.kit.reparse(data, self.raw_data)
+        self.assertEqual(kit.instruments[3].layer_a.sample_name, "Snares/Renamed.sin")
+        self.assertIsNot(kit.instruments[3], self.kit.instruments[3])
+        self.assertIs(kit.instruments[0], self.kit.instruments[0])
+        self.assertEqual(list(kit.rows()), list(StrikeKit(data).rows()))
+
+    def test_reparse_lazy(self):
+        kit = StrikeKit(self.raw_data, lazy=True)
+        data = self._patched(KitPatch().set_layer(1, "a", "level", 3))
+        new_kit = kit.reparse(data, self.raw_data)
+        self.assertFalse(new_kit.lazy)
+        self.assertEqual(new_kit.instruments[1].layer_a.lvl_level, 3)
+        self.assertIs(new_kit.instruments[0], kit.instruments[0])
+        self.assertEqual(list(new_kit.rows()), list(StrikeKit(data).rows()))
@@ -0,0 +1,94 @@
+import unittest
+import os
+import shutil
+import tempfile
+
+from strikeparse import sampleindex as target
+from strikeparse import corpus
+from strikeparse import samplepool
+from strikeparse.records import kit_record
+
+
+class TestSampleIndex(unittest.TestCase):
+    def setUp(self):
+        test_file = os.path.join(os.path.dirname(os.path.realpath(__file__)), "testdata.skt")
+        with open(test_file, "rb") as f:
+            self.raw_data = f.read()
+        self.record = kit_record("Rock'n Kit", self.raw_data)
+        self.index = target.SampleIndex()
+        self.index.add_record("rock", self.record)
+        self.root = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def _write_kit(self, name, data=None):
+        path = os.path.join(self.root, name)
+        with open(path, "wb") as f:
+            f.write(data or self.raw_data)
+        return path
+
+    def test_lookup(self):
+        actual = self.index.lookup("Kicks/Metal 2.sin")
+        self.assertEqual(actual, [target.Posting("Rock'n Kit", "Kick1 Head", "a")])
+
+    def test_lookup_layer(self):
+        self.assertEqual(self.index.lookup("Kicks/Metal 1.sin", layer="a"), [])
+        self.assertEqual(len(self.index.lookup("Kicks/Metal 1.sin", layer="b")), 1)
+
+    def test_lookup_missing(self):
+        self.assertEqual(self.index.lookup("Kicks/Nope.sin"), [])
+        assert "Kicks/Nope.sin" not in self.index
+
+    def test_empty_custom_pool_kept(self):
+        pool = samplepool.SamplePool()
+        index = target.SampleIndex(pool)
+        index.add_record("rock", self.record)
+        self.assertIn("Kicks/Metal 2.sin", pool)
+        self.assertEqual(len(index.lookup("Kicks/Metal 2.sin")), 1)
+
+    def test_prefix(self):
+        snares = self.index.prefix("Snares/")
+        assert snares
+        self.assertTrue(all(x.startswith("Snares/") for x in snares))
+        self.assertTrue(all(p.trigger_spec.startswith("Snare") for x in snares.values() for p in x))
+        self.assertEqual(self.index.prefix("Zzz"), {})
+
+    def test_remove(self):
+        self.assertTrue(self.index.remove("rock"))
+        self.assertEqual(len(self.index), 0)
+        self.assertFalse(self.index.remove("rock"))
+
+    def test_readd_replaces(self):
+        self.index.add_record("rock", self.record)
+        self.assertEqual(len(self.index.lookup("Kicks/Metal 2.sin")), 1)
+
+    def test_save_load(self):
+        path = os.path.join(self.root, "index.json")
+        self.index.save(path)
+        loaded = target.SampleIndex.load(path)
+        self.assertEqual(loaded.samples(), self.index.samples())
+        self.assertEqual(loaded.lookup("Kicks/Metal 2.sin"), self.index.lookup("Kicks/Metal 2.sin"))
+
+    def test_update_paths_incremental(self):
+        path = self._write_kit("001 Rock'n Kit.skt")
+        index = target.SampleIndex()
+        self.assertEqual(index.update_paths([path]), 1)
+        self.assertEqual(index.update_paths([path]), 0)
+        changed = bytearray(self.raw_data)
+        # layer A sample of the first voice, now none.
+        changed[64] = 255
+        stat = os.stat(path)
+        self._write_kit("001 Rock'n Kit.skt", bytes(changed))
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        self.assertEqual(index.update_paths([path]), 1)
+        self.assertEqual(index.lookup("Kicks/Metal 2.sin"), [])
+
+    def test_built_during_corpus_load(self):
+        if corpus.numpy is None:
+            self.skipTest("NumPy not installed")
+        self._write_kit("001 Rock'n Kit.skt")
+        index = target.SampleIndex()
+        corpus.KitCorpus.from_directory(self.root, index=index)
+        self.assertEqual(index.kits, [os.path.join(self.root, "001 Rock'n Kit.skt")])
+        self.assertEqual(len(index.lookup("Kicks/Metal 2.sin")), 1)
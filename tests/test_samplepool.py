@@ -0,0 +1,31 @@
+import unittest
+
+from strikeparse import samplepool as target
+
+
+class TestSamplePool(unittest.TestCase):
+    def setUp(self):
+        self.pool = target.SamplePool()
+
+    def test_intern_returns_same_id(self):
+        first = self.pool.intern("Kicks/Metal 2.sin")
+        second = self.pool.intern("Kicks/Metal 2.sin")
+        self.assertEqual(first, second)
+        self.assertEqual(len(self.pool), 1)
+
+    def test_ids_in_first_seen_order(self):
+        ids = self.pool.intern_all(["Kicks/Metal 2.sin", "Snares/BJ DWMaple Center.sin", "Kicks/Metal 2.sin"])
+        self.assertEqual(ids, [0, 1, 0])
+
+    def test_name(self):
+        sample_id = self.pool.intern("Snares/BJ DWMaple Center.sin")
+        self.assertEqual(self.pool.name(sample_id), "Snares/BJ DWMaple Center.sin")
+        self.assertEqual(self.pool.name(target.NO_SAMPLE), "")
+
+    def test_get_id_missing(self):
+        self.assertEqual(self.pool.get_id("nope"), target.NO_SAMPLE)
+        assert "nope" not in self.pool
+
+    def test_names_constructor(self):
+        pool = target.SamplePool(["a", "b"])
+        self.assertEqual(pool.names, ["a", "b"])
@@ -0,0 +1,57 @@
+import unittest
+import io
+import os
+import shutil
+import tempfile
+
+from strikeparse import scan as target
+
+
+class TestScan(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.files = {
+            "Kicks": ["Metal 2.sin", "Metal 1.sin", "readme.txt"],
+            "Snares": ["BJ DWMaple Center.sin", "Rock, Rim.SIN"],
+            "Chinas&Splashes": ["ChinaSabMallet.sin"],
+        }
+        for group, names in self.files.items():
+            os.mkdir(os.path.join(self.root, group))
+            for name in names:
+                with open(os.path.join(self.root, group, name), "wb") as f:
+                    f.write(b"INST" + bytes(len(name)))
+        with open(os.path.join(self.root, "loose.sin"), "wb") as f:
+            f.write(b"INST")
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_scan_group(self):
+        entries = target.scan_group(os.path.join(self.root, "Kicks"))
+        self.assertEqual([(x.group, x.name) for x in entries], [("Kicks", "Metal 1"), ("Kicks", "Metal 2")])
+        self.assertEqual(entries[0].size, 4 + len("Metal 1.sin"))
+        assert entries[0].mtime > 0
+
+    def test_scan_group_no_stat(self):
+        entries = target.scan_group(os.path.join(self.root, "Kicks"), stat=False)
+        self.assertIsNone(entries[0].size)
+
+    def test_scan_instruments_order(self):
+        threaded = list(target.scan_instruments(self.root, jobs=4))
+        serial = list(target.scan_instruments(self.root, jobs=1))
+        self.assertEqual(threaded, serial)
+        self.assertEqual([(x.group, x.name) for x in threaded], [
+            ("Chinas&Splashes", "ChinaSabMallet"),
+            ("Kicks", "Metal 1"),
+            ("Kicks", "Metal 2"),
+            ("Snares", "BJ DWMaple Center"),
+            ("Snares", "Rock, Rim"),
+        ])
+
+    def test_write_catalog(self):
+        stream = io.StringIO()
+        count = target.write_catalog(stream, target.scan_instruments(self.root, stat=False))
+        self.assertEqual(count, 5)
+        lines = stream.getvalue().split("\n")
+        self.assertEqual(lines[0], "Chinas&Splashes,ChinaSabMallet")
+        self.assertEqual(lines[4], 'Snares,"Rock, Rim"')
@@ -0,0 +1,121 @@
+import io
+import json
+import os
+import sqlite3
+import unittest
+
+from strikeparse import batch
+from strikeparse import catalog
+from strikeparse import constants
+from strikeparse import stats as target
+
+from strikeparse.data_models import StrikeKit
+
+
+class TestStats(unittest.TestCase):
+    def setUp(self):
+        self.test_file = os.path.join(os.path.dirname(os.path.realpath(__file__)), "testdata.skt")
+        with open(self.test_file, "rb") as f:
+            self.raw_data = f.read()
+        target.reset()
+
+    def tearDown(self):
+        target.disable()
+        target.reset()
+
+    def test_disabled_by_default(self):
+        self.assertFalse(target.enabled())
+        StrikeKit(self.raw_data)
+        self.assertEqual(target.get_stats()["counters"], {})
+        self.assertEqual(target.get_stats()["stages"], {})
+
+    def test_disable_restores_originals(self):
+        original = StrikeKit.__dict__["_parse_raw_kit"]
+        parse_file = batch.parse_file
+        target.enable()
+        self.assertIsNot(StrikeKit.__dict__["_parse_raw_kit"], original)
+        target.disable()
+        self.assertIs(StrikeKit.__dict__["_parse_raw_kit"], original)
+        self.assertIs(batch.parse_file, parse_file)
+
+    def test_parse_counters(self):
+        with target.collect():
+            StrikeKit(self.raw_data)
+        result = target.get_stats()
+        self.assertFalse(result["enabled"])
+        counters = result["counters"]
+        self.assertEqual(counters["kits"], 1)
+        self.assertEqual(counters["bytes"], len(self.raw_data))
+        self.assertEqual(counters["voices"], constants.INSTRUMENT_COUNT)
+        self.assertEqual(counters["layers"], constants.INSTRUMENT_COUNT * 2)
+        self.assertEqual(counters["samples"], 25)
+        for stage in ("kit.parse", "kit.header", "kit.samples", "kit.instruments"):
+            self.assertEqual(result["stages"][stage]["calls"], 1)
+            self.assertGreater(result["stages"][stage]["seconds"], 0)
+
+    def test_lazy_kit_counts_what_is_decoded(self):
+        with target.collect():
+            kit = StrikeKit(self.raw_data, lazy=True)
+            kit.instruments[0].layer_a
+        counters = target.get_stats()["counters"]
+        self.assertEqual(counters["kits"], 1)
+        self.assertEqual(counters["voices"], 1)
+        self.assertEqual(counters["layers"], 2)
+        self.assertNotIn("kit.parse", target.get_stats()["stages"])
+
+    def test_batch_paths(self):
+        with target.collect():
+            results = list(batch.parse_files([self.test_file] * 3, jobs=1))
+        self.assertEqual(len(results), 3)
+        result = target.get_stats()
+        self.assertEqual(result["counters"]["files"], 3)
+        self.assertEqual(result["counters"]["kits"], 3)
+        self.assertEqual(result["stages"]["batch.parse_file"]["calls"], 3)
+        # One call per result plus the one that finds the end.
+        self.assertEqual(result["stages"]["batch.parse_files"]["calls"], 4)
+
+    def test_find_kits(self):
+        with target.collect():
+            list(batch.parse_directory(os.path.dirname(self.test_file), jobs=1))
+        result = target.get_stats()
+        self.assertEqual(result["counters"]["paths"], 1)
+        self.assertEqual(result["stages"]["records.find_kits"]["calls"], 1)
+
+    def test_find_kits_catalog(self):
+        with target.collect():
+            catalog.export_directory(sqlite3.connect(":memory:"), os.path.dirname(self.test_file), jobs=1)
+        result = target.get_stats()
+        self.assertEqual(result["counters"]["paths"], 1)
+        self.assertEqual(result["stages"]["records.find_kits"]["calls"], 1)
+
+    def test_pipeline_overlap(self):
+        self.assertIsNone(target.get_stats()["overlap"])
+        with target.collect():
+            list(batch.parse_prefetched([self.test_file] * 4, readers=2))
+        result = target.get_stats()
+        for stage in ("pipeline.read", "pipeline.wait", "pipeline.parse"):
+            self.assertEqual(result["stages"][stage]["calls"], 4)
+        self.assertGreaterEqual(result["overlap"], 0.0)
+        self.assertLessEqual(result["overlap"], 1.0)
+
+    def test_pipeline_untimed_when_disabled(self):
+        list(batch.parse_prefetched([self.test_file] * 2, readers=2))
+        self.assertEqual(target.get_stats()["stages"], {})
+
+    def test_enable_clears(self):
+        with target.collect():
+            StrikeKit(self.raw_data)
+        target.enable(clear=False)
+        StrikeKit(self.raw_data)
+        self.assertEqual(target.get_stats()["counters"]["kits"], 2)
+        target.enable()
+        self.assertEqual(target.get_stats()["counters"], {})
+
+    def test_dump(self):
+        with target.collect():
+            StrikeKit(self.raw_data)
+        stream = io.StringIO()
+        target.dump(stream)
+        result = json.loads(stream.getvalue())
+        self.assertEqual(result["counters"]["kits"], 1)
+        self.assertIn("mean_us", result["stages"]["kit.parse"])
@@ -0,0 +1,38 @@
+import random
+import unittest
+
+from strikeparse import constants
+from strikeparse import layouts
+from strikeparse.benchmarks import synthetic as target
+
+from strikeparse.data_models import StrikeKit
+
+
+class TestSynthetic(unittest.TestCase):
+    def setUp(self):
+        self.data = target.make_kit(random.Random(0))
+        self.kit = StrikeKit(self.data)
+
+    def test_make_kit_size(self):
+        self.assertGreaterEqual(len(self.data), layouts.SAMPLE_TABLE_OFFSET)
+
+    def test_make_kit_round_trip(self):
+        self.assertEqual(len(self.kit.instruments), len(target.TRIGGERS))
+        for index, (voice, trigger) in enumerate(zip(self.kit.instruments, target.TRIGGERS)):
+            self.assertEqual(voice.trigger_spec.input_index, chr(trigger[1]))
+            settings = voice.instrument_settings
+            self.assertEqual(settings.midi_note, 36 + index)
+            self.assertIn(settings.midi_gate, (0, 50))
+            self.assertIn(settings.midi_noteoff, (0, 1, 2))
+            assert str(settings)
+            for layer in (voice.layer_a, voice.layer_b):
+                if layer.sample_name:
+                    self.assertIn(layer.sample_name, self.kit.samples.sample_table)
+
+    def test_make_kit_settings_terminator(self):
+        offset = constants.KIT_HEADER_SIZE + layouts.VOICE_SETTINGS_OFFSET
+        terminator = layouts.VOICE_SETTINGS.unpack_from(self.data, offset)[-1]
+        self.assertEqual(terminator, b"\xff" * 5)
+
+    def test_make_kit_lazy(self):
+        self.assertEqual(self.kit.csv(), StrikeKit(self.data, lazy=True).csv())
@@ -0,0 +1,120 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from strikeparse import constants
+from strikeparse import writer as target
+
+from strikeparse.data_models import StrikeFxSettings
+from strikeparse.data_models import StrikeKit
+from strikeparse.data_models import StrikeReverbSettings
+
+
+class TestKitPatch(unittest.TestCase):
+    def setUp(self):
+        self.test_file = os.path.join(os.path.dirname(os.path.realpath(__file__)), "testdata.skt")
+        with open(self.test_file, "rb") as f:
+            self.raw_data = f.read()
+        self.data = bytearray(self.raw_data)
+
+    def _changed_offsets(self):
+        return [i for i, (x, y) in enumerate(zip(self.raw_data, self.data)) if x != y]
+
+    def test_set_voice_by_index(self):
+        changed = target.KitPatch().set_voice(0, "midi_note", 48).apply(self.data)
+        self.assertEqual(changed, 1)
+        kit = StrikeKit(bytes(self.data))
+        self.assertEqual(kit.instruments[0].instrument_settings.midi_note, 48)
+        self.assertEqual(kit.instruments[1].instrument_settings.midi_note, 37)
+        self.assertEqual(len(self._changed_offsets()), 1)
+
+    def test_set_voice_by_trigger(self):
+        target.KitPatch().set_voice("Snare1 Rim", "send_reverb", 0).apply(self.data)
+        kit = StrikeKit(bytes(self.data))
+        self.assertEqual(kit.instruments[3].instrument_settings.send_reverb, 0)
+        self.assertEqual(kit.instruments[2].instrument_settings.send_reverb, 80)
+
+    def test_unknown_trigger(self):
+        patch = target.KitPatch().set_voice("Snare9 Rim", "send_reverb", 0)
+        with self.assertRaises(KeyError):
+            patch.apply(self.data)
+
+    def test_unknown_field(self):
+        with self.assertRaises(KeyError):
+            target.KitPatch().set_voice(0, "volume", 0)
+
+    def test_set_layer_signed(self):
+        target.KitPatch().set_layer(0, "b", "pan", -5).set_layer(0, "a", "tune", 250).apply(self.data)
+        kit = StrikeKit(bytes(self.data))
+        self.assertEqual(kit.instruments[0].layer_b.lvl_pan, 251)
+        self.assertEqual(kit.instruments[0].layer_a.tone_tune, 250)
+
+    def test_unchanged_bytes_not_counted(self):
+        patch = target.KitPatch().set_voice(0, "midi_note", 36)
+        self.assertEqual(patch.apply(self.data), 0)
+        self.assertEqual(bytes(self.data), self.raw_data)
+
+    def test_later_edit_wins(self):
+        patch = target.KitPatch().set_voice(0, "midi_note", 40).set_voice(0, "midi_note", 41)
+        self.assertEqual(len(patch), 1)
+        patch.apply(self.data)
+        self.assertEqual(StrikeKit(bytes(self.data)).instruments[0].instrument_settings.midi_note, 41)
+
+    def test_later_edit_wins_across_voice_names(self):
+        patch = target.KitPatch().set_layer(0, "a", "level", 100).set_layer("Kick1 Head", "a", "level", 5)
+        offset = target.voice_offset(0) + target.LAYERS["a"] + 2
+        self.assertEqual(patch.writes(self.raw_data), [(offset, b"\x05")])
+        patch.set_layer(0, "a", "level", 7).apply(self.data)
+        self.assertEqual(StrikeKit(bytes(self.data)).instruments[0].layer_a.lvl_level, 7)
+
+    def test_set_reverb_and_fx(self):
+        patch = target.KitPatch()
+        patch.set_reverb("reverb_type", "Studio").set_reverb("level", 10)
+        patch.set_fx("fx_type", constants.FxType.PingPong).set_fx("delay_left", 1000)
+        patch.apply(self.data)
+        settings = StrikeKit(bytes(self.data)).kit_settings
+        self.assertEqual(settings.reverb.reverb_type, "Studio")
+        self.assertEqual(settings.reverb.level, 10)
+        self.assertEqual(settings.fx.fx_type, constants.FxType.PingPong)
+        self.assertEqual(settings.fx.delay_left, 1000)
+
+    def test_settings_objects(self):
+        patch = target.KitPatch()
+        patch.set_reverb_settings(StrikeReverbSettings(reverb_type="WoodRm", reverb_size=3))
+        patch.set_fx_settings(StrikeFxSettings(fx_type=constants.FxType.Delay, damp=7))
+        self.assertEqual(len(patch), 4)
+        patch.apply(self.data)
+        settings = StrikeKit(bytes(self.data)).kit_settings
+        self.assertEqual(settings.reverb.reverb_type, "WoodRm")
+        self.assertEqual(settings.reverb.size, 3)
+        self.assertEqual(settings.fx.fx_type, constants.FxType.Delay)
+        self.assertEqual(settings.fx.damping, 7)
+
+    def test_apply_memoryview(self):
+        target.KitPatch().set_voice(2, "midi_channel", 5).apply(memoryview(self.data))
+        self.assertEqual(StrikeKit(bytes(self.data)).instruments[2].instrument_settings.midi_channel, 5)
+
+
+class TestPatchFiles(unittest.TestCase):
+    def setUp(self):
+        source = os.path.join(os.path.dirname(os.path.realpath(__file__)), "testdata.skt")
+        self.root = tempfile.mkdtemp()
+        self.paths = []
+        for i in range(3):
+            path = os.path.join(self.root, "kit_{0}.skt".format(i))
+            shutil.copy(source, path)
+            self.paths.append(path)
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_patch_files(self):
+        patch = target.KitPatch()
+        for voice in range(constants.INSTRUMENT_COUNT):
+            patch.set_voice(voice, "send_reverb", 0)
+        self.assertEqual(target.patch_files(self.paths, patch), 3)
+        for path in self.paths:
+            kit = StrikeKit.from_path(path)
+            self.assertTrue(all(x.instrument_settings.send_reverb == 0 for x in kit.instruments))
+        self.assertEqual(target.patch_files(self.paths, patch), 0)
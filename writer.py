@@ -0,0 +1,208 @@
+""" Patch fields of kit files in place.
+
+Every kit field sits at a fixed offset, so an edit is a write of a byte or
+two at that offset - nothing is decoded or re-encoded. A KitPatch collects edits
+and applies them to any writable buffer, or to files through a shared mmap.
+Bytes that already hold the new value aren't written, so a file that needs
+no change is left untouched.
+
+    patch = KitPatch()
+    patch.set_voice("Snare1 Head", "midi_note", 38)
+    for voice in range(24):
+        patch.set_voice(voice, "send_reverb", 0)
+    patch_files(find_kits(root), patch)
+
+Voices are picked by index or by trigger spec as printed ("Kick1 Head").
+Trigger specs are looked up in each buffer the patch is applied to.
+"""
+import mmap
+import struct
+
+from strikeparse import constants
+from strikeparse import layouts
+from strikeparse.data_models import StrikeKitVoiceTriggerSpec
+
+LAYERS = {"a": layouts.LAYER_A_OFFSET, "b": layouts.LAYER_B_OFFSET}
+
+_REVERB_OFFSET = layouts.KIT_SETTINGS_OFFSET + layouts.KIT_REVERB_OFFSET
+_FX_OFFSET = layouts.KIT_SETTINGS_OFFSET + layouts.KIT_FX_OFFSET
+
+# Field name -> (struct.Struct, offset) for each record.
+_LAYER_FIELDS = dict((name, (struct.Struct(fmt), offset)) for name, fmt, offset in layouts.LAYER_FIELDS)
+_VOICE_FIELDS = dict((name, (struct.Struct(fmt), offset)) for name, fmt, offset in layouts.VOICE_SETTINGS_FIELDS)
+_REVERB_FIELDS = dict((name, (struct.Struct(fmt), offset)) for name, fmt, offset in layouts.KIT_REVERB_FIELDS)
+_FX_FIELDS = dict((name, (struct.Struct(fmt), offset)) for name, fmt, offset in layouts.KIT_FX_FIELDS)
+
+
+def _field(fields, name, record):
+    try:
+        return fields[name]
+    except KeyError:
+        raise KeyError("Unknown {0} field {1!r}".format(record, name))
+
+
+def _pack(layout, value):
+    # The models hand signed bytes back unsigned, accept either form.
+    if layout.format.endswith("b") and value > 127:
+        value -= 256
+    return layout.pack(value)
+
+
+def voice_offset(voice):
+    """Return the file offset of a voice record
+
+    :param voice: Voice index, 0 - 23
+
+    :rtype: int
+    """
+    if not 0 <= voice < constants.INSTRUMENT_COUNT:
+        raise IndexError("Voice index {0} out of range".format(voice))
+    return constants.KIT_HEADER_SIZE + voice * constants.INSTRUMENT_SIZE
+
+
+def voice_index(data, trigger):
+    """Return the index of the voice with a trigger spec, e.g. "Snare1 Rim"
+
+    :param data: Raw kit file
+
+    :raises KeyError: No voice has that trigger spec
+    """
+    for voice in range(constants.INSTRUMENT_COUNT):
+        _, raw_trigger = layouts.INSTRUMENT_HEADER.unpack_from(data, voice_offset(voice))
+        if str(StrikeKitVoiceTriggerSpec(raw_trigger)) == trigger:
+            return voice
+    raise KeyError("No voice with trigger {0!r}".format(trigger))
+
+
+class KitPatch(object):
+    """
+        A set of field edits that can be applied to any number of kits.
+        Later edits to the same field replace earlier ones.
+    """
+    def __init__(self):
+        # (voice or None, offset within the voice or file) -> packed bytes, in edit order
+        self._edits = {}
+
+    def __len__(self):
+        return len(self._edits)
+
+    def _set(self, voice, offset, layout, value):
+        key = (voice, offset)
+        # Re-inserted so the dict order stays the order of the latest edits.
+        self._edits.pop(key, None)
+        self._edits[key] = _pack(layout, value)
+        return self
+
+    def set_layer(self, voice, layer, field, value):
+        """Set a layer field, e.g. set_layer("Kick1 Head", "a", "level", 100)
+
+        :param voice: Voice index or trigger spec
+
+        :param layer: "a" or "b"
+
+        :param field: Name from layouts.LAYER_FIELDS
+        """
+        layout, offset = _field(_LAYER_FIELDS, field, "layer")
+        return self._set(voice, LAYERS[layer] + offset, layout, value)
+
+    def set_voice(self, voice, field, value):
+        """Set a voice settings field, e.g. set_voice(3, "send_reverb", 0)
+
+        :param voice: Voice index or trigger spec
+
+        :param field: Name from layouts.VOICE_SETTINGS_FIELDS
+        """
+        layout, offset = _field(_VOICE_FIELDS, field, "voice")
+        return self._set(voice, layouts.VOICE_SETTINGS_OFFSET + offset, layout, value)
+
+    def set_reverb(self, field, value):
+        """Set a kit reverb field. reverb_type takes a value, a name like "Studio" or a constants.ReverbType."""
+        layout, offset = _field(_REVERB_FIELDS, field, "reverb")
+        if isinstance(value, constants.ReverbType):
+            value = value.value
+        elif field == "reverb_type" and isinstance(value, str):
+            try:
+                value = constants.REVERB_TYPE_VALUES[value]
+            except KeyError:
+                raise ValueError("Unknown reverb type {0!r}".format(value))
+        return self._set(None, _REVERB_OFFSET + offset, layout, value)
+
+    def set_fx(self, field, value):
+        """Set a kit FX field. fx_type takes a value or a constants.FxType."""
+        layout, offset = _field(_FX_FIELDS, field, "fx")
+        if isinstance(value, constants.FxType):
+            value = value.value
+        return self._set(None, _FX_OFFSET + offset, layout, value)
+
+    def set_reverb_settings(self, settings):
+        """Set every field given to a StrikeReverbSettings, skipping those left None"""
+        for field in _REVERB_FIELDS:
+            value = getattr(settings, field)
+            if value is not None:
+                self.set_reverb(field, value)
+        return self
+
+    def set_fx_settings(self, settings):
+        """Set every field given to a StrikeFxSettings, skipping those left None"""
+        for field in _FX_FIELDS:
+            value = getattr(settings, field)
+            if value is not None:
+                self.set_fx(field, value)
+        return self
+
+    def writes(self, data):
+        """Return the (file offset, bytes) pairs this patch makes to a kit, sorted by offset
+
+        :param data: Raw kit file, only read to look up trigger specs
+        """
+        # A voice can be named by index and by trigger spec, so edits only
+        # collide once resolved. Later ones overwrite earlier ones here.
+        result = {}
+        for (voice, offset), value in self._edits.items():
+            if voice is not None:
+                if not isinstance(voice, int):
+                    voice = voice_index(data, voice)
+                offset += voice_offset(voice)
+            result[offset] = value
+        return sorted(result.items(), key=lambda x: x[0])
+
+    def apply(self, buffer):
+        """Write the edits into a writable buffer - bytearray, memoryview or mmap
+
+        :return: Number of fields whose bytes actually changed
+
+        :rtype: int
+        """
+        changed = 0
+        for offset, value in self.writes(buffer):
+            end = offset + len(value)
+            if buffer[offset:end] != value:
+                buffer[offset:end] = value
+                changed += 1
+        return changed
+
+    def apply_to_file(self, path):
+        """Patch a kit file in place, returning the number of fields changed"""
+        with open(path, "r+b") as f:
+            data = mmap.mmap(f.fileno(), 0)
+            try:
+                changed = self.apply(data)
+                if changed:
+                    data.flush()
+            finally:
+                data.close()
+        return changed
+
+
+def patch_files(paths, patch):
+    """Apply a KitPatch to every kit file in paths
+
+    :return: Number of files that changed
+
+    :rtype: int
+    """
+    count = 0
+    for path in paths:
+        if patch.apply_to_file(path):
+            count += 1
+    return count